@@ -954,9 +954,10 @@ const ST = {
   level: 'A0',            // nivel CEFR actual del alumno
   char: 'emily',          // personaje activo
   topic: 'greetings',     // tema de conversación
-  history: [],            // historial de mensajes (chat adultos)
+  convNueva: true,        // la próxima charla arranca de cero (el historial vive en el servidor)
   lessonsDone: new Set(),  // lecciones completadas
   activeLesson: null,      // lección activa actual
+  pregenLesson: null,      // lección cuyo comienzo pregenerado está en pantalla
   // Aprendizaje adaptativo
   adaptive: {
     streak: 0,            // respuestas correctas seguidas
@@ -978,14 +979,30 @@ const ST = {
   ttsEnabled: true,       // profesor lee en voz alta
 };
 
-// Currículum completo inyectado desde Python
-const CURRICULUM = """ + "CURRICULUM_PLACEHOLDER" + r""";
-
-// Personajes inyectados desde Python
-const CHARACTERS = """ + "CHARACTERS_PLACEHOLDER" + r""";
+// Datos del curso: cada uno es un JSON aparte, versionado y cacheable, que
+// se baja la primera vez que hace falta (ver datos_academia en Python). La
+// página trae sólo sus URLs y el índice de niveles.
+const DATA_URLS = DATA_URLS_PLACEHOLDER;
+const LEVELS = LEVELS_PLACEHOLDER;   // nivel → { label, color }
+const CURRICULUM = {};               // nivel → módulos, a medida que se bajan
+let CHARACTERS = {};
+let PRON_WORDS = [];
+
+const _dataCache = {};
+function loadData(nombre) {
+  if (!_dataCache[nombre]) {
+    _dataCache[nombre] = fetch(DATA_URLS[nombre]).then(res => {
+      if (!res.ok) throw new Error('API error ' + res.status);
+      return res.json();
+    }).catch(e => { delete _dataCache[nombre]; throw e; });
+  }
+  return _dataCache[nombre];
+}
 
-// Palabras de pronunciación inyectadas desde Python
-const PRON_WORDS = """ + "PRON_WORDS_PLACEHOLDER" + r""";
+async function loadLevel(lvl) {
+  if (!CURRICULUM[lvl]) CURRICULUM[lvl] = await loadData('curriculo_' + lvl);
+  return CURRICULUM[lvl];
+}
 
 // ═══════════════════════════════════════════════════════════
 //  MODO (Adultos / Niños)
@@ -1020,12 +1037,18 @@ let currentCurrLevel = 'A0';
 function renderCurriculum(lvl) {
   lvl = lvl || currentCurrLevel;
   currentCurrLevel = lvl;
+  if (!LEVELS[lvl]) return;
   const data = CURRICULUM[lvl];
-  if (!data) return;
+  if (!data) {
+    // se muestra cuando llega (si el alumno no eligió otro nivel mientras)
+    loadLevel(lvl).then(() => { if (currentCurrLevel === lvl) renderCurriculum(lvl); })
+      .catch(() => {});
+    return;
+  }
 
   // Botones de nivel
   const nav = document.getElementById('levelNav');
-  nav.innerHTML = Object.entries(CURRICULUM).map(([k, v]) =>
+  nav.innerHTML = Object.entries(LEVELS).map(([k, v]) =>
     `<button class="lvl-btn${k === lvl ? ' on' : ''}"
        style="${k === lvl ? 'background:' + v.color + ';border-color:' + v.color + ';' : ''}"
        onclick="renderCurriculum('${k}')">${v.label}</button>`
@@ -1078,6 +1101,7 @@ function toggleModule(id) {
 function startLesson(lsnId, topic, level, modTitle) {
   ST.activeLesson = lsnId;
   ST.level = level;
+  markProgress();
   // Ir a pestaña conversación y arrancar la lección
   document.querySelectorAll('#mAdult .sec').forEach(s => s.classList.remove('on'));
   document.querySelectorAll('#mAdult .tab').forEach(t => t.classList.remove('on'));
@@ -1085,22 +1109,48 @@ function startLesson(lsnId, topic, level, modTitle) {
   document.querySelector('#mAdult .tab').classList.add('on');
   // actualizar pill de nivel
   document.getElementById('convLevelPill').textContent =
-    (CURRICULUM[level] ? CURRICULUM[level].label.split('—')[0].trim() : level);
+    (LEVELS[level] ? LEVELS[level].label.split('—')[0].trim() : level);
   // Arrancar con mensaje contextual
-  ST.history = [];
+  ST.convNueva = true;
   const box = document.getElementById('chatBox');
   box.innerHTML = '';
-  const prompt = `Comienza una lección nueva sobre: "${topic}" (módulo: ${modTitle}, nivel: ${level}).
-Saluda al alumno, explícale brevemente qué van a aprender hoy y da el primer paso de la lección.
-Habla en español cuando expliques, en inglés cuando practiques. Sé motivador y claro.`;
-  sendAI(prompt, true);
   // Re-renderizar para mostrar lección activa
   renderCurriculum(level);
+  // Primero el comienzo pregenerado de la lección (igual para todos, queda
+  // en la caché del navegador); si no está, se genera en vivo como antes
+  showPregenLesson(lsnId).then(ok => {
+    if (ok || ST.activeLesson !== lsnId) return;
+    const prompt = `Comienza una lección nueva sobre: "${topic}" (módulo: ${modTitle}, nivel: ${level}).
+Saluda al alumno, explícale brevemente qué van a aprender hoy y da el primer paso de la lección.
+Habla en español cuando expliques, en inglés cuando practiques. Sé motivador y claro.`;
+    sendAI(prompt, true);
+  });
+}
+
+// Muestra (y lee en voz alta) el comienzo pregenerado de la lección. La
+// charla con el profesor sigue a partir de él: el primer mensaje del
+// alumno va con "leccion" y el servidor arranca la conversación con ese
+// texto. Devuelve false si no hay contenido pregenerado.
+async function showPregenLesson(lsnId) {
+  const typing = addMsg('chatBox', 'ai', '<span class="spin"></span> preparando lección…');
+  let data = null;
+  try {
+    const res = await fetch('/api/academia/leccion/' + encodeURIComponent(lsnId));
+    if (res.ok) data = await res.json();
+  } catch(e) {}
+  typing.remove();
+  if (!data || !data.texto || ST.activeLesson !== lsnId) return false;
+  addMsg('chatBox', 'ai', adultHeader() + formatAIMsg(data.texto));
+  ST.convNueva = true;
+  ST.pregenLesson = lsnId;
+  const voz = sentenceSpeaker();
+  voz.terminar(data.texto);
+  return true;
 }
 
 function practiceModule(modId, modTitle, level) {
   aTab('conv', document.querySelector('#mAdult .tab'));
-  ST.history = [];
+  ST.convNueva = true;
   document.getElementById('chatBox').innerHTML = '';
   const prompt = `El alumno quiere practicar conversación del módulo: "${modTitle}" (nivel ${level}).
 Crea un diálogo de práctica real, como si fuera una situación de la vida cotidiana relacionada con ese módulo.
@@ -1110,7 +1160,7 @@ Empieza tú con la primera línea de la conversación en inglés y espera la res
 
 function testModule(modId, modTitle, level) {
   aTab('conv', document.querySelector('#mAdult .tab'));
-  ST.history = [];
+  ST.convNueva = true;
   document.getElementById('chatBox').innerHTML = '';
   const prompt = `Crea un mini test rápido de 5 preguntas sobre el módulo "${modTitle}" (nivel ${level}).
 Hace una pregunta por vez. Espera la respuesta antes de seguir. Al final da una puntuación y feedback.
@@ -1145,7 +1195,8 @@ function selectChar(id, el) {
   document.querySelectorAll('.char-card').forEach(c => c.classList.remove('on'));
   el.classList.add('on');
   // Resetear conversación con nuevo personaje
-  ST.history = [];
+  ST.convNueva = true;
+  ST.pregenLesson = null;
   document.getElementById('chatBox').innerHTML = '';
   const c = CHARACTERS[id];
   addMsg('chatBox', 'ai',
@@ -1171,29 +1222,21 @@ async function sendChat() {
   document.getElementById('btnSend').disabled = true;
 
   addMsg('chatBox', 'usr', escHtml(txt));
-  ST.history.push({ role: 'user', content: txt });
   ST.adaptive.msgCount++;
 
   const typing = addMsg('chatBox', 'ai', '<span class="spin"></span> escribiendo…');
   try {
-    const reply = await callClaude(buildAdultSystemPrompt(), ST.history);
+    // la respuesta del personaje se muestra y se lee a medida que llega
+    const reply = await sendAdult(buildAdultPrompt(), txt, typing);
     typing.remove();
     // Procesar feedback adaptativo
     processAdaptiveFeedback(txt, reply);
-    // Mostrar respuesta del personaje
-    const c = CHARACTERS[ST.char];
-    addMsg('chatBox', 'ai',
-      `<span class="msg-avatar">${c.emoji}</span>
-       <span class="msg-name">${c.name}</span>
-       ${formatAIMsg(reply)}`);
-    ST.history.push({ role: 'assistant', content: reply });
     // Marcar lección como hecha si hay activa
     if (ST.activeLesson && ST.adaptive.msgCount % 5 === 0) {
       ST.lessonsDone.add(ST.activeLesson);
       renderCurriculum(currentCurrLevel);
+      markProgress();
     }
-    // Profesor lee la respuesta en voz alta
-    speakAIReply(reply);
   } catch(e) {
     typing.remove();
     addMsg('chatBox', 'ai', '❌ Error al conectar con la IA. Revisá tu API key.');
@@ -1203,34 +1246,20 @@ async function sendChat() {
   inp.focus();
 }
 
-function buildAdultSystemPrompt() {
-  const c = CHARACTERS[ST.char];
-  const lvlData = CURRICULUM[ST.level] || CURRICULUM['A0'];
-  const diff = ST.adaptive.difficulty;
-
-  return `Sos ${c.name}, ${c.role} en la Academia Foschi IA.
-Descripción: ${c.desc}. Acento: ${c.accent}.
-
-NIVEL DEL ALUMNO: ${ST.level} — ${lvlData.label}
-TEMA ACTUAL: ${ST.topic}
-DIFICULTAD ADAPTATIVA: ${diff}
-
-ROL:
-- Actuás como ${c.role} en una conversación real de la vida cotidiana.
-- Hablás principalmente en inglés.
-- Cuando el alumno comete un error, lo corregís con este formato exacto:
-  🟡 Pequeño error: dijiste "_X_" → lo correcto es "_Y_" porque [razón breve]
-  Después repetís la corrección y pedís que la repita antes de seguir.
-- Si dice algo perfecto: "🟢 Perfect! [continúa la conversación]"
-- Si el error es grave: "🔴 Ojo: [explicación]"
-- Ajustás la complejidad según el nivel ${ST.level}:
-  ${diff === 'easy'   ? 'Usá frases MUY simples, más español, más apoyo.' : ''}
-  ${diff === 'normal' ? 'Mezcla equilibrada de inglés y español cuando explicás.' : ''}
-  ${diff === 'hard'   ? 'Todo en inglés, frases complejas, vocabulario avanzado.' : ''}
-- Nunca abandonés el rol.
-- Después de 4-5 intercambios sin errores, introducís vocabulario nuevo apropiado para el nivel.
-- Si el alumno pregunta algo de gramática, explicás en español con ejemplos claros.
-- Sos paciente, motivador, y siempre terminás con una pregunta o invitación a seguir.`;
+// El texto del profesor (rol, reglas, formato de correcciones) es fijo y lo
+// arma el servidor (prompts.py): acá sólo van los datos de este alumno, que
+// van después del texto fijo.
+function buildAdultPrompt(voz = false) {
+  return {
+    prompt: 'adulto',
+    vars: {
+      personaje: ST.char,
+      nivel: ST.level,
+      tema: ST.topic,
+      dificultad: ST.adaptive.difficulty,
+      voz: voz,
+    },
+  };
 }
 
 function processAdaptiveFeedback(userMsg, aiReply) {
@@ -1278,12 +1307,16 @@ function processAdaptiveFeedback(userMsg, aiReply) {
   // Actualizar skill de speaking/writing
   if (isPerfect) ST.skills.writing.done = Math.min(ST.skills.writing.done + 1, ST.skills.writing.total);
   if (a.msgCount % 3 === 0) ST.skills.grammar.done = Math.min(ST.skills.grammar.done + 1, ST.skills.grammar.total);
+  markProgress();
 }
 
 // ═══════════════════════════════════════════════════════════
 //  PRONUNCIACIÓN
 // ═══════════════════════════════════════════════════════════
-function nextPron() {
+async function nextPron() {
+  if (!PRON_WORDS.length) {
+    try { PRON_WORDS = await loadData('pronunciacion'); } catch(e) { return; }
+  }
   const words = PRON_WORDS;
   ST.pronIdx = (ST.pronIdx + 1) % words.length;
   ST.currentWord = words[ST.pronIdx];
@@ -1301,6 +1334,7 @@ function listenWord() {
   animateSoundBars();
   setTimeout(stopSoundBars, 2200);
   ST.skills.listening.done = Math.min(ST.skills.listening.done + 1, ST.skills.listening.total);
+  markProgress();
 }
 
 function startPron() {
@@ -1309,6 +1343,7 @@ function startPron() {
       '<div class="corr-box err-box">⚠️ Tu navegador no soporta reconocimiento de voz. Usá Chrome.</div>';
     return;
   }
+  if (!ST.currentWord) return;
   const btn = document.getElementById('btnPron');
   btn.disabled = true;
   btn.innerHTML = '🎤 Escuchando…';
@@ -1335,6 +1370,7 @@ function startPron() {
         🟢 <b>¡Perfecto!</b> Dijiste "<b>${best}</b>" — exactamente correcto 🎉
       </div>`;
       ST.skills.speaking.done = Math.min(ST.skills.speaking.done + 1, ST.skills.speaking.total);
+      markProgress();
       showPopup('🎤', '¡Excelente pronunciación!', `"${ST.currentWord.w}" — perfecto`);
     } else {
       // Pedir feedback a la IA
@@ -1387,29 +1423,12 @@ async function correctText() {
   btn.innerHTML = '<span class="spin"></span> Corrigiendo…';
   document.getElementById('corrRes').innerHTML = '';
 
-  const systemPrompt = `Sos un profesor de inglés experto. Analizás textos escritos por estudiantes hispanohablantes.
-Para cada error encontrado:
-1. Subrayá la frase original con error
-2. Mostrá la corrección
-3. Explicá la regla gramatical en español de forma clara
-4. Dá un ejemplo adicional
-
-Formato de respuesta:
----
-❌ Error: "[texto original con error]"
-✅ Corrección: "[texto correcto]"
-📚 Regla: [explicación en español]
-💡 Ejemplo: [otro ejemplo de uso correcto]
----
-
-Si el texto está perfecto, decilo y felicitá al alumno con entusiasmo.
-Al final dá una puntuación del 1 al 10 y un comentario general sobre el nivel de inglés.`;
-
   try {
-    const res = await callClaude(systemPrompt, [{ role: 'user', content: `Corregí este texto: "${txt}"` }]);
+    const res = await callClaude({ prompt: 'correccion' }, [{ role: 'user', content: `Corregí este texto: "${txt}"` }]);
     document.getElementById('corrRes').innerHTML =
       `<div class="corr-box">${formatAIMsg(res)}</div>`;
     ST.skills.writing.done = Math.min(ST.skills.writing.done + 2, ST.skills.writing.total);
+    markProgress();
   } catch(e) {
     document.getElementById('corrRes').innerHTML =
       '<div class="corr-box err-box">❌ Error al conectar con la IA.</div>';
@@ -1469,7 +1488,7 @@ function loadProg() {
 function repasarTopic(topic) {
   ST.topic = topic;
   aTab('conv', document.querySelector('#mAdult .tab'));
-  ST.history = [];
+  ST.convNueva = true;
   document.getElementById('chatBox').innerHTML = '';
   const prompt = `El alumno tiene dificultades con el tema: "${topic}".
 Diseñá un ejercicio de repaso corto y efectivo. Comenzá con una explicación breve en español,
@@ -1480,35 +1499,103 @@ luego practicá con 3 ejercicios concretos. Sé muy claro y paciente.`;
 // ═══════════════════════════════════════════════════════════
 //  LLAMADA A LA IA (Anthropic API)
 // ═══════════════════════════════════════════════════════════
-async function callClaude(system, messages, maxTokens = 900) {
+// prompt: { prompt: 'adulto' | 'correccion' | 'ninos', vars } (ver
+// buildAdultPrompt) o un string, que se manda tal cual como system.
+async function callClaude(prompt, messages, maxTokens = 900) {
+  const base = typeof prompt === 'string' ? { system: prompt } : prompt;
   const res = await fetch('/api/chat_ingles', {
     method: 'POST',
     headers: { 'Content-Type': 'application/json' },
-    body: JSON.stringify({ system, messages, max_tokens: maxTokens })
+    body: JSON.stringify({ ...base, messages, max_tokens: maxTokens })
   });
   if (!res.ok) throw new Error('API error ' + res.status);
   const data = await res.json();
   return data.content || data.reply || '';
 }
 
+// Conversación guardada en el servidor (por usuario y lección): se manda
+// sólo el mensaje nuevo (reiniciar = empezar de cero esa conversación) y
+// la respuesta llega en streaming: alTexto(txt) se llama con todo lo
+// recibido cada vez que llega un trozo y, si hablar, cada oración completa
+// se empieza a leer en voz alta enseguida.
+async function chatTutorStream(prompt, conversacion, mensaje, alTexto,
+                               { maxTokens = 900, reiniciar = false, leccion = null, hablar = false } = {}) {
+  const res = await fetch('/api/chat_ingles/stream', {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ ...prompt, conversacion, mensaje, reiniciar, leccion, max_tokens: maxTokens })
+  });
+  if (!res.ok) throw new Error('API error ' + res.status);
+  const voz = hablar ? sentenceSpeaker() : null;
+  let txt = '';
+  if (res.body && res.body.getReader) {
+    const reader = res.body.getReader();
+    const dec = new TextDecoder();
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      txt += dec.decode(value, { stream: true });
+      alTexto(txt);
+      if (voz) voz.agregar(txt);
+    }
+    txt += dec.decode();
+  } else {
+    txt = await res.text();   // navegador sin streams: todo junto
+  }
+  alTexto(txt);
+  if (voz) voz.terminar(txt);
+  return txt;
+}
+
+// Burbuja que se va completando con la respuesta (reemplaza a "escribiendo…")
+function streamBubble(boxId, cls, typing, cabecera = '') {
+  let el = null;
+  return txt => {
+    if (!txt) return;
+    if (!el) {
+      typing.remove();
+      el = addMsg(boxId, cls, '');
+    }
+    el.innerHTML = cabecera + formatAIMsg(txt);
+    const box = document.getElementById(boxId);
+    box.scrollTop = box.scrollHeight;
+  };
+}
+
+function adultHeader() {
+  const c = CHARACTERS[ST.char];
+  if (!c) return '';
+  return `<span class="msg-avatar">${c.emoji}</span>
+       <span class="msg-name">${c.name}</span>
+       `;
+}
+
+// Charla de adultos: una conversación por lección (o "libre"), en
+// streaming y leída en voz alta por oraciones
+async function sendAdult(prompt, mensaje, typing) {
+  const reiniciar = ST.convNueva;
+  // la conversación arranca desde el comienzo pregenerado que se mostró
+  const leccion = reiniciar && ST.pregenLesson === ST.activeLesson ? ST.pregenLesson : null;
+  ST.convNueva = false;
+  ST.pregenLesson = null;
+  try {
+    return await chatTutorStream(prompt, 'adulto:' + (ST.activeLesson || 'libre'), mensaje,
+      streamBubble('chatBox', 'ai', typing, adultHeader()), { reiniciar, leccion, hablar: true });
+  } catch(e) {
+    ST.convNueva = ST.convNueva || reiniciar;
+    ST.pregenLesson = ST.pregenLesson || leccion;
+    throw e;
+  }
+}
+
 // Función para enviar prompt de sistema directo (inicio de lección, etc.)
 async function sendAI(prompt, asSystem) {
   const typing = addMsg('chatBox', 'ai', '<span class="spin"></span> preparando lección…');
   try {
-    const msgs = asSystem
-      ? [{ role: 'user', content: prompt }]
-      : [...ST.history, { role: 'user', content: prompt }];
-    const reply = await callClaude(buildAdultSystemPrompt(), msgs);
+    if (asSystem) { ST.convNueva = true; ST.pregenLesson = null; }
+    // se muestra y el profesor la lee en voz alta a medida que llega
+    await sendAdult(buildAdultPrompt(), prompt, typing);
     typing.remove();
-    const c = CHARACTERS[ST.char];
-    addMsg('chatBox', 'ai',
-      `<span class="msg-avatar">${c.emoji}</span>
-       <span class="msg-name">${c.name}</span>
-       ${formatAIMsg(reply)}`);
-    ST.history.push({ role: 'user', content: prompt });
-    ST.history.push({ role: 'assistant', content: reply });
-    // Profesor lee la respuesta en voz alta
-    speakAIReply(reply);
   } catch(e) {
     typing.remove();
     addMsg('chatBox', 'ai', '❌ Error de conexión. Verificá el servidor.');
@@ -1590,26 +1677,73 @@ function toggleTTS() {
 // Lee la respuesta del profesor en voz alta.
 // Extrae primero las líneas en inglés (entre comillas o líneas sin español),
 // y omite las explicaciones en español para no confundir al alumno.
-function speakAIReply(txt) {
-  if (!window.speechSynthesis) return;
-  if (!ST.ttsEnabled) return;
-
+function cleanForSpeech(txt) {
   // Quitar emojis de feedback, markdown, HTML
-  let clean = txt
+  return txt
     .replace(/🟢|🟡|🔴/g, '')
     .replace(/\*\*(.*?)\*\*/g, '$1')
     .replace(/\*(.*?)\*/g, '$1')
     .replace(/<[^>]+>/g, '')
     .trim();
+}
 
-  // Si el nivel es A0/A1 leer todo despacio (mezcla español/inglés esperada)
-  const slowLevels = ['A0','A1'];
-  const rate = slowLevels.includes(ST.level) ? 0.75 : 0.88;
+function speakAIReply(txt) {
+  if (!window.speechSynthesis) return;
+  if (!ST.ttsEnabled) return;
+
+  let clean = cleanForSpeech(txt);
 
   // Limitar a primeras 300 chars para no leer parrafones enteros
   if (clean.length > 300) clean = clean.substring(0, 300) + '…';
 
   window.speechSynthesis.cancel();
+  window.speechSynthesis.speak(aiUtterance(clean));
+}
+
+// Lee en voz alta una respuesta que llega en streaming: cada oración
+// completa se encola apenas termina de llegar (speechSynthesis las dice en
+// orden), con el mismo tope de 300 caracteres que speakAIReply.
+function sentenceSpeaker() {
+  let leido = 0;      // caracteres del texto ya pasados a la voz
+  let resta = 300;
+  let primera = true;
+  const activo = !!(window.speechSynthesis && ST.ttsEnabled);
+
+  function decir(trozo) {
+    let clean = cleanForSpeech(trozo);
+    if (!clean || resta <= 0) return;
+    if (clean.length > resta) clean = clean.substring(0, resta) + '…';
+    resta -= clean.length;
+    if (primera) { window.speechSynthesis.cancel(); primera = false; }
+    window.speechSynthesis.speak(aiUtterance(clean));
+  }
+
+  return {
+    // txt: todo lo recibido hasta ahora
+    agregar(txt) {
+      if (!activo) return;
+      const pendiente = txt.slice(leido);
+      const fin = /[.!?…]+["')\]]*\s|\n/g;
+      let corte = 0, m;
+      while ((m = fin.exec(pendiente))) corte = m.index + m[0].length;
+      if (corte) {
+        decir(pendiente.slice(0, corte));
+        leido += corte;
+      }
+    },
+    terminar(txt) {
+      if (!activo) return;
+      decir(txt.slice(leido));
+      leido = txt.length;
+    },
+  };
+}
+
+function aiUtterance(clean) {
+  // Si el nivel es A0/A1 leer todo despacio (mezcla español/inglés esperada)
+  const slowLevels = ['A0','A1'];
+  const rate = slowLevels.includes(ST.level) ? 0.75 : 0.88;
+
   const u = new SpeechSynthesisUtterance(clean);
   // Detectar si hay más inglés que español para elegir el idioma de síntesis
   const spanishWords = (clean.match(/\b(que|es|de|en|un|una|con|para|por|el|la|los|las|si|no|yo|vos|sos|tenés|hola|bien|gracias)\b/gi) || []).length;
@@ -1623,7 +1757,7 @@ function speakAIReply(txt) {
     /female|woman|zira|samantha|karen|victoria|moira|fiona|tessa|google us english|google español/i.test(v.name)
   ) || voices.find(v => v.lang.startsWith(u.lang.split('-')[0]));
   if (female) u.voice = female;
-  window.speechSynthesis.speak(u);
+  return u;
 }
 
 function showPopup(emi, title, msg) {
@@ -1685,38 +1819,26 @@ function startVoiceChat() {
     inp.value = said;
 
     // Pedir al profesor que también corrija la pronunciación
-    const originalHistory = [...ST.history];
-    ST.history.push({ role: 'user', content: said });
-
     addMsg('chatBox', 'usr',
       `🎤 <i style="color:var(--pur3);font-size:.75rem">Dijiste:</i> ${escHtml(said)}`);
 
     const typing = addMsg('chatBox', 'ai', '<span class="spin"></span> el profe está escuchando…');
 
-    // System prompt especial: incluir corrección de pronunciación
-    const voiceSystem = buildAdultSystemPrompt() + `
-
-IMPORTANTE — El alumno acaba de hablar con el micrófono (no escribir). Por eso, además de responder el contenido, analizá brevemente si la pronunciación registrada "${said}" tiene sentido como inglés hablado. Si detectás posibles errores de pronunciación (palabras mal reconocidas, mezcla de idiomas, etc.), mencionálo brevemente con formato: 🎙️ Pronunciación: [comentario corto]. Si suena correcto no menciones nada de pronunciación, seguí la conversación normal.`;
+    // Prompt especial: incluir corrección de pronunciación
+    const voiceSystem = buildAdultPrompt(true);
 
     try {
-      const reply = await callClaude(voiceSystem, [...originalHistory, { role: 'user', content: said }]);
+      const reply = await sendAdult(voiceSystem, said, typing);
       typing.remove();
       processAdaptiveFeedback(said, reply);
-      const c = CHARACTERS[ST.char];
-      addMsg('chatBox', 'ai',
-        `<span class="msg-avatar">${c.emoji}</span>
-         <span class="msg-name">${c.name}</span>
-         ${formatAIMsg(reply)}`);
-      ST.history.push({ role: 'assistant', content: reply });
       if (ST.activeLesson && ST.adaptive.msgCount % 5 === 0) {
         ST.lessonsDone.add(ST.activeLesson);
         renderCurriculum(currentCurrLevel);
+        markProgress();
       }
-      speakAIReply(reply);
     } catch(err) {
       typing.remove();
       addMsg('chatBox', 'ai', '❌ Error al conectar con la IA.');
-      ST.history = originalHistory;
     }
     inp.value = '';
   };
@@ -1756,13 +1878,14 @@ function levenshtein(a, b) {
 // ═══════════════════════════════════════════════════════════
 //  INIT
 // ═══════════════════════════════════════════════════════════
-window.addEventListener('DOMContentLoaded', () => {
+window.addEventListener('DOMContentLoaded', async () => {
   renderCurriculum('A0');
+  // las palabras de pronunciación se bajan al abrir esa pestaña
+  try { CHARACTERS = await loadData('personajes'); } catch(e) {}
   renderCharGrid();
-  nextPron();
   // Mensaje de bienvenida en chat
   const c = CHARACTERS[ST.char];
-  addMsg('chatBox', 'ai',
+  if (c) addMsg('chatBox', 'ai',
     `${c.emoji} <b>Hola! Soy ${c.name}</b>, tu profe de inglés 👋<br>
     <small>Elegí un tema arriba y escribime en inglés o en español para empezar. ¡No te preocupes por los errores, para eso estoy yo! 😊</small>`);
 
@@ -1822,6 +1945,7 @@ academia_ingles_parte_3.py — Academia Foschi IA  ▸ VERSIÓN 2.0
 ═══════════════════════════════════════════════════════════
 """
 
+import hashlib
 import json
 import os
 
@@ -1832,10 +1956,10 @@ import os
 ACADEMIA_JS_PART3 = r"""
 <script>
 // ═══════════════════════════════════════════════════════════
-//  DATOS NIÑOS (inyectados desde Python)
+//  DATOS NIÑOS (se bajan al entrar al modo niños, ver loadData)
 // ═══════════════════════════════════════════════════════════
-const VOCAB_KIDS = VOCAB_KIDS_PLACEHOLDER;
-const ABC_DATA   = ABC_DATA_PLACEHOLDER;
+let VOCAB_KIDS = {};
+let ABC_DATA   = {};
 const PRON_KIDS  = [
   {"e":"🍎","w":"Apple","ipa":"/ˈæp.əl/"},{"e":"🐶","w":"Dog","ipa":"/dɒɡ/"},
   {"e":"🐱","w":"Cat","ipa":"/kæt/"},{"e":"🍌","w":"Banana","ipa":"/bəˈnɑː.nə/"},
@@ -1844,13 +1968,14 @@ const PRON_KIDS  = [
   {"e":"🍕","w":"Pizza","ipa":"/ˈpiːt.sə/"},{"e":"🦁","w":"Lion","ipa":"/ˈlaɪ.ən/"},
   {"e":"🐘","w":"Elephant","ipa":"/ˈel.ɪ.fənt/"},{"e":"🌈","w":"Rainbow","ipa":"/ˈreɪn.boʊ/"},
 ];
-const BADGES_DEF = BADGES_PLACEHOLDER;
+let BADGES_DEF = [];
 
 // ═══════════════════════════════════════════════════════════
 //  ESTADO NIÑOS
 // ═══════════════════════════════════════════════════════════
 const KST = {
   stars: 0,
+  convNueva: true,   // la charla con Leo arranca de cero en cada visita
   badges: new Set(),
   abcIdx: 0,
   currentLetter: 'A',
@@ -1862,17 +1987,26 @@ const KST = {
   memoFlipped: [],
   memoMatched: new Set(),
   kidsPronIdx: 0,
-  kidsHistory: [],
   voiceCount: 0,
   chatCount: 0,
   abcDone: new Set(),
   streakDays: parseInt(localStorage.getItem('kst_streak') || '0'),
+  streakDay: '',     // último día con práctica (AAAA-MM-DD)
 };
 
 // ═══════════════════════════════════════════════════════════
 //  INIT NIÑOS
 // ═══════════════════════════════════════════════════════════
-function initKids() {
+async function initKids() {
+  if (!BADGES_DEF.length) {
+    try {
+      [VOCAB_KIDS, ABC_DATA, BADGES_DEF] = await Promise.all(
+        ['vocabulario', 'abc', 'insignias'].map(loadData));
+    } catch(e) {
+      showPopup('⚠️', 'Sin conexión', 'No se pudieron cargar los juegos. Probá de nuevo.');
+      return;
+    }
+  }
   buildABCGrid();
   nextGame();
   initMemo();
@@ -1907,6 +2041,7 @@ function updateStars(add) {
   KST.stars += add;
   document.getElementById('stC').textContent = KST.stars;
   checkBadges();
+  markProgress();
 }
 
 function checkBadges() {
@@ -2211,23 +2346,16 @@ async function sendKChat() {
   if (!txt) return;
   inp.value = '';
   addMsg('kidsChatBox', 'usr', escHtml(txt));
-  KST.kidsHistory.push({ role: 'user', content: txt });
   KST.chatCount++;
 
   const typing = addMsg('kidsChatBox', 'kid-ai', '<span class="spin"></span> Leo está pensando…');
-  const system = `Sos Leo el León 🦁, un profesor de inglés muy divertido y paciente para niños de 4 a 12 años.
-Siempre respondés con mucha energía, emojis y entusiasmo. Usás palabras simples.
-Si el niño escribe en español, respondés en español y le enseñás la palabra en inglés.
-Si escribe en inglés, lo felicitás muchísimo y seguís en inglés simple.
-Siempre terminás con una pregunta fácil o un juego breve para mantener el interés.
-Nunca usás lenguaje difícil. Siempre sos positivo, nunca decís que algo está "mal" — siempre decís "¡Casi! Probemos de nuevo 🌟".
-Usás muchos emojis de animales, estrellas y corazones.`;
 
   try {
-    const reply = await callClaude(system, KST.kidsHistory, 500);
+    const reiniciar = KST.convNueva;
+    KST.convNueva = false;
+    await chatTutorStream({ prompt: 'ninos' }, 'ninos', txt,
+      streamBubble('kidsChatBox', 'kid-ai', typing, '🦁 '), { maxTokens: 500, reiniciar });
     typing.remove();
-    addMsg('kidsChatBox', 'kid-ai', '🦁 ' + formatAIMsg(reply));
-    KST.kidsHistory.push({ role: 'assistant', content: reply });
     updateStars(3);
     checkBadges();
   } catch(e) {
@@ -2235,6 +2363,172 @@ Usás muchos emojis de animales, estrellas y corazones.`;
     addMsg('kidsChatBox', 'kid-ai', '🦁 ¡Ups! Leo no pudo responder. ¡Intentá de nuevo! 😊');
   }
 }
+
+// ═══════════════════════════════════════════════════════════
+//  PROGRESO GUARDADO EN EL SERVIDOR
+// ═══════════════════════════════════════════════════════════
+// El progreso de adultos y niños se sincroniza con /api/academia/progreso
+// (así no se pierde al cambiar de dispositivo). markProgress(), después
+// de cada cambio, programa un envío a los PROG_DEBOUNCE ms (como mucho
+// PROG_MAX_WAIT ms después del primero) con sólo los campos que cambiaron,
+// cada uno con su hora; al ocultar la página se manda lo que falte con
+// sendBeacon. Por campo gana el cambio más nuevo. localStorage guarda una
+// copia para mostrar el progreso sin esperar al servidor.
+const PROG_KEY = 'academia_progreso';
+const PROG_DEBOUNCE = 3000;
+const PROG_MAX_WAIT = 20000;
+const PROG = {
+  campos: {},            // campo → { v: valor, t: hora del cambio (ms) }
+  pendientes: new Set(), // campos cambiados que el servidor todavía no tiene
+  listo: false,          // ya se mezcló con lo del servidor
+  timer: null,
+  desde: 0,              // hora del primer cambio sin enviar
+};
+
+function progressSnapshot() {
+  return {
+    nivel:       ST.level,
+    lecciones:   [...ST.lessonsDone],
+    habilidades: Object.fromEntries(Object.entries(ST.skills).map(([k, s]) => [k, s.done])),
+    errores:     ST.adaptive.errorTopics,
+    estrellas:   KST.stars,
+    insignias:   [...KST.badges],
+    abc:         [...KST.abcDone],
+    voces:       KST.voiceCount,
+    charlas:     KST.chatCount,
+    racha:       KST.streakDays,
+    racha_dia:   KST.streakDay,
+  };
+}
+
+function applyProgress() {
+  const v = k => PROG.campos[k] ? PROG.campos[k].v : undefined;
+  const num = k => typeof v(k) === 'number';
+  if (LEVELS[v('nivel')]) ST.level = v('nivel');
+  if (Array.isArray(v('lecciones'))) ST.lessonsDone = new Set(v('lecciones'));
+  const hab = v('habilidades') || {};
+  for (const k in ST.skills)
+    if (typeof hab[k] === 'number') ST.skills[k].done = Math.min(hab[k], ST.skills[k].total);
+  if (v('errores') && typeof v('errores') === 'object') ST.adaptive.errorTopics = v('errores');
+  if (num('estrellas')) KST.stars = v('estrellas');
+  if (Array.isArray(v('insignias'))) KST.badges = new Set(v('insignias'));
+  if (Array.isArray(v('abc'))) KST.abcDone = new Set(v('abc'));
+  if (num('voces')) KST.voiceCount = v('voces');
+  if (num('charlas')) KST.chatCount = v('charlas');
+  if (num('racha')) KST.streakDays = v('racha');
+  if (typeof v('racha_dia') === 'string') KST.streakDay = v('racha_dia');
+  renderCurriculum(currentCurrLevel);
+  document.getElementById('stC').textContent = KST.stars;
+  renderBadges();
+  buildABCGrid();
+}
+
+function saveLocalProgress() {
+  try {
+    localStorage.setItem(PROG_KEY, JSON.stringify({ campos: PROG.campos, pendientes: [...PROG.pendientes] }));
+  } catch(e) {}
+}
+
+// Anota con la hora actual los campos que cambiaron desde la última vez
+function collectProgress() {
+  const snap = progressSnapshot();
+  const ahora = Date.now();
+  for (const k in snap) {
+    const prev = PROG.campos[k];
+    if (!prev || JSON.stringify(prev.v) !== JSON.stringify(snap[k])) {
+      PROG.campos[k] = { v: snap[k], t: ahora };
+      PROG.pendientes.add(k);
+    }
+  }
+  saveLocalProgress();
+}
+
+// Racha: días seguidos con práctica (cuenta el primer cambio de cada día)
+function updateStreak() {
+  const dia = d => d.toLocaleDateString('sv');   // AAAA-MM-DD local
+  const hoy = dia(new Date());
+  if (KST.streakDay === hoy) return;
+  const ayer = dia(new Date(Date.now() - 86400000));
+  KST.streakDays = KST.streakDay === ayer ? KST.streakDays + 1 : 1;
+  KST.streakDay = hoy;
+  checkBadges();
+}
+
+function markProgress() {
+  updateStreak();
+  if (!PROG.listo) return;   // se junta todo al terminar de cargar
+  if (!PROG.desde) PROG.desde = Date.now();
+  clearTimeout(PROG.timer);
+  const espera = Math.min(PROG_DEBOUNCE, PROG.desde + PROG_MAX_WAIT - Date.now());
+  PROG.timer = setTimeout(syncProgress, Math.max(0, espera));
+}
+
+async function syncProgress(beacon = false) {
+  clearTimeout(PROG.timer);
+  PROG.desde = 0;
+  if (!PROG.listo) return;
+  collectProgress();
+  if (!PROG.pendientes.size) return;
+  const enviados = [...PROG.pendientes];
+  const body = JSON.stringify({ cambios: Object.fromEntries(enviados.map(k => [k, PROG.campos[k]])) });
+  PROG.pendientes.clear();
+  if (beacon && navigator.sendBeacon &&
+      navigator.sendBeacon('/api/academia/progreso', new Blob([body], { type: 'application/json' }))) {
+    saveLocalProgress();
+    return;
+  }
+  try {
+    const res = await fetch('/api/academia/progreso', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body,
+      keepalive: beacon,
+    });
+    if (!res.ok) throw new Error('API error ' + res.status);
+  } catch(e) {
+    enviados.forEach(k => PROG.pendientes.add(k));   // van en el próximo envío
+  }
+  saveLocalProgress();
+}
+
+async function initProgress() {
+  try {
+    const local = JSON.parse(localStorage.getItem(PROG_KEY) || '{}');
+    PROG.campos = local.campos || {};
+    PROG.pendientes = new Set(local.pendientes || []);
+  } catch(e) {}
+  // lo que nunca cambió arranca con hora 0: cualquier valor guardado le gana
+  const snap = progressSnapshot();
+  for (const k in snap) if (!PROG.campos[k]) PROG.campos[k] = { v: snap[k], t: 0 };
+  applyProgress();
+  try {
+    const res = await fetch('/api/academia/progreso', { cache: 'no-store' });
+    if (!res.ok) throw new Error('API error ' + res.status);
+    const remoto = (await res.json()).progreso || {};
+    for (const k in remoto) {
+      const local = PROG.campos[k];
+      if (!local || remoto[k].t >= local.t) {
+        PROG.campos[k] = remoto[k];
+        PROG.pendientes.delete(k);
+      } else {
+        PROG.pendientes.add(k);   // lo de este dispositivo es más nuevo
+      }
+    }
+    applyProgress();
+  } catch(e) {
+    // sin servidor se sigue con la copia local; se reintenta al recargar
+    return;
+  }
+  PROG.listo = true;
+  saveLocalProgress();
+  if (PROG.pendientes.size) markProgress();
+}
+
+window.addEventListener('DOMContentLoaded', initProgress);
+document.addEventListener('visibilitychange', () => {
+  if (document.visibilityState === 'hidden') syncProgress(true);
+});
+window.addEventListener('pagehide', () => syncProgress(true));
 </script>
 """
 
@@ -2243,34 +2537,116 @@ Usás muchos emojis de animales, estrellas y corazones.`;
 #  ENSAMBLADO HTML — autónomo, sin imports externos
 # ─────────────────────────────────────────────────────────────
 
+# Los datos del curso (currículo por nivel, personajes, palabras, juegos de
+# niños) ya no van embebidos en la página: cada uno es un JSON aparte en
+# /api/academia/datos/<nombre>?v=<hash del contenido>, que el front-end baja
+# cuando lo usa y el navegador guarda un año (si el contenido cambia, cambia
+# la URL). La página trae sólo las URLs y el índice de niveles.
+
+_datos_holder = [None]   # {nombre: (cuerpo JSON, versión)}
+
+
+def datos_academia():
+    """{nombre: (cuerpo JSON en bytes, versión)} de los recursos del front-end."""
+    if _datos_holder[0] is None:
+        recursos = {f"curriculo_{nivel}": datos for nivel, datos in CURRICULUM.items()}
+        recursos.update(
+            personajes=CHARACTERS,
+            pronunciacion=PRON_WORDS,
+            vocabulario=VOCAB_KIDS,
+            abc=ABC_DATA,
+            insignias=BADGES,
+        )
+        datos = {}
+        for nombre, valor in recursos.items():
+            cuerpo = json.dumps(valor, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            datos[nombre] = (cuerpo, hashlib.sha256(cuerpo).hexdigest()[:12])
+        _datos_holder[0] = datos
+    return _datos_holder[0]
+
+
+def respuesta_datos(nombre, version):
+    """Respuesta de Flask para /api/academia/datos/<nombre>."""
+    from flask import Response, jsonify
+
+    recurso = datos_academia().get(nombre)
+    if recurso is None:
+        return jsonify({"error": "Recurso inexistente."}), 404
+    cuerpo, actual = recurso
+    resp = Response(cuerpo, mimetype="application/json")
+    # con la versión vigente en la URL no cambia nunca; sin ella (o con una
+    # vieja) se sirve lo actual, revalidando con el ETag
+    if version == actual:
+        resp.headers["Cache-Control"] = "private, max-age=31536000, immutable"
+    else:
+        resp.headers["Cache-Control"] = "private, no-cache"
+    return resp
+
+
 def build_full_html():
-    """Genera el HTML completo inyectando todos los datos como JSON embebido."""
-    curriculum_json = json.dumps(CURRICULUM,  ensure_ascii=False)
-    characters_json = json.dumps(CHARACTERS,  ensure_ascii=False)
-    pron_words_json = json.dumps(PRON_WORDS,  ensure_ascii=False)
-    vocab_kids_json = json.dumps(VOCAB_KIDS,  ensure_ascii=False)
-    abc_data_json   = json.dumps(ABC_DATA,    ensure_ascii=False)
-    badges_json     = json.dumps(BADGES,      ensure_ascii=False)
-
-    # Inyectar placeholders JS adultos (con o sin comillas)
-    js2 = ACADEMIA_JS_PART2
-    for _old, _new in [
-        ('"CURRICULUM_PLACEHOLDER"',  curriculum_json),
-        ('CURRICULUM_PLACEHOLDER',    curriculum_json),
-        ('"CHARACTERS_PLACEHOLDER"',  characters_json),
-        ('CHARACTERS_PLACEHOLDER',    characters_json),
-        ('"PRON_WORDS_PLACEHOLDER"',  pron_words_json),
-        ('PRON_WORDS_PLACEHOLDER',    pron_words_json),
-    ]:
-        js2 = js2.replace(_old, _new)
-
-    # Inyectar placeholders JS niños
-    js3 = (ACADEMIA_JS_PART3
-           .replace('VOCAB_KIDS_PLACEHOLDER', vocab_kids_json)
-           .replace('ABC_DATA_PLACEHOLDER',   abc_data_json)
-           .replace('BADGES_PLACEHOLDER',     badges_json))
-
-    return ACADEMIA_HTML.replace('</body>', js2 + '\n' + js3 + '\n</body>')
+    """Genera el HTML completo con las URLs de los datos (ver datos_academia)."""
+    urls = {
+        nombre: f"/api/academia/datos/{nombre}?v={version}"
+        for nombre, (_, version) in datos_academia().items()
+    }
+    niveles = {nivel: {"label": d["label"], "color": d["color"]} for nivel, d in CURRICULUM.items()}
+
+    js2 = (ACADEMIA_JS_PART2
+           .replace('DATA_URLS_PLACEHOLDER', json.dumps(urls, ensure_ascii=False))
+           .replace('LEVELS_PLACEHOLDER',    json.dumps(niveles, ensure_ascii=False)))
+
+    return ACADEMIA_HTML.replace('</body>', js2 + '\n' + ACADEMIA_JS_PART3 + '\n</body>')
+
+
+# ─────────────────────────────────────────────────────────────
+#  PROMPTS DEL PROFESOR
+#  El texto fijo (rol, reglas, formato) está en el registro compartido
+#  (prompts.py); el front-end manda sólo el nombre y los datos del alumno,
+#  que van después del texto fijo: a lo largo de una clase el comienzo
+#  (texto fijo + datos + historial) se repite y OpenAI lo puede cachear.
+# ─────────────────────────────────────────────────────────────
+
+_PROMPTS_ACADEMIA = {
+    "adulto":     "academia_adulto",
+    "correccion": "academia_correccion",
+    "ninos":      "academia_ninos",
+}
+
+
+def _mensajes_academia(data, messages, resumen=""):
+    """
+    (clave del prompt o None, mensajes para OpenAI) para un pedido del
+    front-end; `resumen` es el de la conversación guardada en el servidor.
+    Sin "prompt" conocido se usa el "system" que mande el cliente, como
+    antes.
+    """
+    from prompts import mensajes
+
+    nombre = _PROMPTS_ACADEMIA.get(data.get("prompt"))
+    if nombre is None:
+        system = data.get("system", "Sos un profesor de inglés.")
+        if resumen:
+            system += f"\n\nRESUMEN DE LA CLASE HASTA AHORA:\n{resumen}"
+        return None, [{"role": "system", "content": system}] + messages
+
+    variable = ""
+    extra = ()
+    if nombre == "academia_adulto":
+        datos = data.get("vars") or {}
+        c = CHARACTERS.get(datos.get("personaje"), CHARACTERS["emily"])
+        nivel = datos.get("nivel") if datos.get("nivel") in CURRICULUM else "A0"
+        variable = (
+            f"PERSONAJE: {c['name']}, {c['role']}. Descripción: {c['desc']}. Acento: {c['accent']}.\n"
+            f"NIVEL DEL ALUMNO: {nivel} — {CURRICULUM[nivel]['label']}\n"
+            f"TEMA ACTUAL: {str(datos.get('tema', ''))[:200]}\n"
+            f"DIFICULTAD ADAPTATIVA: {datos.get('dificultad', 'normal')}"
+        )
+        if datos.get("voz"):
+            extra = ("academia_voz",)
+    if resumen:
+        variable = "\n\n".join(p for p in (variable, f"RESUMEN DE LA CLASE HASTA AHORA:\n{resumen}") if p)
+    clave = "_".join((nombre,) + extra)
+    return clave, mensajes(nombre, variable=variable, historial=messages, extra=extra)
 
 
 # ─────────────────────────────────────────────────────────────
@@ -2291,7 +2667,6 @@ def create_flask_app():
     @app.route("/api/chat", methods=["POST"])
     def api_chat():
         data     = request.get_json(force=True)
-        system   = data.get("system", "Sos un profesor de inglés.")
         messages = data.get("messages", [])
         max_tok  = int(data.get("max_tokens", 900))
 
@@ -2299,7 +2674,7 @@ def create_flask_app():
             messages = messages[-20:]
 
         # Construir mensajes para OpenAI (system va primero)
-        oai_messages = [{"role": "system", "content": system}] + messages
+        _, oai_messages = _mensajes_academia(data, messages)
 
         try:
             resp = client.chat.completions.create(
@@ -2316,6 +2691,10 @@ def create_flask_app():
         except Exception as e:
             return jsonify({"error": str(e)}), 500
 
+    @app.route("/api/academia/datos/<nombre>")
+    def datos(nombre):
+        return respuesta_datos(nombre, request.args.get("v"))
+
     @app.route("/api/health")
     def health():
         return jsonify({"status": "ok", "version": "2.0"})
@@ -2327,17 +2706,33 @@ def create_flask_app():
 #  INTEGRACIÓN CON FOSCHI IA — init_academia_ingles(app)
 # ─────────────────────────────────────────────────────────────
 
-def _register_routes(app):
-    from flask import request, jsonify, redirect, session
-    from openai import OpenAI, AuthenticationError, RateLimitError
+def _register_routes(bp):
+    import inspect
+    from flask import request, jsonify, redirect, session, make_response, Response
     from functools import wraps
 
+    ESPERA_STREAM = 120          # segundos máximos entre trozos del stream
+    _streams_en_curso = set()    # referencias a las tareas que leen streams
+
     # ─────────────────────────────────────────────────────────────
     #  DECORADOR PREMIUM CENTRALIZADO
     #  Verifica: login → sesión válida → suscripción activa → superusuario
     #  Usar en TODAS las rutas Premium de la academia.
     # ─────────────────────────────────────────────────────────────
     def _requiere_premium(f):
+        if inspect.iscoroutinefunction(f):
+            # vista async: se reusa el chequeo sync con una vista vacía
+            # (devuelve None si pasa, o la respuesta de rechazo)
+            @wraps(f)
+            async def _wrapper_async(*args, **kwargs):
+                import asyncio
+                # lee la suscripción de disco: en un hilo, no en el event loop
+                permitido = await asyncio.to_thread(_requiere_premium(lambda: None))
+                if permitido is not None:
+                    return permitido
+                return await f(*args, **kwargs)
+            return _wrapper_async
+
         @wraps(f)
         def _wrapper(*args, **kwargs):
             try:
@@ -2374,43 +2769,100 @@ def _register_routes(app):
             return f(*args, **kwargs)
         return _wrapper
 
-    _client_holder = [None]
+    async def _completar(intencion, **kwargs):
+        # modelo y métricas por intención, con el AsyncOpenAI compartido
+        # con el resto de la app (ver modelos.py y asincronico.py)
+        from modelos import completar
+        return await completar(intencion, **kwargs)
+
+    # ── Conversaciones guardadas en el servidor ──
+    # Con "conversacion" (ej. "ninos", "adulto:a1_m2_l3") el cliente manda
+    # sólo el "mensaje" nuevo y el historial sale del servidor (ver
+    # conversaciones_academia.py); sin ella manda "messages", como antes.
+
+    async def _preparar_pedido(data):
+        """(conversación o None, mensaje nuevo, clave del prompt, mensajes para OpenAI)."""
+        import asyncio
+        import conversaciones_academia as conv
+
+        conversacion = data.get("conversacion")
+        if not conv.nombre_valido(conversacion):
+            messages = data.get("messages", [])[-20:]
+            clave, oai_messages = _mensajes_academia(data, messages)
+            return None, None, clave, oai_messages
+
+        mensaje = str(data.get("mensaje") or "")[:conv.MENSAJE_MAX_CARACTERES]
+        reiniciar = bool(data.get("reiniciar"))
+        inicio = None
+        leccion = data.get("leccion")
+        if reiniciar and leccion and conversacion == f"adulto:{leccion}":
+            # la lección arrancó con su comienzo pregenerado: la charla
+            # sigue desde ahí (ver lecciones_academia.py)
+            from lecciones_academia import historial_inicial
+            inicio = await asyncio.to_thread(historial_inicial, leccion)
+        resumen, previos = await asyncio.to_thread(
+            conv.preparar, session.get("user_email"), conversacion, reiniciar, inicio
+        )
+        clave, oai_messages = _mensajes_academia(
+            data, previos + [{"role": "user", "content": mensaje}], resumen
+        )
+        return conversacion, mensaje, clave, oai_messages
+
+    async def _guardar_turno(usuario, conversacion, mensaje, respuesta):
+        import asyncio
+        import conversaciones_academia as conv
 
-    def _get_client():
-        if _client_holder[0] is None:
-            _client_holder[0] = OpenAI(api_key=os.environ.get("OPENAI_API_KEY", ""))
-        return _client_holder[0]
+        try:
+            if await asyncio.to_thread(conv.registrar, usuario, conversacion, mensaje, respuesta):
+                conv.programar_resumen(usuario, conversacion)
+        except Exception as e:
+            # la respuesta ya está: que no se pierda por no poder guardarla
+            print("Error guardando conversación de la academia:", e)
 
-    _cached_html = build_full_html()
+    # CSS/JS (con el currículo) como assets versionados y cacheables.
+    # Se arma en la primera visita, no al arrancar la app.
+    _html_holder = [None]
+
+    def _get_html():
+        if _html_holder[0] is None:
+            from estaticos import empaquetar_html
+            _html_holder[0] = empaquetar_html(build_full_html(), "academia")
+        return _html_holder[0]
 
     # ── Rutas protegidas con @_requiere_premium ──
 
-    @app.route("/academia")
-    @app.route("/ingles")
+    @bp.route("/academia")
+    @bp.route("/ingles")
     @_requiere_premium
     def academia_index():
-        return _cached_html
+        resp = make_response(_get_html())
+        # privada (es Premium) y siempre revalidada: el ETag lo pone el
+        # middleware de compresión de la app principal
+        resp.headers["Cache-Control"] = "private, no-cache"
+        return resp
 
-    @app.route("/api/chat_ingles", methods=["POST"])
+    @bp.route("/api/chat_ingles", methods=["POST"])
     @_requiere_premium
-    def academia_chat():
+    async def academia_chat():
+        from openai import AuthenticationError, RateLimitError
+
         data     = request.get_json(force=True)
-        system   = data.get("system", "Sos un profesor de inglés.")
-        messages = data.get("messages", [])
         max_tok  = int(data.get("max_tokens", 900))
 
-        if len(messages) > 20:
-            messages = messages[-20:]
-
-        oai_messages = [{"role": "system", "content": system}] + messages
+        conversacion, mensaje, clave, oai_messages = await _preparar_pedido(data)
+        if conversacion and not mensaje.strip():
+            return jsonify({"error": "Mensaje vacío."}), 400
 
         try:
-            resp = _get_client().chat.completions.create(
-                model="gpt-4o-mini",
+            resp = await _completar(
+                "academia",
+                prompt=clave,
                 max_tokens=max_tok,
                 messages=oai_messages,
             )
             reply = resp.choices[0].message.content or ""
+            if conversacion:
+                await _guardar_turno(session.get("user_email"), conversacion, mensaje, reply)
             return jsonify({"content": reply})
         except AuthenticationError:
             return jsonify({"error": "API key inválida. Revisá OPENAI_API_KEY."}), 401
@@ -2419,11 +2871,151 @@ def _register_routes(app):
         except Exception as e:
             return jsonify({"error": str(e)}), 500
 
-    @app.route("/api/health_academia")
+    @bp.route("/api/chat_ingles/stream", methods=["POST"])
+    @_requiere_premium
+    async def academia_chat_stream():
+        # Igual que /api/chat_ingles, pero la respuesta sale en texto plano
+        # a medida que el modelo la genera: el front-end la muestra y lee en
+        # voz alta por oraciones sin esperar al final. Los errores antes de
+        # empezar vuelven como JSON con su status; uno a mitad de camino,
+        # como una línea "❌ ..." al final del texto.
+        import asyncio
+        import queue
+        import threading
+        from openai import AuthenticationError, RateLimitError
+
+        data    = request.get_json(force=True)
+        max_tok = int(data.get("max_tokens", 900))
+        usuario = session.get("user_email")
+
+        conversacion, mensaje, clave, oai_messages = await _preparar_pedido(data)
+        if conversacion and not mensaje.strip():
+            return jsonify({"error": "Mensaje vacío."}), 400
+
+        try:
+            stream = await _completar(
+                "academia",
+                prompt=clave,
+                max_tokens=max_tok,
+                messages=oai_messages,
+                stream=True,
+            )
+        except AuthenticationError:
+            return jsonify({"error": "API key inválida. Revisá OPENAI_API_KEY."}), 401
+        except RateLimitError:
+            return jsonify({"error": "Límite de uso alcanzado. Esperá un momento."}), 429
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+
+        # El stream se lee en el event loop (donde se creó) y los trozos
+        # pasan por una cola al generador de la respuesta, que corre en el
+        # hilo que escribe al cliente.
+        cola = queue.Queue()
+        cortado = threading.Event()   # el cliente se fue
+
+        async def _leer():
+            partes = []
+            try:
+                async for chunk in stream:
+                    if cortado.is_set():
+                        break
+                    texto = chunk.choices[0].delta.content if chunk.choices else None
+                    if texto:
+                        partes.append(texto)
+                        cola.put(texto)
+                if conversacion and not cortado.is_set():
+                    await _guardar_turno(usuario, conversacion, mensaje, "".join(partes))
+            except Exception as e:
+                cola.put(f"\n❌ Se cortó la respuesta: {e}")
+            finally:
+                await stream.aclose()
+                cola.put(None)
+
+        tarea = asyncio.get_running_loop().create_task(_leer())
+        _streams_en_curso.add(tarea)
+        tarea.add_done_callback(_streams_en_curso.discard)
+
+        def _generar():
+            try:
+                while True:
+                    texto = cola.get(timeout=ESPERA_STREAM)
+                    if texto is None:
+                        return
+                    yield texto.encode("utf-8")
+            except queue.Empty:
+                return
+            finally:
+                cortado.set()
+
+        resp = Response(_generar(), mimetype="text/plain")
+        resp.headers["Cache-Control"] = "no-store"
+        resp.headers["X-Accel-Buffering"] = "no"   # sin buffer en nginx
+        return resp
+
+    @bp.route("/api/academia/leccion/<leccion>")
+    @_requiere_premium
+    def academia_leccion(leccion):
+        # Comienzo pregenerado de una lección (ver lecciones_academia.py).
+        # Es igual para todos los alumnos: el navegador lo guarda un día y
+        # después revalida con el ETag. 404 → el front-end la arranca en vivo.
+        from lecciones_academia import obtener
+
+        contenido = obtener(leccion)
+        if contenido is None:
+            resp = jsonify({"error": "sin_pregenerar"})
+            resp.status_code = 404
+            resp.headers["Cache-Control"] = "no-store"
+            return resp
+        resp = jsonify(contenido)
+        resp.headers["Cache-Control"] = "private, max-age=86400"
+        return resp
+
+    @bp.route("/api/academia/datos/<nombre>")
+    @_requiere_premium
+    def academia_datos(nombre):
+        return respuesta_datos(nombre, request.args.get("v"))
+
+    # ── Progreso del alumno (ver progreso_academia.py) ──
+
+    @bp.route("/api/academia/progreso", methods=["GET"])
+    @_requiere_premium
+    def academia_progreso():
+        from progreso_academia import cargar
+
+        resp = jsonify({"progreso": cargar(session.get("user_email"))})
+        resp.headers["Cache-Control"] = "no-store"
+        return resp
+
+    @bp.route("/api/academia/progreso", methods=["POST"])
+    @_requiere_premium
+    def academia_progreso_sync():
+        # sólo los campos que cambiaron, con la hora del cambio; también
+        # llega por navigator.sendBeacon al cerrar la página
+        from progreso_academia import registrar, validar
+
+        data = request.get_json(force=True, silent=True) or {}
+        cambios = validar(data.get("cambios"))
+        try:
+            registrar(session.get("user_email"), cambios)
+        except OSError as e:
+            print("Error guardando progreso de la academia:", e)
+            return jsonify({"error": "No se pudo guardar el progreso."}), 500
+        return jsonify({"ok": True, "guardados": len(cambios)})
+
+    @bp.route("/api/health_academia")
     def academia_health():
         return jsonify({"status": "ok", "version": "2.0"})
 
 
+def crear_blueprint_academia():
+    """Blueprint con las rutas de la academia (uno nuevo por cada app)."""
+    from flask import Blueprint
+
+    bp = Blueprint("academia", __name__)
+    _register_routes(bp)
+    return bp
+
+
 def init_academia_ingles(app):
     """
     Integra la Academia de Inglés en la app Flask de Foschi IA.
@@ -2432,6 +3024,15 @@ def init_academia_ingles(app):
       GET  /ingles              → app principal de la academia
       GET  /academia            → alias de /ingles
       POST /api/chat_ingles     → endpoint de IA para el chat del profesor
+                                  (con "conversacion": historial en el servidor)
+      POST /api/chat_ingles/stream → lo mismo, respuesta en streaming
+      GET  /api/academia/leccion/<id> → comienzo pregenerado de una lección
+                                  (lecciones_academia.py; 404 si no está)
+      GET  /api/academia/datos/<nombre> → currículo por nivel, personajes,
+                                  palabras y juegos (JSON versionado)
+      GET  /api/academia/progreso → progreso guardado del alumno
+      POST /api/academia/progreso → sincroniza los campos que cambiaron
+                                  (progreso_academia.py)
       GET  /api/health_academia → health-check (público)
 
     Control de acceso por capa:
@@ -2444,10 +3045,12 @@ def init_academia_ingles(app):
       - Requests HTML  → redirect a /?accion=login  o  /?accion=premium
       - Requests JSON  → 401/403 con {"error": "...", "msg": "..."}
 
+    Las rutas van en el blueprint "academia" (ver crear_blueprint_academia).
+
     Requiere: OPENAI_API_KEY en variables de entorno.
     Depende de: suscripciones.usuario_premium · superusuarios.es_superusuario
     """
-    _register_routes(app)
+    app.register_blueprint(crear_blueprint_academia())
 
 
 # ─────────────────────────────────────────────────────────────
@@ -0,0 +1,292 @@
+# asgi.py
+# -----------------
+# Entrada ASGI de la app:
+#
+#     uvicorn asgi:app --host 0.0.0.0 --port 8080
+#
+# En producción la sirve gunicorn con workers de uvicorn (ver
+# gunicorn_conf.py).
+#
+# Las vistas `async def` (las que esperan a OpenAI, ver asincronico.py)
+# corren en el event loop de uvicorn y ningún hilo queda esperándolas: un
+# request con la llamada al modelo en curso es sólo una corrutina, así que
+# los requests en vuelo no están topados por la cantidad de hilos. Se
+# sigue el mismo recorrido que Flask.wsgi_app (sesión, before_request,
+# manejadores de errores, after_request, teardown), pero esos pasos, que
+# son sync y cortos, van a hilos del pool dentro del contexto del request,
+# y la vista se espera con await.
+#
+# Las rutas sync pasan enteras por app.wsgi_app en un hilo del pool
+# (ASGI_HILOS, 256 por defecto, como gunicorn_conf.py), igual que con
+# gunicorn.
+#
+# El cuerpo del request se lee antes de llamar a Flask: se vuelca a un
+# SpooledTemporaryFile (a disco pasado TAMANIO_EN_MEMORIA, nunca entero en
+# RAM) y se corta con 413 apenas supera el límite de la ruta (el de
+# @limitar_subida, ver subidas.py, o MAX_CONTENT_LENGTH si no tiene).
+#
+# Requiere: pip install uvicorn uvicorn-worker (están en requirements.txt)
+
+import asyncio
+import contextvars
+import inspect
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from tempfile import SpooledTemporaryFile
+
+from flask import request, request_started
+from werkzeug.exceptions import HTTPException
+
+import FOSCHI_IA_PRO14
+from subidas import MB
+
+HILOS = int(os.getenv("ASGI_HILOS", "256"))
+TAMANIO_EN_MEMORIA = 1 * MB
+
+
+class CuerpoDemasiadoGrande(Exception):
+    """El cuerpo del request supera el límite de la ruta."""
+
+
+def _environ(scope, cuerpo, largo):
+    """Environ WSGI equivalente a un scope HTTP de ASGI."""
+    servidor = scope.get("server") or ("localhost", 80)
+    cliente = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "SERVER_NAME": servidor[0],
+        "SERVER_PORT": str(servidor[1] or 80),
+        "REMOTE_ADDR": cliente[0],
+        "REMOTE_PORT": str(cliente[1]),
+        "CONTENT_LENGTH": str(largo),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": cuerpo,
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for nombre, valor in scope.get("headers", []):
+        nombre = nombre.decode("latin-1").upper().replace("-", "_")
+        valor = valor.decode("latin-1")
+        if nombre == "CONTENT_TYPE":
+            environ["CONTENT_TYPE"] = valor
+        elif nombre != "CONTENT_LENGTH":
+            clave = f"HTTP_{nombre}"
+            environ[clave] = f"{environ[clave]},{valor}" if clave in environ else valor
+    return environ
+
+
+async def _leer_cuerpo(receive, destino, limite):
+    """
+    Vuelca el cuerpo del request en `destino` y devuelve cuántos bytes
+    leyó, o None si el cliente se fue. Lanza CuerpoDemasiadoGrande apenas
+    se pasa de `limite`.
+    """
+    total = 0
+    while True:
+        mensaje = await receive()
+        if mensaje["type"] == "http.disconnect":
+            return None
+        parte = mensaje.get("body", b"")
+        total += len(parte)
+        if limite and total > limite:
+            raise CuerpoDemasiadoGrande()
+        destino.write(parte)
+        if not mensaje.get("more_body"):
+            destino.seek(0)
+            return total
+
+
+def _manejar(manejador, e):
+    """
+    Llama a un manejador de errores de Flask en otro hilo: esos usan la
+    excepción "en curso" (un `raise` pelado, sys.exc_info() para el log), así
+    que se vuelve a lanzar acá.
+    """
+    try:
+        raise e
+    except Exception:
+        return manejador(e)
+
+
+def _inicio(status, headers):
+    """Mensaje http.response.start para un status y headers de WSGI."""
+    return {
+        "type": "http.response.start",
+        "status": int(status.split(" ", 1)[0]),
+        "headers": [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers],
+    }
+
+
+async def _enviar_413(send, limite):
+    await send({"type": "http.response.start", "status": 413,
+                "headers": [(b"content-type", b"text/plain; charset=utf-8"),
+                            (b"connection", b"close")]})
+    mensaje = f"La petición supera el máximo permitido ({limite // MB} MB)."
+    await send({"type": "http.response.body", "body": mensaje.encode("utf-8")})
+
+
+class PuenteAsgi:
+    """
+    App ASGI: las vistas async se esperan en el event loop; las demás pasan
+    por app.wsgi_app en un hilo del pool.
+    """
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self._lifespan(receive, send)
+        if scope["type"] != "http":
+            return
+
+        vista = self._vista(scope)
+        limite = getattr(vista, "limite_subida", None) or self.flask_app.config.get("MAX_CONTENT_LENGTH")
+        largo = dict(scope.get("headers", [])).get(b"content-length")
+        if limite and largo and largo.isdigit() and int(largo) > limite:
+            return await _enviar_413(send, limite)   # sin leer nada
+
+        with SpooledTemporaryFile(max_size=TAMANIO_EN_MEMORIA) as cuerpo:
+            try:
+                total = await _leer_cuerpo(receive, cuerpo, limite)
+            except CuerpoDemasiadoGrande:
+                return await _enviar_413(send, limite)
+            if total is None:
+                return
+            environ = _environ(scope, cuerpo, total)
+            if inspect.iscoroutinefunction(vista) and scope["method"] != "OPTIONS":
+                await self._responder_async(environ, send)
+            else:
+                await self._responder(environ, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            mensaje = await receive()
+            if mensaje["type"] == "lifespan.startup":
+                # to_thread usa el pool por defecto del loop: con el de
+                # asyncio (cpu + 4 hilos) sólo habría unos pocos requests a la vez
+                asyncio.get_running_loop().set_default_executor(
+                    ThreadPoolExecutor(max_workers=HILOS, thread_name_prefix="asgi"))
+                FOSCHI_IA_PRO14.iniciar_proceso()
+                await send({"type": "lifespan.startup.complete"})
+            elif mensaje["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def _vista(self, scope):
+        """Función de la vista del request, o None si la ruta no existe."""
+        adaptador = self.flask_app.url_map.bind("localhost", script_name=scope.get("root_path") or None)
+        try:
+            endpoint, _ = adaptador.match(scope["path"], method=scope["method"])
+        except HTTPException:
+            return None  # 404 / 405 / redirects: que los resuelva Flask
+        return self.flask_app.view_functions.get(endpoint)
+
+    async def _responder(self, environ, send):
+        loop = asyncio.get_running_loop()
+
+        def _enviar(mensaje):
+            asyncio.run_coroutine_threadsafe(send(mensaje), loop).result()
+
+        def _correr():
+            # Todo en un mismo hilo: un generador con stream_with_context
+            # guarda el contexto de Flask entre un trozo y el siguiente.
+            estado = {}
+
+            def start_response(status, headers, exc_info=None):
+                estado["status"] = status
+                estado["headers"] = headers
+
+            cuerpo = self.flask_app.wsgi_app(environ, start_response)
+            try:
+                _enviar(_inicio(estado["status"], estado["headers"]))
+                for trozo in cuerpo:
+                    if trozo:
+                        _enviar({"type": "http.response.body", "body": trozo, "more_body": True})
+                _enviar({"type": "http.response.body", "body": b""})
+            finally:
+                if hasattr(cuerpo, "close"):
+                    cuerpo.close()
+
+        await asyncio.to_thread(_correr)
+
+    # -----------------------------
+    # VISTAS ASYNC (sin hilo esperando)
+    # -----------------------------
+    async def _responder_async(self, environ, send):
+        """
+        Lo mismo que Flask.wsgi_app + full_dispatch_request, pero la vista se
+        espera en este loop. Todo corre en un Context propio del request: los
+        pasos sync con contexto.run en un hilo, la vista como tarea con ese
+        contexto (y los asyncio.to_thread de adentro lo copian).
+        """
+        app = self.flask_app
+        loop = asyncio.get_running_loop()
+        contexto = contextvars.copy_context()
+
+        def _en_hilo(fn, *args):
+            return loop.run_in_executor(None, partial(contexto.run, fn, *args))
+
+        ctx = app.request_context(environ)
+        error = None
+        try:
+            try:
+                await _en_hilo(ctx.push)
+                try:
+                    rv = await _en_hilo(self._antes_de_la_vista)
+                    if rv is None:
+                        vista = app.view_functions[ctx.request.url_rule.endpoint]
+                        rv = await asyncio.create_task(vista(**ctx.request.view_args), context=contexto)
+                except Exception as e:
+                    rv = await _en_hilo(_manejar, app.handle_user_exception, e)
+                respuesta = await _en_hilo(app.finalize_request, rv)
+            except Exception as e:
+                error = e
+                respuesta = await _en_hilo(_manejar, app.handle_exception, e)
+            cuerpo, status, headers = await _en_hilo(respuesta.get_wsgi_response, environ)
+        finally:
+            if error is not None and app.should_ignore_error(error):
+                error = None
+            await _en_hilo(ctx.pop, error)
+
+        await send(_inicio(status, headers))
+        if isinstance(cuerpo, (list, tuple)):
+            # respuesta armada en memoria (jsonify, texto): sin hilos
+            for trozo in cuerpo:
+                if trozo:
+                    await send({"type": "http.response.body", "body": trozo, "more_body": True})
+        else:
+            # stream o archivo: cada trozo se lee en un hilo
+            iterador = iter(cuerpo)
+            try:
+                while (trozo := await _en_hilo(next, iterador, None)) is not None:
+                    if trozo:
+                        await send({"type": "http.response.body", "body": trozo, "more_body": True})
+            finally:
+                if hasattr(cuerpo, "close"):
+                    await _en_hilo(cuerpo.close)
+        await send({"type": "http.response.body", "body": b""})
+
+    def _antes_de_la_vista(self):
+        """request_started + before_request; None si la vista tiene que correr."""
+        app = self.flask_app
+        request_started.send(app, _async_wrapper=app.ensure_sync)
+        rv = app.preprocess_request()
+        if rv is None:
+            if request.routing_exception is not None:
+                app.raise_routing_exception(request)
+            if request.is_json:
+                request.get_data()   # leído acá: get_json() en la vista no toca el disco
+        return rv
+
+
+app = PuenteAsgi(FOSCHI_IA_PRO14.app)
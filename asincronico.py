@@ -0,0 +1,130 @@
+# asincronico.py
+# -----------------
+# Camino asíncrono para las rutas que pasan casi todo el tiempo esperando
+# a OpenAI (/preguntar, /api/chat_ingles, /resumir_doc, imágenes).
+#
+# Esas vistas son `async def` y usan AsyncOpenAI / httpx.AsyncClient.
+# Cuánto se gana depende del servidor:
+#
+#   · uvicorn (asgi.py): la vista corre en el event loop del servidor y
+#     ningún hilo la espera. Los requests en vuelo no están topados por la
+#     cantidad de hilos: en prueba_carga.txt (500 a la vez, OpenAI de 10 s)
+#     terminan en 27 s contra 48 s con gunicorn gthread.
+#   · WSGI (gunicorn gthread, servidor de desarrollo): Flask corre la
+#     corrutina en un event loop de fondo propio del proceso (ver
+#     async_a_sync) y el hilo del request la espera bloqueado. Eso es un
+#     pool de hilos, nada más: cada llamada al modelo en curso ocupa un
+#     hilo, y lo único que se comparte es el cliente y su pool de
+#     conexiones.
+#
+# En los dos casos el loop es uno para todos los requests del proceso:
+# adentro de una vista async nada puede bloquear (leer o escribir archivos,
+# parsear un multipart, consultar la suscripción...). Eso va con
+# asyncio.to_thread.
+#
+# Los clientes async quedan atados al event loop donde se crean: hay uno
+# por loop (en la práctica, uno por proceso).
+#
+# Para medir: python prueba_carga.py --servidor todos
+
+import asyncio
+import contextvars
+import os
+import threading
+import weakref
+
+_bucle_holder = [None, None]   # [loop, pid]
+_bucle_lock = threading.Lock()
+
+# loop → {"openai": AsyncOpenAI, "http": httpx.AsyncClient}
+_clientes_por_bucle = weakref.WeakKeyDictionary()
+
+
+# -----------------------------
+# EVENT LOOP DE FONDO (modo WSGI)
+# -----------------------------
+def _bucle_de_fondo():
+    pid = os.getpid()
+    if _bucle_holder[1] != pid:
+        with _bucle_lock:
+            if _bucle_holder[1] != pid:
+                # después de un fork el hilo del loop del padre no existe
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="bucle_async", daemon=True).start()
+                _bucle_holder[0] = loop
+                _bucle_holder[1] = pid
+    return _bucle_holder[0]
+
+
+def ejecutar(corrutina):
+    """
+    Corre `corrutina` en el event loop de fondo y espera el resultado desde
+    el hilo actual. La tarea hereda el contexto del hilo (request y session
+    de Flask siguen disponibles adentro de la vista).
+    """
+    loop = _bucle_de_fondo()
+    contexto = contextvars.copy_context()
+    listo = threading.Event()
+    resultado = {}
+
+    def _terminar(tarea):
+        try:
+            resultado["valor"] = tarea.result()
+        except BaseException as e:
+            resultado["error"] = e
+        listo.set()
+
+    def _crear():
+        # create_task copia el contexto vigente: dentro de contexto.run es el del request
+        tarea = contexto.run(loop.create_task, corrutina)
+        tarea.add_done_callback(_terminar)
+
+    loop.call_soon_threadsafe(_crear)
+    listo.wait()
+    if "error" in resultado:
+        raise resultado["error"]
+    return resultado["valor"]
+
+
+def async_a_sync(func):
+    """Reemplazo de Flask.async_to_sync: usa el loop de fondo en vez de asgiref."""
+    def _wrapper(*args, **kwargs):
+        return ejecutar(func(*args, **kwargs))
+    return _wrapper
+
+
+# -----------------------------
+# CLIENTES (uno por event loop)
+# -----------------------------
+def _del_bucle(nombre, fabrica):
+    loop = asyncio.get_running_loop()
+    clientes = _clientes_por_bucle.setdefault(loop, {})
+    if nombre not in clientes:
+        clientes[nombre] = fabrica()
+    return clientes[nombre]
+
+
+def _crear_openai():
+    from openai import AsyncOpenAI
+    return AsyncOpenAI()
+
+
+def _crear_http():
+    import httpx
+    return httpx.AsyncClient(timeout=10, follow_redirects=True)
+
+
+def cliente_openai():
+    """AsyncOpenAI del event loop actual (llamar desde una corrutina)."""
+    return _del_bucle("openai", _crear_openai)
+
+
+def cliente_http():
+    """httpx.AsyncClient del event loop actual (llamar desde una corrutina)."""
+    return _del_bucle("http", _crear_http)
+
+
+async def obtener_json(url, params=None, timeout=5):
+    """GET que devuelve (status, json). Lanza la excepción si falla la red."""
+    r = await cliente_http().get(url, params=params, timeout=timeout)
+    return r.status_code, r.json()
@@ -0,0 +1,73 @@
+# carga_diferida.py
+# -----------------
+# Carga diferida de dependencias pesadas.
+#
+# Importar openai (~0.7 s), python-pptx, python-docx, PyPDF2, Pillow, gTTS
+# y mercadopago al arrancar hacía que el arranque en frío (Cloud Run) tarde
+# más de un segundo y medio antes de poder contestar el primer request,
+# aunque la mayoría de esos módulos sólo se usan en algunas rutas.
+#
+# Diferido(fabrica) es un objeto que se hace pasar por lo que devuelve
+# fabrica(), pero la llama recién la primera vez que se usa un atributo
+# (una sola vez, aunque lleguen varios requests a la vez):
+#
+#     client = Diferido(_crear_cliente_openai)
+#     client.chat.completions.create(...)     # acá se importa openai
+#
+#     documentos = modulo_diferido("documentos")
+#     documentos.cargar_texto(doc_id)           # acá se importa documentos
+#
+# Para medir el arranque: python perfil_arranque.py
+
+import importlib
+import threading
+
+
+class Diferido:
+    """Proxy que crea el objeto real en el primer acceso a un atributo."""
+
+    __slots__ = ("_fabrica", "_objeto", "_lock")
+
+    def __init__(self, fabrica):
+        object.__setattr__(self, "_fabrica", fabrica)
+        object.__setattr__(self, "_objeto", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _cargar(self):
+        objeto = object.__getattribute__(self, "_objeto")
+        if objeto is None:
+            with object.__getattribute__(self, "_lock"):
+                objeto = object.__getattribute__(self, "_objeto")
+                if objeto is None:
+                    objeto = object.__getattribute__(self, "_fabrica")()
+                    object.__setattr__(self, "_objeto", objeto)
+        return objeto
+
+    def cargado(self):
+        """True si el objeto real ya se creó."""
+        return object.__getattribute__(self, "_objeto") is not None
+
+    def reiniciar(self):
+        """
+        Descarta el objeto real: se vuelve a crear en el próximo uso. Se
+        llama en cada worker después del fork, para no compartir con el
+        proceso padre conexiones (sockets del pool HTTP) ni locks.
+        """
+        object.__setattr__(self, "_lock", threading.Lock())
+        object.__setattr__(self, "_objeto", None)
+
+    def __getattr__(self, nombre):
+        return getattr(self._cargar(), nombre)
+
+    def __setattr__(self, nombre, valor):
+        setattr(self._cargar(), nombre, valor)
+
+    def __repr__(self):
+        if self.cargado():
+            return f"<Diferido {object.__getattribute__(self, '_objeto')!r}>"
+        return "<Diferido (sin cargar)>"
+
+
+def modulo_diferido(nombre):
+    """Módulo que se importa la primera vez que se usa uno de sus atributos."""
+    return Diferido(lambda: importlib.import_module(nombre))
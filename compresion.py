@@ -0,0 +1,114 @@
+# compresion.py
+# -----------------
+# Compresión de respuestas y GET condicional para toda la app.
+#
+# Un after_request que, para respuestas armadas en memoria:
+#   1. agrega un ETag (débil) calculado sobre el cuerpo y contesta 304 si
+#      el navegador ya lo tiene (If-None-Match). Ej: /historial devuelve
+#      hasta 200 turnos y casi siempre es el mismo que la vez anterior.
+#   2. comprime con brotli o gzip según Accept-Encoding, sólo tipos de
+#      texto (HTML, JSON, JS, CSS...) y a partir de un tamaño mínimo.
+#
+# No toca: streams (TTS, presentaciones), archivos de send_file, respuestas
+# ya comprimidas (los assets de estaticos.py vienen precomprimidos) ni
+# respuestas con Cache-Control: no-store (en esas el ETag no sirve).
+#
+# Opcional: pip install brotli (sin él se usa sólo gzip).
+
+import gzip
+import hashlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+TAMANIO_MINIMO = 1024
+NIVEL_GZIP = 6
+CALIDAD_BROTLI = 5   # las respuestas dinámicas se comprimen en cada request
+
+TIPOS_COMPRIMIBLES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def _comprimible(resp):
+    tipo = resp.mimetype or ""
+    return any(tipo.startswith(t) for t in TIPOS_COMPRIMIBLES)
+
+
+def _agregar_vary(resp, valor):
+    actual = [v.strip() for v in resp.headers.get("Vary", "").split(",") if v.strip()]
+    if valor not in actual:
+        actual.append(valor)
+        resp.headers["Vary"] = ", ".join(actual)
+
+
+def elegir_codificacion(aceptadas):
+    """'br', 'gzip' o None según el Accept-Encoding del request."""
+    if brotli is not None and aceptadas["br"]:
+        return "br"
+    if aceptadas["gzip"]:
+        return "gzip"
+    return None
+
+
+def comprimir(datos, codificacion):
+    if codificacion == "br":
+        return brotli.compress(datos, quality=CALIDAD_BROTLI)
+    return gzip.compress(datos, compresslevel=NIVEL_GZIP)
+
+
+def init_compresion(app):
+    """Registra el after_request de ETag + compresión en `app`."""
+    from flask import request
+
+    @app.after_request
+    def _comprimir_respuesta(resp):
+        if resp.direct_passthrough or resp.is_streamed:
+            return resp
+        if resp.status_code != 200 or "Content-Encoding" in resp.headers:
+            return resp
+
+        # ---- ETag / 304 ----
+        if (
+            request.method in ("GET", "HEAD")
+            and "ETag" not in resp.headers
+            and not resp.cache_control.no_store
+        ):
+            datos = resp.get_data()
+            resp.set_etag(hashlib.sha256(datos).hexdigest()[:32], weak=True)
+            resp.make_conditional(request)
+            if resp.status_code == 304:
+                return resp
+
+        # ---- Compresión ----
+        if not _comprimible(resp):
+            return resp
+
+        _agregar_vary(resp, "Accept-Encoding")
+
+        datos = resp.get_data()
+        if len(datos) < TAMANIO_MINIMO:
+            return resp
+
+        codificacion = elegir_codificacion(request.accept_encodings)
+        if codificacion is None:
+            return resp
+
+        comprimido = comprimir(datos, codificacion)
+        if len(comprimido) >= len(datos):
+            return resp
+
+        resp.set_data(comprimido)
+        resp.headers["Content-Encoding"] = codificacion
+
+        # un ETag fuerte no puede ser igual para la versión comprimida
+        etag, debil = resp.get_etag()
+        if etag and not debil:
+            resp.set_etag(etag, weak=True)
+        return resp
@@ -0,0 +1,184 @@
+# contexto_chat.py
+# -----------------
+# Contexto de la conversación para el chat general, con presupuesto de
+# tokens.
+#
+# Antes el prompt llevaba el texto crudo de los últimos 3 intercambios
+# (cada respuesta de hasta 700 tokens): el tamaño variaba mucho y a veces
+# se disparaba. Ahora el contexto es:
+#
+#   · un resumen acumulado por usuario (memory.json → "resumen"), que se
+#     rehace cada RESUMEN_CADA turnos con un modelo barato (intención
+#     "resumen_chat" de modelos.py), en segundo plano (la respuesta no lo
+#     espera);
+#   · los turnos que todavía no entraron al resumen, del más nuevo al más
+#     viejo, mientras entren en el presupuesto.
+#
+# contar_tokens() usa tiktoken si está instalado; si no, estima por
+# caracteres (de más, para no pasarse del presupuesto).
+#
+#   pip install tiktoken   (opcional)
+
+import asyncio
+import os
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+from nucleo import MEMORY_FILE, MEMORY_LOCK, load_json, guardar_memoria_diferido
+from prompts import mensajes
+
+RESUMEN_CADA = int(os.getenv("RESUMEN_CADA", "4"))               # turnos
+PRESUPUESTO_PROMPT = int(os.getenv("PRESUPUESTO_PROMPT", "2500"))  # tokens
+RESUMEN_MAX_TOKENS = 300
+TURNOS_RECIENTES_MIN = 2      # siempre que entren, aunque ya estén resumidos
+TOKENS_POR_TURNO_MAX = 350    # una respuesta larga no se come el presupuesto
+
+CARACTERES_POR_TOKEN = 3.5    # estimación sin tiktoken (español, de más)
+
+_codificador_holder = [None]
+_en_curso = set()             # usuarios con un resumen en preparación
+_tareas = set()               # referencias a las tareas en segundo plano
+
+
+# -----------------------------
+# TOKENS
+# -----------------------------
+def _codificador():
+    if _codificador_holder[0] is None:
+        _codificador_holder[0] = tiktoken.get_encoding("cl100k_base")
+    return _codificador_holder[0]
+
+
+def contar_tokens(texto):
+    if not texto:
+        return 0
+    if tiktoken is not None:
+        return len(_codificador().encode(texto))
+    return int(len(texto) / CARACTERES_POR_TOKEN) + 1
+
+
+def recortar_a_tokens(texto, maximo):
+    """Recorta `texto` para que no pase de `maximo` tokens."""
+    if contar_tokens(texto) <= maximo:
+        return texto
+    if tiktoken is not None:
+        return _codificador().decode(_codificador().encode(texto)[:maximo]) + "…"
+    return texto[:int(maximo * CARACTERES_POR_TOKEN)] + "…"
+
+
+# -----------------------------
+# CONTEXTO
+# -----------------------------
+def _estado(usuario):
+    """(resumen, turnos sin resumir, mensajes, turnos totales) del usuario."""
+    with MEMORY_LOCK:
+        datos = load_json(MEMORY_FILE).get(usuario, {})
+        historial = list(datos.get("mensajes", []))
+        turnos = datos.get("turnos", len(historial))
+        resumen = datos.get("resumen") or {}
+    sin_resumir = min(len(historial), max(0, turnos - resumen.get("turnos", 0)))
+    return resumen.get("texto", ""), sin_resumir, historial, turnos
+
+
+def _turno_a_texto(m):
+    return recortar_a_tokens(f"Usuario: {m['usuario']}\nFoschi: {m['foschi']}", TOKENS_POR_TURNO_MAX)
+
+
+def armar_contexto(usuario, *fijos, max_turnos=None, presupuesto=PRESUPUESTO_PROMPT):
+    """
+    Texto de contexto para el prompt (resumen + hasta `max_turnos` turnos
+    recientes) que, sumado a los textos `fijos` (system, mensaje del
+    usuario...), no pasa de `presupuesto` tokens. Devuelve "" si no hay
+    nada o no entra.
+    """
+    disponible = presupuesto - sum(contar_tokens(t) for t in fijos)
+    if disponible <= 0:
+        return ""
+
+    resumen, sin_resumir, historial, _ = _estado(usuario)
+    cantidad = max(sin_resumir, TURNOS_RECIENTES_MIN)
+    if max_turnos:
+        cantidad = min(cantidad, max_turnos)
+    partes = []
+    if resumen:
+        resumen = recortar_a_tokens(resumen, min(RESUMEN_MAX_TOKENS, disponible))
+        partes.append("Resumen de la conversación: " + resumen)
+        disponible -= contar_tokens(partes[0])
+
+    recientes = []
+    for m in reversed(historial[-cantidad:]):
+        texto = _turno_a_texto(m)
+        costo = contar_tokens(texto)
+        if costo > disponible:
+            break
+        recientes.append(texto)
+        disponible -= costo
+    if recientes:
+        partes.append("Últimos mensajes:\n" + "\n".join(reversed(recientes)))
+
+    return "\n\n".join(partes)
+
+
+# -----------------------------
+# RESUMEN EN SEGUNDO PLANO
+# -----------------------------
+async def _rehacer_resumen(usuario):
+    from modelos import completar
+
+    try:
+        resumen, sin_resumir, historial, turnos = await asyncio.to_thread(_estado, usuario)
+        if not sin_resumir:
+            return
+        nuevos = "\n".join(_turno_a_texto(m) for m in historial[-sin_resumir:])
+
+        resp = await completar(
+            "resumen_chat",
+            prompt="resumen_chat",
+            messages=mensajes(
+                "resumen_chat",
+                usuario=f"RESUMEN ANTERIOR:\n{resumen or '(ninguno)'}\n\nMENSAJES NUEVOS:\n{nuevos}",
+            ),
+            temperature=0.2,
+            max_tokens=RESUMEN_MAX_TOKENS
+        )
+        texto = (resp.choices[0].message.content or "").strip()
+        if not texto:
+            return
+
+        await asyncio.to_thread(_guardar_resumen, usuario, texto, turnos)
+    except Exception as e:
+        print("Error actualizando el resumen de la conversación:", e)
+    finally:
+        _en_curso.discard(usuario)
+
+
+def _guardar_resumen(usuario, texto, turnos):
+    with MEMORY_LOCK:
+        memoria = load_json(MEMORY_FILE)
+        if usuario in memoria:
+            memoria[usuario]["resumen"] = {"texto": texto, "turnos": turnos}
+    guardar_memoria_diferido()
+
+
+async def programar_resumen(usuario):
+    """
+    Si ya se juntaron RESUMEN_CADA turnos sin resumir, rehace el resumen en
+    segundo plano. La memoria se lee en un hilo: el event loop lo
+    comparten todos los requests (ver asincronico.py).
+    """
+    if usuario in _en_curso:
+        return
+    _en_curso.add(usuario)   # antes del await: otro request no lo duplica
+    try:
+        _, sin_resumir, _, _ = await asyncio.to_thread(_estado, usuario)
+    except Exception:
+        sin_resumir = 0
+    if sin_resumir < RESUMEN_CADA:
+        _en_curso.discard(usuario)
+        return
+    tarea = asyncio.get_running_loop().create_task(_rehacer_resumen(usuario))
+    _tareas.add(tarea)
+    tarea.add_done_callback(_tareas.discard)
@@ -0,0 +1,174 @@
+# conversaciones_academia.py
+# -----------------
+# Conversaciones de la academia guardadas en el servidor, por usuario y
+# lección.
+#
+# Antes el navegador mandaba en cada turno hasta 20 mensajes anteriores y
+# el prompt completo: el pedido y los tokens crecían con la charla. Ahora
+# manda sólo el mensaje nuevo y el nombre de la conversación ("ninos",
+# "adulto:a1_m2_l3"...); acá se guarda el resto:
+#
+#   · los últimos mensajes, hasta MENSAJES_MAX;
+#   · cuando se pasan, los más viejos se condensan en un resumen de la
+#     clase con el modelo barato (en segundo plano) y se sacan, dejando
+#     MENSAJES_MANTENER.
+#
+# Un archivo chico por usuario en data/academia/, con sus últimas
+# CONVERSACIONES_MAX conversaciones. Se escribe en el momento (no en
+# escritura_diferida): con varios workers el turno siguiente puede caer en
+# otro proceso y tiene que encontrar el anterior.
+#
+# Uso (también para respuestas en streaming):
+#
+#     resumen, previos = preparar(usuario, conversacion, reiniciar)
+#     ... llamada al modelo con previos + mensaje nuevo ...
+#     if registrar(usuario, conversacion, mensaje, respuesta):
+#         programar_resumen(usuario, conversacion)
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+from nucleo import DATA_DIR
+
+CARPETA = os.path.join(DATA_DIR, "academia")
+MENSAJES_MAX = 12            # user + assistant guardados tal cual
+MENSAJES_MANTENER = 6        # los que quedan después de resumir
+MENSAJES_TOPE = 40           # si el resumen falla, se descartan los viejos
+CONVERSACIONES_MAX = 20      # por usuario (se borran las más viejas)
+MENSAJE_MAX_CARACTERES = 4000
+RESUMEN_MAX_TOKENS = 250
+
+NOMBRE_VALIDO = re.compile(r"^[\w:.-]{1,80}$")
+
+_locks = {}                  # usuario → Lock (leer-modificar-escribir)
+_locks_lock = threading.Lock()
+_en_curso = set()            # (usuario, conversacion) resumiéndose
+_tareas = set()
+
+
+def nombre_valido(conversacion):
+    return isinstance(conversacion, str) and bool(NOMBRE_VALIDO.match(conversacion))
+
+
+def _ruta(usuario):
+    clave = hashlib.sha1(str(usuario).encode("utf-8")).hexdigest()[:20]
+    return os.path.join(CARPETA, f"{clave}.json")
+
+
+def _lock(usuario):
+    with _locks_lock:
+        return _locks.setdefault(usuario, threading.Lock())
+
+
+def _cargar(usuario):
+    try:
+        with open(_ruta(usuario), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _guardar(usuario, datos):
+    os.makedirs(CARPETA, exist_ok=True)
+    path = _ruta(usuario)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(datos, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def preparar(usuario, conversacion, reiniciar=False, inicio=None):
+    """
+    (resumen, mensajes previos) de la conversación. Si `reiniciar`, la
+    empieza de cero: vacía, o con los mensajes `inicio` (el comienzo
+    pregenerado de una lección, ver lecciones_academia.py).
+    """
+    with _lock(usuario):
+        datos = _cargar(usuario)
+        if reiniciar:
+            if inicio:
+                datos[conversacion] = {"resumen": "", "mensajes": list(inicio),
+                                       "actualizada": int(time.time())}
+                _guardar(usuario, datos)
+                return "", list(inicio)
+            if datos.pop(conversacion, None) is not None:
+                _guardar(usuario, datos)
+            return "", []
+        conv = datos.get(conversacion) or {}
+        return conv.get("resumen", ""), list(conv.get("mensajes", []))
+
+
+def registrar(usuario, conversacion, mensaje, respuesta):
+    """Agrega el turno. Devuelve True si conviene resumir la conversación."""
+    with _lock(usuario):
+        datos = _cargar(usuario)
+        conv = datos.setdefault(conversacion, {"resumen": "", "mensajes": []})
+        conv["mensajes"].append({"role": "user", "content": mensaje[:MENSAJE_MAX_CARACTERES]})
+        conv["mensajes"].append({"role": "assistant", "content": respuesta})
+        conv["mensajes"] = conv["mensajes"][-MENSAJES_TOPE:]
+        conv["actualizada"] = int(time.time())
+        if len(datos) > CONVERSACIONES_MAX:
+            viejas = sorted(datos, key=lambda k: datos[k].get("actualizada", 0))
+            for k in viejas[:len(datos) - CONVERSACIONES_MAX]:
+                del datos[k]
+        _guardar(usuario, datos)
+        return len(conv["mensajes"]) > MENSAJES_MAX
+
+
+async def _resumir(usuario, conversacion):
+    from modelos import completar
+    from prompts import mensajes
+
+    try:
+        resumen, previos = await asyncio.to_thread(preparar, usuario, conversacion)
+        viejos = previos[:len(previos) - MENSAJES_MANTENER]
+        if not viejos:
+            return
+        texto = "\n".join(
+            f"{'Alumno' if m['role'] == 'user' else 'Profesor'}: {m['content']}" for m in viejos
+        )
+        resp = await completar(
+            "academia_resumen",
+            prompt="academia_resumen",
+            messages=mensajes(
+                "academia_resumen",
+                usuario=f"RESUMEN ANTERIOR:\n{resumen or '(ninguno)'}\n\nMENSAJES NUEVOS:\n{texto}",
+            ),
+            temperature=0.2,
+            max_tokens=RESUMEN_MAX_TOKENS
+        )
+        nuevo = (resp.choices[0].message.content or "").strip()
+        if nuevo:
+            await asyncio.to_thread(_aplicar_resumen, usuario, conversacion, viejos, nuevo)
+    except Exception as e:
+        print("Error resumiendo conversación de la academia:", e)
+    finally:
+        _en_curso.discard((usuario, conversacion))
+
+
+def _aplicar_resumen(usuario, conversacion, viejos, resumen):
+    with _lock(usuario):
+        datos = _cargar(usuario)
+        conv = datos.get(conversacion)
+        # si mientras tanto se reinició o recortó, el resumen ya no aplica
+        if not conv or conv["mensajes"][:len(viejos)] != viejos:
+            return
+        conv["resumen"] = resumen
+        conv["mensajes"] = conv["mensajes"][len(viejos):]
+        _guardar(usuario, datos)
+
+
+def programar_resumen(usuario, conversacion):
+    """Resume en segundo plano (llamar desde una corrutina)."""
+    clave = (usuario, conversacion)
+    if clave in _en_curso:
+        return
+    _en_curso.add(clave)
+    tarea = asyncio.get_running_loop().create_task(_resumir(usuario, conversacion))
+    _tareas.add(tarea)
+    tarea.add_done_callback(_tareas.discard)
@@ -0,0 +1,423 @@
+# documentos.py
+# -----------------
+# Documentos subidos (PDF / DOCX): extracción de texto y caché por contenido.
+#
+# Cada documento se identifica por el SHA-256 de sus bytes (ese hash es el
+# doc_id que ve el front-end). Bajo ese hash quedan guardados el texto
+# extraído, el índice de fragmentos (chunks) y los resúmenes ya generados,
+# así que subir de nuevo el mismo archivo no vuelve a extraer nada.
+#
+# El caché se limita por tamaño (DOCS_CACHE_MB) con desalojo LRU por
+# documento: cada uso actualiza la fecha de modificación de su .txt.
+
+import json
+import multiprocessing
+import os
+import re
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturoTimeout
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from threading import Lock
+
+import PyPDF2
+import docx as docx_reader  # para leer .docx
+
+import ocr
+
+DOCS_DIR = os.path.join("data", "docs_cache")
+DOCS_CACHE_MAX_BYTES = int(os.getenv("DOCS_CACHE_MB", "500")) * 1024 * 1024
+TEMP_DIR_LEGACY = os.path.join("data", "temp_docs")  # doc_id viejos (uuid)
+
+TAMANIO_CHUNK = 2000
+MAX_CONTEXTO = 12000
+MIN_RECORTE = 200                  # menos que esto de un chunk no aporta
+
+# Extracción de PDFs grandes en paralelo (por tandas de páginas)
+PAGINAS_POR_TANDA = 16
+MIN_PAGINAS_PARALELO = 24          # PDFs más chicos se leen en serie
+PROCESOS_PDF = min(4, os.cpu_count() or 1)
+PRESUPUESTO_PDF_SEGUNDOS = 60      # tope de tiempo por documento
+
+_DOC_ID_RE = re.compile(r"^[0-9a-fA-F-]{32,64}$")
+
+
+# -----------------------------
+# EXTRACCIÓN DE TEXTO
+# -----------------------------
+_POOL_PDF = None
+_POOL_PDF_LOCK = Lock()
+_LOCK_DESALOJO = Lock()
+_escrituras = [0]
+
+
+def _pool_pdf():
+    """
+    Pool de procesos compartido (se crea la primera vez que hace falta).
+    Nunca con "fork": se crea desde un hilo de un worker con muchos hilos
+    (ver iniciar_servidor_procesos en nucleo.py).
+    """
+    global _POOL_PDF
+    with _POOL_PDF_LOCK:
+        if _POOL_PDF is None:
+            metodos = multiprocessing.get_all_start_methods()
+            contexto = multiprocessing.get_context("forkserver" if "forkserver" in metodos else "spawn")
+            _POOL_PDF = ProcessPoolExecutor(max_workers=PROCESOS_PDF, mp_context=contexto)
+        return _POOL_PDF
+
+
+def _descartar_pool_pdf():
+    global _POOL_PDF
+    with _POOL_PDF_LOCK:
+        if _POOL_PDF is not None:
+            _POOL_PDF.shutdown(wait=False, cancel_futures=True)
+            _POOL_PDF = None
+
+
+def _extraer_rango_pdf(path, inicio, fin):
+    """Corre en un proceso del pool: extrae las páginas [inicio, fin)."""
+    paginas = []
+    reader = PyPDF2.PdfReader(path)
+    for i in range(inicio, fin):
+        try:
+            paginas.append((i, reader.pages[i].extract_text() or ""))
+        except Exception:
+            paginas.append((i, ""))
+    return paginas
+
+
+def iterar_paginas_pdf(path, presupuesto=PRESUPUESTO_PDF_SEGUNDOS):
+    """
+    Generador: devuelve (número_de_página, texto) en orden, a medida que se
+    van extrayendo. Los PDFs grandes se reparten por tandas de páginas en un
+    pool de procesos; si se agota el presupuesto de tiempo se corta y queda
+    lo extraído hasta ese momento.
+    """
+    limite = time.monotonic() + presupuesto
+
+    try:
+        reader = PyPDF2.PdfReader(path)
+        total = len(reader.pages)
+    except Exception as e:
+        print("Error leyendo PDF:", e)
+        return
+
+    if total < MIN_PAGINAS_PARALELO or PROCESOS_PDF < 2:
+        for i, page in enumerate(reader.pages):
+            if time.monotonic() > limite:
+                print(f"PDF: presupuesto de tiempo agotado en la página {i} de {total}")
+                return
+            try:
+                yield i, page.extract_text() or ""
+            except Exception:
+                continue
+        return
+
+    pool = _pool_pdf()
+    futuros = []
+    try:
+        for inicio in range(0, total, PAGINAS_POR_TANDA):
+            futuros.append(pool.submit(_extraer_rango_pdf, path, inicio, min(inicio + PAGINAS_POR_TANDA, total)))
+
+        for futuro in futuros:
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                raise FuturoTimeout()
+            for i, texto in futuro.result(timeout=restante):
+                yield i, texto
+
+    except FuturoTimeout:
+        print(f"PDF: presupuesto de tiempo agotado ({presupuesto}s) en {path}")
+    except BrokenProcessPool:
+        print("PDF: el pool de procesos se rompió, se recrea en la próxima extracción")
+        _descartar_pool_pdf()
+    finally:
+        for futuro in futuros:
+            futuro.cancel()
+
+
+def extract_text_from_pdf(path):
+    return "".join(texto + "\n" for _, texto in iterar_paginas_pdf(path) if texto)
+
+
+def extract_text_from_docx(path):
+    text = ""
+    try:
+        doc = docx_reader.Document(path)
+        for p in doc.paragraphs:
+            if p.text:
+                text += p.text + "\n"
+    except Exception as e:
+        print("Error leyendo DOCX:", e)
+    return text
+
+
+# -----------------------------
+# UTILIDADES DE ARCHIVO
+# -----------------------------
+def doc_id_valido(doc_id):
+    return bool(doc_id) and bool(_DOC_ID_RE.match(str(doc_id)))
+
+
+def _ruta(doc_id, sufijo):
+    return os.path.join(DOCS_DIR, f"{doc_id.lower()}{sufijo}")
+
+
+def _escribir(ruta, contenido):
+    """Escribe a un temporal y lo renombra, para que dos subidas simultáneas
+    del mismo archivo nunca dejen un caché a medio escribir. El temporal es
+    único por escritura (no sólo por proceso: con gthread dos hilos del
+    mismo worker pueden guardar el mismo documento a la vez)."""
+    os.makedirs(DOCS_DIR, exist_ok=True)
+    tmp = f"{ruta}.{uuid.uuid4().hex}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(contenido)
+    os.replace(tmp, ruta)
+
+
+def _usado(doc_id):
+    """Marca de "usado recién" para el LRU."""
+    try:
+        os.utime(_ruta(doc_id, ".txt"))
+    except OSError:
+        pass
+
+
+def _escrito():
+    _escrituras[0] += 1
+    if _escrituras[0] % 20 == 0:
+        desalojar_cache()
+
+
+def desalojar_cache(max_bytes=DOCS_CACHE_MAX_BYTES):
+    """
+    Borra los documentos (texto, chunks, metadatos y resúmenes) usados
+    hace más tiempo hasta quedar en el 90% del máximo.
+    """
+    if not _LOCK_DESALOJO.acquire(blocking=False):
+        return  # ya hay otro desalojo corriendo
+    try:
+        docs = {}   # doc_id → [último uso, bytes, rutas]
+        total = 0
+        for entrada in os.scandir(DOCS_DIR):
+            if not entrada.is_file() or entrada.name.endswith(".tmp"):
+                continue
+            st = entrada.stat()
+            doc = docs.setdefault(entrada.name.split(".", 1)[0], [0, 0, []])
+            doc[0] = max(doc[0], st.st_mtime)
+            doc[1] += st.st_size
+            doc[2].append(entrada.path)
+            total += st.st_size
+
+        if total <= max_bytes:
+            return
+
+        for _, tamanio, rutas in sorted(docs.values()):
+            for ruta in rutas:
+                try:
+                    os.remove(ruta)
+                except OSError:
+                    pass
+            total -= tamanio
+            if total <= max_bytes * 0.9:
+                break
+    except OSError as e:
+        print("Error desalojando caché de documentos:", e)
+    finally:
+        _LOCK_DESALOJO.release()
+
+
+def _leer_json(ruta):
+    try:
+        with open(ruta, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+# -----------------------------
+# CACHÉ POR CONTENIDO
+# -----------------------------
+def obtener_documento(sha256):
+    """Devuelve los metadatos del documento ya procesado, o None."""
+    if not doc_id_valido(sha256):
+        return None
+    if not os.path.exists(_ruta(sha256, ".txt")):
+        return None
+    meta = _leer_json(_ruta(sha256, ".meta.json"))
+    if meta:
+        _usado(sha256)
+    return meta
+
+
+class Fragmentador:
+    """Arma el índice de chunks de forma incremental: se le va pasando texto
+    (ej: página por página mientras se extrae) y corta fragmentos de
+    ~tamanio caracteres respetando párrafos."""
+
+    def __init__(self, tamanio=TAMANIO_CHUNK):
+        self.tamanio = tamanio
+        self.chunks = []
+        self._actual = []
+        self._largo = 0
+
+    def agregar(self, texto):
+        for parrafo in texto.split("\n"):
+            if self._largo + len(parrafo) > self.tamanio and self._actual:
+                self.chunks.append("\n".join(self._actual))
+                self._actual, self._largo = [], 0
+            self._actual.append(parrafo)
+            self._largo += len(parrafo) + 1
+
+    def cerrar(self):
+        if self._actual:
+            self.chunks.append("\n".join(self._actual))
+            self._actual, self._largo = [], 0
+        return self.chunks
+
+
+def dividir_en_chunks(texto, tamanio=TAMANIO_CHUNK):
+    """Corta el texto en fragmentos de ~tamanio caracteres respetando párrafos."""
+    fragmentador = Fragmentador(tamanio)
+    fragmentador.agregar(texto)
+    return fragmentador.cerrar()
+
+
+def guardar_documento(sha256, nombre, texto, chunks=None, sin_leer=0):
+    """Guarda texto, índice de chunks y metadatos bajo el hash del archivo."""
+    snippet = texto[:800].replace("\n", " ") + ("..." if len(texto) > 800 else "")
+    meta = {
+        "nombre": nombre,
+        "caracteres": len(texto),
+        "snippet": snippet,
+        "creado": datetime.now().strftime("%Y-%m-%d %H:%M"),
+    }
+    if sin_leer:
+        meta["paginas_sin_leer"] = sin_leer
+    _escribir(_ruta(sha256, ".txt"), texto)
+    if chunks is None:
+        chunks = dividir_en_chunks(texto)
+    _escribir(_ruta(sha256, ".chunks.json"), json.dumps(chunks, ensure_ascii=False))
+    _escribir(_ruta(sha256, ".meta.json"), json.dumps(meta, ensure_ascii=False, indent=2))
+    _escrito()
+    return meta
+
+
+def procesar_documento(sha256, nombre, path, ext):
+    """
+    Extrae el texto de un PDF/DOCX recién subido y lo guarda en caché.
+    En PDFs el índice de chunks se arma página por página mientras la
+    extracción sigue corriendo; las páginas sin texto (escaneadas) se pasan
+    después por OCR (ver ocr.py). Devuelve los metadatos, o None si no se
+    pudo extraer texto. Si el OCR se quedó sin tiempo, el texto es parcial
+    y los metadatos lo dicen en "paginas_sin_leer".
+    """
+    if ext == "pdf":
+        paginas = {}
+        escaneadas = []
+        fragmentador = Fragmentador()
+        for i, texto_pagina in iterar_paginas_pdf(path):
+            if len(texto_pagina.strip()) < ocr.OCR_MIN_CARACTERES:
+                escaneadas.append(i)
+            paginas[i] = texto_pagina
+            if texto_pagina:
+                fragmentador.agregar(texto_pagina + "\n")
+        chunks = fragmentador.cerrar()
+
+        sin_leer = 0
+        if escaneadas:
+            reconocidas, sin_leer = ocr.ocr_paginas_pdf(path, escaneadas)
+            if reconocidas:
+                paginas.update(reconocidas)
+                chunks = None  # el orden cambió: se re-indexa el texto completo
+
+        texto = "".join(paginas[i] + "\n" for i in sorted(paginas) if paginas[i])
+    else:
+        texto = extract_text_from_docx(path)
+        chunks = None
+        sin_leer = 0
+
+    if not texto or not texto.strip():
+        return None
+
+    return guardar_documento(sha256, nombre, texto, chunks=chunks, sin_leer=sin_leer)
+
+
+def cargar_texto(doc_id):
+    """Texto extraído de un documento (por hash, o uuid de versiones viejas)."""
+    if not doc_id_valido(doc_id):
+        return None
+    for ruta in (_ruta(doc_id, ".txt"), os.path.join(TEMP_DIR_LEGACY, f"{doc_id}.txt")):
+        if os.path.exists(ruta):
+            try:
+                with open(ruta, "r", encoding="utf-8") as f:
+                    texto = f.read()
+                _usado(doc_id)
+                return texto
+            except Exception as e:
+                print("Error leyendo documento:", e)
+                return None
+    return None
+
+
+def contexto_para_pregunta(doc_id, pregunta, max_chars=MAX_CONTEXTO):
+    """
+    Arma el contexto para responder una pregunta sobre el documento.
+    Si entra entero se usa todo; si no, se eligen los chunks con más
+    palabras de la pregunta (en su orden original) hasta max_chars; el
+    primero que no entra entero se recorta al espacio que queda.
+    """
+    texto = cargar_texto(doc_id)
+    if texto is None or len(texto) <= max_chars:
+        return texto
+
+    chunks = _leer_json(_ruta(doc_id, ".chunks.json")) or dividir_en_chunks(texto)
+
+    palabras = {p for p in re.findall(r"\w+", pregunta.lower()) if len(p) > 3}
+    if not palabras:
+        return texto[:max_chars]
+
+    puntajes = []
+    for i, chunk in enumerate(chunks):
+        chunk_lower = chunk.lower()
+        puntajes.append((sum(chunk_lower.count(p) for p in palabras), i))
+
+    elegidos = {}
+    total = 0
+    for puntaje, i in sorted(puntajes, key=lambda x: (-x[0], x[1])):
+        restante = max_chars - total
+        if len(chunks[i]) > restante:
+            # el mejor de los que quedan no entra entero: va recortado al
+            # espacio libre (así un chunk enorme no se pierde) y se termina
+            if restante >= MIN_RECORTE:
+                elegidos[i] = chunks[i][:restante]
+            break
+        elegidos[i] = chunks[i]
+        total += len(chunks[i])
+
+    return "\n...\n".join(elegidos[i] for i in sorted(elegidos))
+
+
+def resumen_cacheado(doc_id, modo):
+    """Resumen ya generado para (documento, modo), o None."""
+    if not doc_id_valido(doc_id):
+        return None
+    ruta = _ruta(doc_id, f".resumen_{modo}.txt")
+    if not os.path.exists(ruta):
+        return None
+    try:
+        with open(ruta, "r", encoding="utf-8") as f:
+            return f.read()
+    except Exception:
+        return None
+
+
+def guardar_resumen(doc_id, modo, resumen):
+    if not doc_id_valido(doc_id):
+        return
+    try:
+        _escribir(_ruta(doc_id, f".resumen_{modo}.txt"), resumen)
+        _escrito()
+    except Exception as e:
+        print("Error guardando resumen en caché:", e)
@@ -0,0 +1,86 @@
+# escritura_diferida.py
+# -----------------
+# Escrituras a disco fuera del camino de la respuesta.
+#
+# Después de cada respuesta del chat se guardaban, en el mismo request,
+# memory.json entero (learn_from_message) y el historial del usuario
+# (guardar_en_historial): el usuario esperaba esas escrituras además de
+# la llamada al modelo, y con mucho tráfico reescribir memory.json una vez
+# por mensaje se comía la CPU.
+#
+# Acá las escrituras se encolan y las hace un único hilo por proceso, en
+# orden de llegada:
+#
+#     encolar(guardar_en_historial, usuario, mensaje, texto)
+#
+# encolar_unico(clave, fn) agrupa escrituras del mismo archivo: si ya hay
+# una pendiente con esa clave no se encola otra (la que está en la cola
+# va a escribir el estado más nuevo cuando le toque). Con poco tráfico es
+# una escritura por mensaje; con mucho, una por tanda.
+#
+# Al terminar el proceso se vacía la cola (atexit), con un tope de espera.
+
+import atexit
+import os
+import queue
+import threading
+
+ESPERA_AL_SALIR = 10   # segundos máximos para vaciar la cola al terminar
+
+_cola = queue.Queue()
+_pendientes = set()            # claves de encolar_unico todavía en la cola
+_pendientes_lock = threading.Lock()
+_hilo_holder = [None]          # pid del proceso cuyo hilo está corriendo
+_hilo_lock = threading.Lock()
+
+
+def _trabajar():
+    while True:
+        fn, args, kwargs, clave = _cola.get()
+        if clave is not None:
+            with _pendientes_lock:
+                _pendientes.discard(clave)
+        try:
+            fn(*args, **kwargs)
+        except Exception as e:
+            print(f"Error en escritura diferida ({getattr(fn, '__name__', fn)}):", e)
+        finally:
+            _cola.task_done()
+
+
+def _asegurar_hilo():
+    pid = os.getpid()
+    if _hilo_holder[0] != pid:
+        with _hilo_lock:
+            if _hilo_holder[0] != pid:
+                # después de un fork el hilo del padre no existe en el hijo
+                threading.Thread(target=_trabajar, name="escritura_diferida", daemon=True).start()
+                _hilo_holder[0] = pid
+
+
+def encolar(fn, *args, **kwargs):
+    """Corre fn(*args, **kwargs) en el hilo de escritura. No espera."""
+    _asegurar_hilo()
+    _cola.put((fn, args, kwargs, None))
+
+
+def encolar_unico(clave, fn, *args, **kwargs):
+    """Como encolar(), pero no duplica si ya hay una pendiente con `clave`."""
+    with _pendientes_lock:
+        if clave in _pendientes:
+            return
+        _pendientes.add(clave)
+    _asegurar_hilo()
+    _cola.put((fn, args, kwargs, clave))
+
+
+def vaciar(timeout=ESPERA_AL_SALIR):
+    """Espera a que se escriba todo lo encolado (hasta `timeout` segundos)."""
+    if _hilo_holder[0] != os.getpid():
+        return True
+    listo = threading.Event()
+    _cola.put((listo.set, (), {}, None))
+    return listo.wait(timeout)
+
+
+atexit.register(vaciar)
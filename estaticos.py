@@ -0,0 +1,185 @@
+# estaticos.py
+# -----------------
+# CSS y JS de las páginas como archivos estáticos versionados.
+#
+# La página principal y la academia traen todo su CSS/JS inline (la
+# academia además embebe el currículo entero), así que el navegador no
+# puede cachear nada y cada visita baja varios cientos de KB. Al arrancar,
+# empaquetar_html() saca cada bloque <style>/<script> inline a un archivo
+# propio en static/build/ con el hash del contenido en el nombre, lo
+# minifica y lo deja precomprimido (.gz y, si está instalado, .br). El HTML
+# queda con <link>/<script src> apuntando a /assets/<archivo>, que se sirve
+# con caché de un año: si el contenido cambia, cambia el nombre. Los
+# archivos de una versión anterior de la misma página se borran al generar
+# los nuevos (limpiar_viejos), así static/build/ no crece en cada arranque.
+#
+# Minificadores opcionales (sin ellos el CSS se minifica de forma básica y
+# el JS queda tal cual, sólo comprimido):
+#   pip install rcssmin rjsmin brotli
+
+import gzip
+import hashlib
+import os
+import re
+
+from flask import abort, request, send_file
+
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ASSETS_DIR = os.path.join("static", "build")
+URL_ASSETS = "/assets/"
+CACHE_INMUTABLE = "public, max-age=31536000, immutable"
+
+# (Flask agrega el charset a los text/*)
+MIME = {"css": "text/css", "js": "application/javascript; charset=utf-8"}
+
+# sólo bloques inline: <script src=...> y <style media=...> quedan como están
+_BLOQUE_RE = re.compile(r"<(style|script)>(.*?)</\1>", re.S | re.I)
+_NOMBRE_RE = re.compile(r"^[a-z0-9_-]+\.[0-9a-f]{12}\.(css|js)$")
+
+
+# -----------------------------
+# MINIFICADO
+# -----------------------------
+def minificar_css(css):
+    if rcssmin is not None:
+        return rcssmin.cssmin(css)
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+def minificar_js(js):
+    # Sin rjsmin no se toca: recortar JS "a mano" rompe template strings
+    # y regex. El gzip/brotli igual se lleva la mayor parte.
+    if rjsmin is not None:
+        return rjsmin.jsmin(js)
+    return js.strip()
+
+
+# -----------------------------
+# ESCRITURA
+# -----------------------------
+def _escribir(ruta, datos):
+    tmp = f"{ruta}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(datos)
+    os.replace(tmp, ruta)
+
+
+def guardar_asset(prefijo, ext, contenido):
+    """
+    Guarda `contenido` como <prefijo>.<hash>.<ext> (+ .gz / .br) y devuelve
+    el nombre. Si ya existe (mismo contenido) no reescribe nada.
+    """
+    datos = contenido.encode("utf-8")
+    nombre = f"{prefijo}.{hashlib.sha256(datos).hexdigest()[:12]}.{ext}"
+    ruta = os.path.join(ASSETS_DIR, nombre)
+
+    if os.path.exists(ruta):
+        return nombre
+
+    os.makedirs(ASSETS_DIR, exist_ok=True)
+    _escribir(ruta + ".gz", gzip.compress(datos, compresslevel=9, mtime=0))
+    if brotli is not None:
+        _escribir(ruta + ".br", brotli.compress(datos, quality=11))
+    _escribir(ruta, datos)  # al final: su existencia marca el asset como completo
+    return nombre
+
+
+def empaquetar_html(html, prefijo):
+    """
+    Saca cada <style>/<script> inline de `html` a un asset versionado y
+    devuelve el HTML con las referencias. Cada bloque queda en su lugar
+    (mismo orden de ejecución que antes). Si algo falla devuelve el HTML
+    original: la página sigue andando, sólo que sin caché.
+    """
+    contador = [0]
+
+    def _reemplazar(m):
+        tipo, contenido = m.group(1).lower(), m.group(2)
+        if not contenido.strip():
+            return m.group(0)
+        contador[0] += 1
+        nombre_base = f"{prefijo}-{contador[0]}"
+        if tipo == "style":
+            nombre = guardar_asset(nombre_base, "css", minificar_css(contenido))
+            return f'<link rel="stylesheet" href="{URL_ASSETS}{nombre}">'
+        nombre = guardar_asset(nombre_base, "js", minificar_js(contenido))
+        return f'<script src="{URL_ASSETS}{nombre}"></script>'
+
+    try:
+        nuevo = _BLOQUE_RE.sub(_reemplazar, html)
+    except OSError as e:
+        print(f"No pude generar los assets de '{prefijo}', se sirve inline:", e)
+        return html
+    limpiar_viejos(prefijo, set(re.findall(re.escape(URL_ASSETS) + r"([^\"]+)", nuevo)))
+    return nuevo
+
+
+def limpiar_viejos(prefijo, vigentes):
+    """
+    Borra de static/build/ los assets de la página `prefijo` que no están en
+    `vigentes` (con sus .gz / .br): quedan de arranques anteriores, con
+    otro contenido.
+    """
+    propio = re.compile(re.escape(prefijo) + r"-\d+\.[0-9a-f]{12}\.(css|js)(\.gz|\.br)?$")
+    try:
+        entradas = list(os.scandir(ASSETS_DIR))
+    except OSError:
+        return
+    for entrada in entradas:
+        m = propio.match(entrada.name)
+        if not m:
+            continue
+        asset = entrada.name[:-len(m.group(2))] if m.group(2) else entrada.name
+        if asset in vigentes:
+            continue
+        try:
+            os.remove(entrada.path)
+        except OSError:
+            pass   # otro worker ya lo borró
+
+
+# -----------------------------
+# RUTA /assets/<nombre>
+# -----------------------------
+def init_assets(app):
+    """Registra GET /assets/<nombre>: versión precomprimida según Accept-Encoding."""
+
+    @app.route(URL_ASSETS + "<nombre>")
+    def asset_estatico(nombre):
+        if not _NOMBRE_RE.match(nombre):
+            abort(404)
+
+        ruta = os.path.join(ASSETS_DIR, nombre)
+        if not os.path.exists(ruta):
+            abort(404)
+
+        codificacion = None
+        aceptadas = request.accept_encodings
+        if aceptadas["br"] and os.path.exists(ruta + ".br"):
+            codificacion, ruta = "br", ruta + ".br"
+        elif aceptadas["gzip"] and os.path.exists(ruta + ".gz"):
+            codificacion, ruta = "gzip", ruta + ".gz"
+
+        resp = send_file(ruta, mimetype=MIME[nombre.rsplit(".", 1)[1]], conditional=True, etag=True)
+        if codificacion:
+            resp.headers["Content-Encoding"] = codificacion
+        resp.headers["Vary"] = "Accept-Encoding"
+        resp.headers["Cache-Control"] = CACHE_INMUTABLE
+        return resp
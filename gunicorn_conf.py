@@ -0,0 +1,90 @@
+# gunicorn_conf.py
+# -----------------
+# Configuración de producción:
+#
+#     gunicorn -c gunicorn_conf.py
+#
+# (sin app en la línea de comandos: la elige este archivo según el worker)
+#
+# Casi todos los requests pasan segundos esperando a OpenAI (chat, resúmenes,
+# imágenes, transcripción): el cuello de botella es cuántos requests pueden
+# estar esperando a la vez. Por defecto los workers son de uvicorn y sirven
+# asgi.py: las vistas async esperan a OpenAI en el event loop sin ocupar un
+# hilo, así que los requests en vuelo no están topados por los hilos. Las
+# rutas sync van a un pool de ASGI_HILOS hilos (256). gthread (hilos) y
+# gevent (greenlets) quedan como alternativa con FOSCHI_IA_PRO14:app.
+#
+# Variables de entorno (todas opcionales):
+#   PORT                      puerto (8080, el de Cloud Run)
+#   GUNICORN_WORKER_CLASS     uvicorn (por defecto) | gthread | gevent
+#   WEB_CONCURRENCY           procesos worker (1 por defecto, ver abajo)
+#   ASGI_HILOS                hilos para rutas sync con uvicorn (256, ver asgi.py)
+#   GUNICORN_THREADS          hilos por worker con gthread (256 / workers)
+#   GUNICORN_CONNECTIONS      requests simultáneos por worker con gevent (500)
+#   GUNICORN_TIMEOUT          segundos sin respuesta antes de matar un worker (300)
+#   GUNICORN_GRACEFUL_TIMEOUT segundos para terminar lo que está en curso al
+#                             reiniciar / escalar hacia abajo (120)
+#   GUNICORN_KEEPALIVE        segundos de keep-alive (75, más que el del
+#                             balanceador de Google para que él cierre primero)
+#   GUNICORN_PRELOAD          1/0: importar la app antes del fork (0 sólo con gevent)
+#   GUNICORN_MAX_REQUESTS     reciclar cada worker tras N requests (0 = nunca)
+#
+# Un solo worker por defecto: el estado de los trabajos en segundo plano
+# (transcripciones, presentaciones) y la memoria del chat viven en memoria
+# del proceso, y el polling de /estado_* tiene que caer en el mismo worker
+# que lo lanzó. Con más de un worker usar afinidad de sesión en el
+# balanceador.
+#
+# Medido con prueba_carga.py (1 vCPU, OpenAI falso; ver prueba_carga.txt):
+#   1000 requests, 500 a la vez, OpenAI de 10 s
+#     dev (un hilo por conexión)     317 s   78 errores (se cae)
+#     gthread 1 x 256 (el anterior)  47.7 s  p95 23.4 s
+#     uvicorn 1 (por defecto)        27.6-28.3 s  p95 13.7-14.1 s
+#     uvicorn 2                      28.5 s  p95 14.9 s
+#   400 requests, 200 a la vez, OpenAI de 2 s (con 200 hilos alcanzan)
+#     gthread 1 x 256                6.7-8.3 s  p95 3.4-4.2 s
+#     uvicorn 1                      6.7-7.6 s  p95 3.3-3.9 s
+# Con uvicorn, el tope es la CPU que cuesta cada request, no los hilos.
+# En un solo núcleo un segundo worker no suma CPU, así que no se subió
+# WEB_CONCURRENCY: con más núcleos, subirlo (y sumar afinidad de sesión).
+#
+# Para medir: python prueba_carga.py --servidor todos
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+
+clase = os.getenv("GUNICORN_WORKER_CLASS", "uvicorn")
+worker_class = {"uvicorn": "uvicorn_worker.UvicornWorker"}.get(clase, clase)
+wsgi_app = "asgi:app" if clase == "uvicorn" else "FOSCHI_IA_PRO14:app"
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+threads = int(os.getenv("GUNICORN_THREADS", str(max(32, 256 // workers))))
+worker_connections = int(os.getenv("GUNICORN_CONNECTIONS", "500"))
+
+# Una presentación o un resumen largo pueden tardar minutos
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "300"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "120"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "75"))
+
+# gevent tiene que parchear la librería estándar antes de importar la app;
+# con --preload la app se importaría sin parchear en el proceso padre.
+preload_app = os.getenv("GUNICORN_PRELOAD", "0" if clase == "gevent" else "1") == "1"
+
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = max_requests // 10
+
+# Cloud Run termina TLS adelante: confiar en X-Forwarded-*
+forwarded_allow_ips = "*"
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOGLEVEL", "info")
+
+
+def post_worker_init(worker):
+    # Clientes propios de cada worker + monitor de recordatorios (ver
+    # iniciar_proceso en FOSCHI_IA_PRO14.py). Se usa post_worker_init y no
+    # post_fork porque con gevent recién acá la librería estándar ya está
+    # parcheada y la app cargada.
+    import FOSCHI_IA_PRO14
+    FOSCHI_IA_PRO14.iniciar_proceso()
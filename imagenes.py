@@ -0,0 +1,196 @@
+# imagenes.py
+# -----------------
+# Preprocesado de imágenes subidas antes de mandarlas a OpenAI.
+#
+# Las fotos de celular llegan de 4000x3000 px, con la orientación en el
+# EXIF y varios MB de metadatos. El modelo no usa esa resolución (gpt-4o
+# achica todo a 2048 px de lado mayor y 768 de lado menor), así que
+# mandarla entera sólo agranda el payload y provoca timeouts. Acá se
+# rota según el EXIF, se reduce al tamaño útil, se recodifica en un
+# formato liviano y se descartan los metadatos.
+#
+# El trabajo corre en un pool de hilos propio (Pillow libera el GIL al
+# decodificar / redimensionar / codificar) para no trabar al worker web.
+#
+# También guarda las imágenes que genera / edita gpt-image-1: en lugar de
+# mandarlas en base64 dentro del JSON (33% más pesadas y decodificadas en
+# JS), quedan en un almacén por contenido (sha256) de corta vida y el
+# front-end las pide por URL como binario cacheable.
+
+import base64
+import hashlib
+import os
+import re
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from PIL import Image, ImageOps
+
+PERFILES = {
+    # Para gpt-4o (visión / OCR): resolución efectiva del modelo
+    "vision": {"max_lado": 2048, "lado_corto": 768, "formato": "JPEG", "calidad": 85},
+    # Para gpt-image-1 (edición): la salida es 1024x1024, no hace falta más
+    "edicion": {"max_lado": 1536, "lado_corto": None, "formato": "WEBP", "calidad": 90},
+}
+
+EXTENSION = {"JPEG": ".jpg", "WEBP": ".webp", "PNG": ".png"}
+MIME = {"JPEG": "image/jpeg", "WEBP": "image/webp", "PNG": "image/png"}
+
+POOL_IMAGENES = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1))
+TIMEOUT_PREPARADO = 30
+
+# Almacén de imágenes generadas
+GENERADAS_DIR = os.path.join("data", "temp_images", "generadas")
+GENERADAS_TTL_HORAS = float(os.getenv("IMAGENES_TTL_HORAS", "24"))
+GENERADAS_WEBP = os.getenv("IMAGENES_WEBP", "1") == "1"   # PNG → WEBP (~5x más liviano)
+CALIDAD_WEBP_GENERADA = 90
+
+_ID_GENERADA_RE = re.compile(r"^[0-9a-f]{32}\.(png|webp)$")
+_ultima_limpieza = [0.0]
+
+
+def _tamanio_objetivo(ancho, alto, max_lado, lado_corto):
+    escala = min(1.0, max_lado / max(ancho, alto))
+    if lado_corto and min(ancho, alto) * escala > lado_corto:
+        escala = lado_corto / min(ancho, alto)
+    return max(1, round(ancho * escala)), max(1, round(alto * escala))
+
+
+def reducir(imagen, perfil="vision"):
+    """Rota según EXIF y reduce una imagen PIL al tamaño del perfil."""
+    conf = PERFILES[perfil]
+    imagen = ImageOps.exif_transpose(imagen)
+    objetivo = _tamanio_objetivo(imagen.width, imagen.height, conf["max_lado"], conf["lado_corto"])
+    if objetivo != imagen.size:
+        imagen = imagen.resize(objetivo, Image.LANCZOS)
+    return imagen
+
+
+def _convertir_modo(imagen, formato):
+    if formato == "JPEG":
+        if imagen.mode in ("RGBA", "LA", "P"):
+            # JPEG no tiene transparencia: fondo blanco
+            imagen = imagen.convert("RGBA")
+            fondo = Image.new("RGB", imagen.size, (255, 255, 255))
+            fondo.paste(imagen, mask=imagen.getchannel("A"))
+            return fondo
+        return imagen.convert("RGB") if imagen.mode != "RGB" else imagen
+    if imagen.mode not in ("RGB", "RGBA"):
+        return imagen.convert("RGBA" if "A" in imagen.getbands() or imagen.mode == "P" else "RGB")
+    return imagen
+
+
+def codificar(imagen, perfil="vision"):
+    """Devuelve (bytes, mime) de una imagen PIL ya reducida, sin metadatos."""
+    conf = PERFILES[perfil]
+    buffer = BytesIO()
+    _convertir_modo(imagen, conf["formato"]).save(
+        buffer, format=conf["formato"], quality=conf["calidad"], optimize=True
+    )
+    return buffer.getvalue(), MIME[conf["formato"]]
+
+
+def preparar_imagen(ruta, perfil="vision"):
+    """
+    Genera al lado de `ruta` una copia orientada, reducida y sin EXIF.
+    Devuelve un dict con ruta, mime, ancho, alto y tamanio (bytes).
+    """
+    conf = PERFILES[perfil]
+    with Image.open(ruta) as original:
+        # En JPEG grandes, decodificar directo a menor escala (mucho más
+        # rápido); después se termina de reducir con LANCZOS.
+        objetivo = _tamanio_objetivo(*original.size, conf["max_lado"], conf["lado_corto"])
+        original.draft("RGB", (objetivo[0] * 2, objetivo[1] * 2))
+        imagen = reducir(original, perfil)
+        datos, mime = codificar(imagen, perfil)
+
+    destino = os.path.join(
+        os.path.dirname(ruta) or ".",
+        f"{uuid.uuid4().hex}_{perfil}{EXTENSION[conf['formato']]}"
+    )
+    with open(destino, "wb") as f:
+        f.write(datos)
+
+    return {
+        "ruta": destino,
+        "mime": mime,
+        "ancho": imagen.width,
+        "alto": imagen.height,
+        "tamanio": len(datos),
+    }
+
+
+def preparar_en_pool(ruta, perfil="vision"):
+    """preparar_imagen() corriendo en el pool de imágenes."""
+    return POOL_IMAGENES.submit(preparar_imagen, ruta, perfil).result(timeout=TIMEOUT_PREPARADO)
+
+
+# -----------------------------
+# ALMACÉN DE IMÁGENES GENERADAS
+# -----------------------------
+def _a_webp(datos):
+    with Image.open(BytesIO(datos)) as imagen:
+        buffer = BytesIO()
+        _convertir_modo(imagen, "WEBP").save(buffer, format="WEBP", quality=CALIDAD_WEBP_GENERADA, method=4)
+    return buffer.getvalue()
+
+
+def guardar_generada(b64_json, webp=None):
+    """
+    Guarda una imagen devuelta por la API (base64) y devuelve su id
+    ("<sha256[:32]>.png|webp"). La misma imagen siempre da el mismo id.
+    """
+    datos = base64.b64decode(b64_json)
+    ext = "png"
+    if GENERADAS_WEBP if webp is None else webp:
+        try:
+            datos = POOL_IMAGENES.submit(_a_webp, datos).result(timeout=TIMEOUT_PREPARADO)
+            ext = "webp"
+        except Exception as e:
+            print("No pude pasar la imagen a WEBP, se guarda en PNG:", e)
+
+    imagen_id = f"{hashlib.sha256(datos).hexdigest()[:32]}.{ext}"
+    ruta = os.path.join(GENERADAS_DIR, imagen_id)
+    if not os.path.exists(ruta):
+        os.makedirs(GENERADAS_DIR, exist_ok=True)
+        tmp = f"{ruta}.{uuid.uuid4().hex}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(datos)
+        os.replace(tmp, ruta)
+
+    limpiar_generadas()
+    return imagen_id
+
+
+def ruta_generada(imagen_id):
+    """Ruta de una imagen generada, o None si el id no es válido o ya venció."""
+    if not imagen_id or not _ID_GENERADA_RE.match(imagen_id):
+        return None
+    ruta = os.path.join(GENERADAS_DIR, imagen_id)
+    return ruta if os.path.exists(ruta) else None
+
+
+def mime_generada(imagen_id):
+    return "image/webp" if imagen_id.endswith(".webp") else "image/png"
+
+
+def limpiar_generadas(ttl_horas=GENERADAS_TTL_HORAS):
+    """Borra las imágenes generadas más viejas que el TTL (como mucho una
+    pasada cada 10 minutos)."""
+    ahora = time.time()
+    if ahora - _ultima_limpieza[0] < 600:
+        return
+    _ultima_limpieza[0] = ahora
+
+    limite = ahora - ttl_horas * 3600
+    try:
+        for entrada in os.scandir(GENERADAS_DIR):
+            try:
+                if entrada.is_file() and entrada.stat().st_mtime < limite:
+                    os.remove(entrada.path)
+            except OSError:
+                pass
+    except OSError as e:
+        print("Error limpiando imágenes generadas:", e)
@@ -0,0 +1,141 @@
+# json_parcial.py
+# -----------------
+# Lectura incremental del JSON de una presentación mientras OpenAI lo va
+# generando (stream). Permite empezar a trabajar con la diapositiva 1
+# (ej: generar su imagen) mientras el modelo todavía escribe la 8, y
+# rescatar lo que haya llegado completo si la salida se corta o viene rota.
+
+import json
+import re
+
+
+def _leer_string(texto, clave):
+    """Busca "clave": "valor" ya completo en el texto y devuelve el valor
+    (des-escapado) o None si todavía no llegó entero."""
+    m = re.search(r'"' + re.escape(clave) + r'"\s*:\s*"((?:[^"\\]|\\.)*)"', texto)
+    if not m:
+        return None
+    try:
+        return json.loads('"' + m.group(1) + '"')
+    except Exception:
+        return None
+
+
+class LectorDiapositivas:
+    """
+    Parser incremental para la estructura de presentación.
+
+    Se le pasan fragmentos con alimentar() a medida que llegan del stream y
+    devuelve las diapositivas nuevas que se cerraron en ese fragmento. No
+    re-escanea lo ya leído: guarda la posición y el estado (strings, escapes
+    y profundidad de llaves/corchetes) entre llamadas.
+    """
+
+    def __init__(self, clave_lista="diapositivas"):
+        self.clave_lista = clave_lista
+        self.texto = ""
+        self.diapositivas = []
+        self.reparado = False
+
+        self._patron_lista = re.compile(r'"' + re.escape(clave_lista) + r'"\s*:\s*\[')
+        self._pos = 0
+        self._en_lista = False
+        self._lista_cerrada = False
+        self._profundidad = 0
+        self._en_string = False
+        self._escape = False
+        self._inicio_obj = None
+
+    def alimentar(self, fragmento):
+        """Agrega texto recibido y devuelve la lista de diapositivas nuevas."""
+        if not fragmento:
+            return []
+
+        self.texto += fragmento
+        nuevas = []
+
+        if not self._en_lista:
+            m = self._patron_lista.search(self.texto)
+            if not m:
+                return []
+            self._en_lista = True
+            self._pos = m.end()
+
+        texto = self.texto
+        while self._pos < len(texto) and not self._lista_cerrada:
+            c = texto[self._pos]
+
+            if self._en_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._en_string = False
+            elif c == '"':
+                self._en_string = True
+            elif c in "{[":
+                if self._profundidad == 0 and c == "{":
+                    self._inicio_obj = self._pos
+                self._profundidad += 1
+            elif c in "}]":
+                if self._profundidad == 0:
+                    # "]" que cierra la lista de diapositivas
+                    self._lista_cerrada = True
+                else:
+                    self._profundidad -= 1
+                    if self._profundidad == 0 and self._inicio_obj is not None:
+                        crudo = texto[self._inicio_obj:self._pos + 1]
+                        self._inicio_obj = None
+                        try:
+                            dia = json.loads(crudo)
+                        except Exception:
+                            dia = None
+                        if isinstance(dia, dict):
+                            self.diapositivas.append(dia)
+                            nuevas.append(dia)
+
+            self._pos += 1
+
+        return nuevas
+
+    def cabecera(self):
+        """Devuelve (titulo_presentacion, subtitulo) si ya llegaron."""
+        return (
+            _leer_string(self.texto, "titulo_presentacion"),
+            _leer_string(self.texto, "subtitulo"),
+        )
+
+    def resultado(self):
+        """
+        Devuelve la estructura final. Primero intenta parsear el texto
+        completo; si está truncado o mal formado, arma la estructura con la
+        cabecera y las diapositivas que llegaron completas. Devuelve None si
+        no se pudo rescatar ninguna diapositiva.
+        """
+        texto = self.texto.strip()
+
+        # Limpiar posibles bloques de markdown ```json ... ```
+        texto = re.sub(r"^```(json)?", "", texto)
+        texto = re.sub(r"```$", "", texto).strip()
+
+        self.reparado = False
+        try:
+            estructura = json.loads(texto)
+            if isinstance(estructura, dict) and isinstance(estructura.get(self.clave_lista), list) \
+                    and estructura[self.clave_lista]:
+                return estructura
+        except Exception:
+            pass
+
+        if not self.diapositivas:
+            return None
+
+        self.reparado = True
+
+        titulo, subtitulo = self.cabecera()
+        return {
+            "titulo_presentacion": titulo or "",
+            "subtitulo": subtitulo or "",
+            self.clave_lista: list(self.diapositivas),
+        }
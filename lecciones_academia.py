@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# coding: utf-8
+"""
+lecciones_academia.py — comienzo de cada lección del currículo, pregenerado.
+
+Las 250+ lecciones de CURRICULUM son fijas, pero cada vez que un alumno
+abría una, el navegador le pedía al modelo que armara desde cero la
+explicación y los primeros ejercicios del tema. Ahora eso se genera una
+sola vez, fuera de línea, por (nivel, módulo, tema):
+
+  · este script le pide a MODELO_GRANDE (ver modelos.py) una introducción
+    y 3 ejercicios por lección y los guarda en data/lecciones/v<VERSION>/,
+    un JSON por nivel;
+  · la academia los sirve desde GET /api/academia/leccion/<id>, cacheable
+    en el navegador, y el profesor sigue la clase en vivo a partir de ahí
+    (las repreguntas personalizadas sí van al modelo);
+  · si una lección no está generada (o su tema cambió en CURRICULUM desde
+    que se generó), el navegador la arranca en vivo como antes.
+
+Si cambia el prompt "academia_leccion" (prompts.py) o el formato, subir
+VERSION: el contenido viejo deja de servirse hasta regenerarlo.
+
+Uso (con OPENAI_API_KEY; retoma lo que falte si se corta):
+  python lecciones_academia.py                     # todas las que faltan
+  python lecciones_academia.py --nivel A0 A1       # sólo esos niveles
+  python lecciones_academia.py --rehacer           # regenera aunque existan
+  python lecciones_academia.py --concurrencia 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import threading
+
+from academia_ingles import CURRICULUM
+from nucleo import DATA_DIR
+
+VERSION = 1
+CARPETA = os.path.join(DATA_DIR, "lecciones", f"v{VERSION}")
+EJERCICIOS = 3
+MAX_TOKENS = 1200
+
+_cache = {}                  # nivel → (mtime, lecciones del archivo)
+_cache_lock = threading.Lock()
+
+
+# -----------------------------
+# ÍNDICE DEL CURRÍCULO
+# -----------------------------
+def indice():
+    """{id de lección: (nivel, módulo, tema)}, con los mismos ids que el front-end."""
+    lecciones = {}
+    for nivel, datos in CURRICULUM.items():
+        for modulo in datos["modules"]:
+            for i, tema in enumerate(modulo["topics"]):
+                lecciones[f"{modulo['id']}_l{i}"] = (nivel, modulo, tema)
+    return lecciones
+
+
+_indice = indice()
+
+
+def texto_leccion(entrada):
+    """El mensaje del profesor que ve el alumno: introducción + ejercicios."""
+    ejercicios = "\n".join(f"{i}. {e}" for i, e in enumerate(entrada["ejercicios"], 1))
+    return f"{entrada['intro']}\n\n**Ejercicios**\n{ejercicios}"
+
+
+def pedido_inicial(nivel, modulo, tema):
+    """El pedido del alumno con que arranca la conversación de la lección."""
+    return f'Comienza una lección nueva sobre: "{tema}" (módulo: {modulo["title"]}, nivel: {nivel}).'
+
+
+# -----------------------------
+# ALMACÉN
+# -----------------------------
+def _ruta(nivel):
+    return os.path.join(CARPETA, f"{nivel}.json")
+
+
+def _cargar(nivel):
+    try:
+        with open(_ruta(nivel), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _guardar(nivel, lecciones):
+    os.makedirs(CARPETA, exist_ok=True)
+    path = _ruta(nivel)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(lecciones, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _lecciones_nivel(nivel):
+    # se relee si el archivo cambió (se regeneró con la app andando)
+    try:
+        mtime = os.path.getmtime(_ruta(nivel))
+    except OSError:
+        return {}
+    with _cache_lock:
+        guardado = _cache.get(nivel)
+        if guardado and guardado[0] == mtime:
+            return guardado[1]
+    lecciones = _cargar(nivel)
+    with _cache_lock:
+        _cache[nivel] = (mtime, lecciones)
+    return lecciones
+
+
+def obtener(leccion):
+    """
+    Contenido pregenerado de `leccion` ("a1_m2_l3"), o None si no está o
+    es de un tema que ya no coincide con CURRICULUM.
+    """
+    datos = _indice.get(leccion)
+    if datos is None:
+        return None
+    nivel, modulo, tema = datos
+    entrada = _lecciones_nivel(nivel).get(leccion)
+    if not entrada or entrada.get("tema") != tema or entrada.get("modulo") != modulo["title"]:
+        return None
+    return {
+        "leccion": leccion,
+        "version": VERSION,
+        "nivel": nivel,
+        "tema": tema,
+        "texto": texto_leccion(entrada),
+    }
+
+
+def historial_inicial(leccion):
+    """Mensajes con que arranca la conversación de `leccion`, o None."""
+    contenido = obtener(leccion)
+    if contenido is None:
+        return None
+    nivel, modulo, tema = _indice[leccion]
+    return [
+        {"role": "user", "content": pedido_inicial(nivel, modulo, tema)},
+        {"role": "assistant", "content": contenido["texto"]},
+    ]
+
+
+# -----------------------------
+# GENERACIÓN (fuera de línea)
+# -----------------------------
+async def _generar(leccion, nivel, modulo, tema):
+    from modelos import completar
+    from prompts import mensajes
+
+    resp = await completar(
+        "academia_leccion",
+        prompt="academia_leccion",
+        messages=mensajes(
+            "academia_leccion",
+            usuario=(
+                f"NIVEL: {nivel} — {CURRICULUM[nivel]['label']}\n"
+                f"MÓDULO: {modulo['title']}\n"
+                f"TEMA: {tema}"
+            ),
+        ),
+        response_format={"type": "json_object"},
+        temperature=0.5,
+        max_tokens=MAX_TOKENS
+    )
+    datos = json.loads(resp.choices[0].message.content or "{}")
+    intro = str(datos.get("intro") or "").strip()
+    ejercicios = [str(e).strip() for e in datos.get("ejercicios") or [] if str(e).strip()]
+    if not intro or len(ejercicios) < EJERCICIOS:
+        raise ValueError(f"respuesta incompleta para {leccion}")
+    return {
+        "tema": tema,
+        "modulo": modulo["title"],
+        "intro": intro,
+        "ejercicios": ejercicios[:EJERCICIOS],
+    }
+
+
+async def generar(niveles=None, rehacer=False, concurrencia=4):
+    """Genera las lecciones que faltan de `niveles` (todos si None). Devuelve (hechas, errores)."""
+    semaforo = asyncio.Semaphore(concurrencia)
+    almacen = {}
+    pendientes = []
+    for leccion, (nivel, modulo, tema) in _indice.items():
+        if niveles and nivel not in niveles:
+            continue
+        lecciones = almacen.setdefault(nivel, _cargar(nivel))
+        actual = lecciones.get(leccion)
+        if not rehacer and actual and actual.get("tema") == tema and actual.get("modulo") == modulo["title"]:
+            continue
+        pendientes.append((leccion, nivel, modulo, tema))
+
+    hechas = errores = 0
+
+    async def _una(leccion, nivel, modulo, tema):
+        nonlocal hechas, errores
+        async with semaforo:
+            try:
+                entrada = await _generar(leccion, nivel, modulo, tema)
+            except Exception as e:
+                errores += 1
+                print(f"❌ {leccion} ({tema}): {e}")
+                return
+        almacen[nivel][leccion] = entrada
+        # se guarda cada una: si se corta, la próxima corrida sigue de acá
+        _guardar(nivel, almacen[nivel])
+        hechas += 1
+        print(f"✅ {leccion} ({hechas + errores}/{len(pendientes)}) {tema}")
+
+    await asyncio.gather(*(_una(*p) for p in pendientes))
+    return hechas, errores
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pregenera el comienzo de las lecciones de la academia")
+    parser.add_argument("--nivel", nargs="*", choices=list(CURRICULUM), help="niveles a generar (todos por defecto)")
+    parser.add_argument("--rehacer", action="store_true", help="regenera también las que ya existen")
+    parser.add_argument("--concurrencia", type=int, default=4, help="pedidos simultáneos a OpenAI")
+    args = parser.parse_args()
+
+    hechas, errores = asyncio.run(generar(args.nivel, args.rehacer, max(1, args.concurrencia)))
+    print(f"\n{hechas} lecciones generadas, {errores} con error → {CARPETA}")
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
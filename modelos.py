@@ -0,0 +1,191 @@
+# modelos.py
+# -----------------
+# Qué modelo de OpenAI usa cada llamada de chat, y cuánto tarda y cuesta.
+#
+# Antes todo (chat, noticias de una oración, deportes, documentos) iba a
+# gpt-4-turbo. Ahora cada llamada dice su intención y el router elige:
+#
+#   rapido → MODELO_RAPIDO (gpt-4o-mini): respuestas cortas, resúmenes
+#   grande → MODELO_GRANDE (gpt-4-turbo): tareas pesadas
+#   auto   → según la complejidad: largo del texto (tokens), pistas de
+#            tarea pesada en el mensaje ("paso a paso", código...) y si el
+#            usuario es Premium (umbral más bajo)
+#
+# Cada intención se puede fijar a un modelo con MODELO_<INTENCION>, por
+# ejemplo MODELO_NOTICIAS=gpt-4o.
+#
+#     resp = await completar("noticias", messages=[...], max_tokens=120)
+#
+# completar() registra llamadas, errores, latencia (y, con stream=True, el
+# tiempo hasta el primer token), tokens (cuántos de entrada salieron de la
+# caché de prompts, ver prompts.py) y costo estimado por (intención,
+# modelo); se ven en /admin/modelos. Las métricas son del proceso (con
+# varios workers, cada uno tiene las suyas).
+
+import os
+import re
+import threading
+import time
+
+from contexto_chat import contar_tokens
+
+MODELO_RAPIDO = os.getenv("MODELO_RAPIDO", "gpt-4o-mini")
+MODELO_GRANDE = os.getenv("MODELO_GRANDE", "gpt-4-turbo")
+
+RUTAS = {
+    "chat": "auto",
+    "noticias": "rapido",
+    "deportes": "rapido",
+    "documento": "grande",      # preguntas sobre un documento subido
+    "resumen_doc": "auto",
+    "resumen_chat": "rapido",   # resumen acumulado (contexto_chat.py)
+    "academia": "rapido",
+    "academia_resumen": "rapido",   # conversaciones_academia.py
+    "academia_leccion": "grande",   # lecciones_academia.py (fuera de línea, una vez)
+}
+
+# tokens del texto a partir de los cuales "auto" elige el modelo grande
+UMBRALES = {"chat": 150, "resumen_doc": 2500}
+UMBRAL_PREMIUM = 40             # en el chat, para usuarios Premium
+
+PISTAS_COMPLEJAS = re.compile(
+    r"paso a paso|explic|analiz|compar|demostr|código|codigo|programa|script|"
+    r"función|funcion|ensayo|redact|traduc|```",
+    re.IGNORECASE,
+)
+
+# USD por millón de tokens (entrada, salida), para estimar costos
+PRECIOS = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4-turbo": (10.00, 30.00),
+}
+
+_metricas = {}                  # (intención, modelo) → contadores
+_metricas_lock = threading.Lock()
+
+
+# -----------------------------
+# ELECCIÓN DEL MODELO
+# -----------------------------
+def _es_compleja(intencion, texto, premium):
+    tokens = contar_tokens(texto)
+    if tokens >= UMBRALES.get(intencion, UMBRALES["chat"]):
+        return True
+    if intencion == "chat":
+        if PISTAS_COMPLEJAS.search(texto or ""):
+            return True
+        if premium and tokens >= UMBRAL_PREMIUM:
+            return True
+    return False
+
+
+def elegir_modelo(intencion, texto="", premium=False):
+    fijo = os.getenv(f"MODELO_{intencion.upper()}")
+    if fijo:
+        return fijo
+    nivel = RUTAS.get(intencion, "grande")
+    if nivel == "auto":
+        nivel = "grande" if _es_compleja(intencion, texto, premium) else "rapido"
+    return MODELO_GRANDE if nivel == "grande" else MODELO_RAPIDO
+
+
+# -----------------------------
+# MÉTRICAS
+# -----------------------------
+def registrar(intencion, modelo, segundos, uso=None, error=False, primer_token=None):
+    with _metricas_lock:
+        m = _metricas.setdefault((intencion, modelo), {
+            "llamadas": 0, "errores": 0, "segundos": 0.0, "segundos_max": 0.0,
+            "streams": 0, "segundos_primer_token": 0.0,
+            "tokens_entrada": 0, "tokens_cacheados": 0, "tokens_salida": 0,
+        })
+        m["llamadas"] += 1
+        m["errores"] += int(error)
+        m["segundos"] += segundos
+        m["segundos_max"] = max(m["segundos_max"], segundos)
+        if primer_token is not None:
+            m["streams"] += 1
+            m["segundos_primer_token"] += primer_token
+        if uso is not None:
+            m["tokens_entrada"] += getattr(uso, "prompt_tokens", 0) or 0
+            m["tokens_salida"] += getattr(uso, "completion_tokens", 0) or 0
+            detalle = getattr(uso, "prompt_tokens_details", None)
+            m["tokens_cacheados"] += getattr(detalle, "cached_tokens", 0) or 0
+
+
+def metricas():
+    """Lista de métricas por (intención, modelo), con latencia media y costo."""
+    filas = []
+    with _metricas_lock:
+        copia = {k: dict(v) for k, v in _metricas.items()}
+    for (intencion, modelo), m in sorted(copia.items()):
+        entrada, salida = PRECIOS.get(modelo, (0, 0))
+        filas.append(dict(
+            m,
+            intencion=intencion,
+            modelo=modelo,
+            segundos=round(m["segundos"], 3),
+            segundos_max=round(m["segundos_max"], 3),
+            segundos_media=round(m["segundos"] / m["llamadas"], 3) if m["llamadas"] else 0,
+            segundos_primer_token=round(m["segundos_primer_token"] / m["streams"], 3) if m["streams"] else None,
+            costo_usd=round((m["tokens_entrada"] * entrada + m["tokens_salida"] * salida) / 1_000_000, 4),
+        ))
+    return filas
+
+
+# -----------------------------
+# LLAMADA
+# -----------------------------
+async def completar(intencion, texto="", premium=False, prompt=None, **kwargs):
+    """
+    chat.completions.create con el modelo que corresponde a `intencion`
+    (`texto` y `premium` sólo pesan en las intenciones "auto"). `prompt`
+    es el nombre del texto fijo de prompts.py con que empiezan los
+    mensajes: se manda como clave de caché si es lo bastante largo para
+    que OpenAI lo cachee (ver clave_cache). Los demás argumentos van tal
+    cual a OpenAI. Llamar desde una corrutina.
+
+    Con stream=True devuelve un generador async de los chunks (cerrarlo con
+    aclose() si no se recorre entero); se registra cuando termina.
+    """
+    from asincronico import cliente_openai
+
+    modelo = elegir_modelo(intencion, texto, premium)
+    if prompt:
+        from prompts import clave_cache
+        clave = clave_cache(prompt)
+        if clave:
+            kwargs.setdefault("extra_body", {})["prompt_cache_key"] = clave
+    if kwargs.get("stream"):
+        # el último chunk trae los tokens usados
+        kwargs.setdefault("stream_options", {"include_usage": True})
+    inicio = time.perf_counter()
+    try:
+        resp = await cliente_openai().chat.completions.create(model=modelo, **kwargs)
+    except Exception:
+        registrar(intencion, modelo, time.perf_counter() - inicio, error=True)
+        raise
+    if kwargs.get("stream"):
+        return _medir_stream(intencion, modelo, inicio, resp)
+    registrar(intencion, modelo, time.perf_counter() - inicio, getattr(resp, "usage", None))
+    return resp
+
+
+async def _medir_stream(intencion, modelo, inicio, stream):
+    uso = None
+    primer_token = None
+    error = False
+    try:
+        async for chunk in stream:
+            if primer_token is None and chunk.choices:
+                primer_token = time.perf_counter() - inicio
+            uso = getattr(chunk, "usage", None) or uso
+            yield chunk
+    except Exception:
+        error = True
+        raise
+    finally:
+        await stream.close()
+        registrar(intencion, modelo, time.perf_counter() - inicio, uso, error=error,
+                  primer_token=primer_token if primer_token is not None else time.perf_counter() - inicio)
@@ -0,0 +1,429 @@
+# nucleo.py
+# -----------------
+# Piezas compartidas por todos los blueprints de Foschi IA: configuración,
+# claves, clientes diferidos (OpenAI y módulos pesados), el decorador
+# @requiere_premium, historial, memoria, clima y recordatorios.
+#
+# Este módulo no crea la app ni arranca hilos: eso lo hace create_app()
+# en FOSCHI_IA_PRO14.py (ver ahí el orden de arranque con gunicorn).
+
+import os
+import re
+import json
+import asyncio
+import multiprocessing
+import inspect
+import threading
+from functools import wraps
+from datetime import datetime, timedelta, date
+
+import pytz
+import requests
+
+from flask import request, session, jsonify, redirect
+
+from carga_diferida import Diferido, modulo_diferido
+from escritura_diferida import encolar, encolar_unico
+from superusuarios import es_superusuario
+from suscripciones import usuario_premium
+
+# ---------------- CONFIG ----------------
+APP_NAME = "FOSCHI IA WEB"
+CREADOR = "Gustavo Enrique Foschi"
+DATA_DIR = "data"
+STATIC_DIR = "static"
+TEMP_DIR = os.path.join(DATA_DIR, "temp_docs")
+IMAGES_DIR = os.path.join(DATA_DIR, "temp_images")
+
+os.makedirs(IMAGES_DIR, exist_ok=True)
+os.makedirs(DATA_DIR, exist_ok=True)
+os.makedirs(STATIC_DIR, exist_ok=True)
+os.makedirs(TEMP_DIR, exist_ok=True)
+
+# ---------------- KEYS ---------------- (usa variables de entorno)
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+GOOGLE_CSE_ID = os.getenv("GOOGLE_CSE_ID")
+OWM_API_KEY = os.getenv("OWM_API_KEY")
+
+# --- módulos pesados: se cargan recién en la primera ruta que los usa ---
+# (ver carga_diferida.py; python-docx y python-pptx se importan dentro de
+# las funciones que arman los .docx / .pptx)
+documentos = modulo_diferido("documentos")      # PyPDF2, python-docx
+ocr = modulo_diferido("ocr")                    # Pillow, tesseract
+imagenes = modulo_diferido("imagenes")          # Pillow
+transcripcion = modulo_diferido("transcripcion")  # ffmpeg, whisper
+voz = modulo_diferido("voz")                    # gTTS
+
+
+def _crear_cliente_openai():
+    from openai import OpenAI
+    return OpenAI()
+
+
+# Un solo cliente (y un solo pool de conexiones) por proceso. Se crea en el
+# primer uso, o sea dentro de cada worker (nunca antes del fork).
+client = Diferido(_crear_cliente_openai)
+
+
+# Pools de procesos (extracción de PDFs, ver documentos.py). Un worker corre
+# decenas de hilos: un fork desde ahí puede copiar un lock tomado por otro
+# hilo y dejar colgado al hijo. Con "forkserver" los procesos salen de un
+# servidor aparte, de un solo hilo, que se arranca al iniciar cada worker
+# (ver iniciar_proceso en FOSCHI_IA_PRO14.py) y ya tiene documentos cargado.
+def iniciar_servidor_procesos():
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return  # Windows: los pools usan "spawn"
+    from multiprocessing import forkserver
+    multiprocessing.set_forkserver_preload(["documentos"])
+    forkserver.ensure_running()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  DECORADOR CENTRALIZADO DE ACCESO PREMIUM
+#  Aplica sobre CUALQUIER ruta que requiera suscripción activa.
+#
+#  Capas de verificación (en orden):
+#    1. Usuario logueado       → session["user_email"] presente
+#    2. Sesión válida          → email con formato mínimo correcto
+#    3. Superusuario           → siempre autorizado sin importar suscripción
+#    4. Suscripción Premium    → usuario_premium(email) == True
+#
+#  Comportamiento al fallar:
+#    - Petición HTML  → redirect a /?accion=login  o  /?accion=premium
+#    - Petición JSON  → 401/403 con {"error": "...", "msg": "..."}
+# ─────────────────────────────────────────────────────────────────────────────
+def _rechazo_premium():
+    """None si el usuario puede pasar; si no, la respuesta de rechazo."""
+    # 1. Login
+    email = session.get("user_email")
+    if not email:
+        if request.is_json or request.method == "POST":
+            return jsonify({"error": "no_login",
+                            "msg": "Debés iniciar sesión para usar esta función."}), 401
+        return redirect("/?accion=login&msg=Iniciá+sesión+para+acceder+a+esta+función")
+
+    # 2. Sesión válida
+    if "@" not in email or len(email) < 5:
+        session.pop("user_email", None)
+        if request.is_json or request.method == "POST":
+            return jsonify({"error": "sesion_invalida",
+                            "msg": "Sesión inválida. Volvé a iniciar sesión."}), 401
+        return redirect("/?accion=login&msg=Sesión+inválida,+volvé+a+iniciar+sesión")
+
+    # 3. Superusuario → siempre pasa
+    if es_superusuario(email):
+        return None
+
+    # 4. Premium activo
+    if not usuario_premium(email):
+        if request.is_json or request.method == "POST":
+            return jsonify({"error": "no_premium",
+                            "msg": "Esta función es exclusiva de usuarios Premium. Suscribite en Foschi IA."}), 403
+        return redirect("/?accion=premium&msg=Esta+función+requiere+una+suscripción+Premium")
+
+    return None
+
+
+def requiere_premium(f):
+    # Las vistas async (ver asincronico.py) necesitan un wrapper async:
+    # Flask decide cómo correr la vista según sea corrutina o no.
+    if inspect.iscoroutinefunction(f):
+        @wraps(f)
+        async def _verificar_async(*args, **kwargs):
+            # la suscripción se lee de disco: en un hilo, no en el event loop
+            rechazo = await asyncio.to_thread(_rechazo_premium)
+            if rechazo is not None:
+                return rechazo
+            return await f(*args, **kwargs)
+        return _verificar_async
+
+    @wraps(f)
+    def _verificar(*args, **kwargs):
+        rechazo = _rechazo_premium()
+        if rechazo is not None:
+            return rechazo
+        return f(*args, **kwargs)
+    return _verificar
+
+
+# ---------------- UTIL / CACHE / HTTP ----------------
+HTTPS = requests.Session()
+URL_REGEX = re.compile(r'(https?://[^\s]+)', re.UNICODE)
+
+MEMORY_FILE = os.path.join(DATA_DIR, "memory.json")
+MEMORY_CACHE = {}
+MEMORY_LOCK = threading.Lock()
+
+
+def puede_preguntar(usuario):
+    if es_superusuario(usuario):
+        return True  # 👑 sin límites
+
+    hoy = date.today().isoformat()
+
+    if usuario.get("fecha_preguntas") != hoy:
+        usuario["fecha_preguntas"] = hoy
+        usuario["preguntas_hoy"] = 0
+
+    if usuario["preguntas_hoy"] >= 5:
+        return False
+
+    usuario["preguntas_hoy"] += 1
+    return True
+
+def load_json(path):
+    """Carga memory.json en cache en RAM para accesos rápidos."""
+    global MEMORY_CACHE
+    if MEMORY_CACHE:
+        return MEMORY_CACHE
+    if not os.path.exists(path):
+        MEMORY_CACHE = {}
+        return MEMORY_CACHE
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            MEMORY_CACHE = json.load(f)
+            return MEMORY_CACHE
+    except:
+        MEMORY_CACHE = {}
+        return MEMORY_CACHE
+
+def save_json(path, data):
+    """Guarda MEMORY_CACHE actualizado en disco."""
+    with MEMORY_LOCK:
+        MEMORY_CACHE.update(data)
+    _volcar_memoria(path)
+
+def _volcar_memoria(path=None):
+    """Escribe MEMORY_CACHE entero en memory.json (reemplazo atómico)."""
+    path = path or MEMORY_FILE
+    with MEMORY_LOCK:
+        contenido = json.dumps(MEMORY_CACHE, ensure_ascii=False, indent=2)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(contenido)
+    os.replace(tmp, path)
+
+def guardar_memoria_diferido():
+    """Escribe memory.json en segundo plano (agrupa escrituras seguidas)."""
+    encolar_unico(MEMORY_FILE, _volcar_memoria)
+
+def fecha_hora_en_es():
+    tz = pytz.timezone("America/Argentina/Buenos_Aires")
+    ahora = datetime.now(tz)
+    meses = ["enero","febrero","marzo","abril","mayo","junio","julio","agosto","septiembre","octubre","noviembre","diciembre"]
+    dias = ["lunes","martes","miércoles","jueves","viernes","sábado","domingo"]
+    return f"{dias[ahora.weekday()]}, {ahora.day} de {meses[ahora.month-1]} de {ahora.year}, {ahora.hour:02d}:{ahora.minute:02d}"
+
+def hacer_links_clicleables(texto):
+    return URL_REGEX.sub(r'<a href="\1" target="_blank" style="color:#ff0000;">\1</a>', texto)
+
+# ---------------- HISTORIAL POR USUARIO ----------------
+def guardar_en_historial(usuario, entrada, respuesta):
+    path = os.path.join(DATA_DIR, f"{usuario}.json")
+    datos = []
+    if os.path.exists(path):
+        try:
+            with open(path,"r",encoding="utf-8") as f:
+                datos = json.load(f)
+        except:
+            datos = []
+    datos.append({
+        "fecha": datetime.now(pytz.timezone("America/Argentina/Buenos_Aires")).strftime("%d/%m/%Y %H:%M:%S"),
+        "usuario": entrada,
+        "foschi": respuesta
+    })
+    datos = datos[-200:]
+    try:
+        with open(path,"w",encoding="utf-8") as f:
+            json.dump(datos,f,ensure_ascii=False,indent=2)
+    except Exception as e:
+        print("Error guardando historial:", e)
+
+def guardar_en_historial_diferido(usuario, entrada, respuesta):
+    """guardar_en_historial() en segundo plano (no demora la respuesta)."""
+    encolar(guardar_en_historial, usuario, entrada, respuesta)
+
+def _borrar_archivo_historial(usuario):
+    path = os.path.join(DATA_DIR, f"{usuario}.json")
+    if os.path.exists(path): os.remove(path)
+
+def borrar_historial_diferido(usuario):
+    # por la misma cola: no se cruza con un guardado todavía pendiente
+    encolar(_borrar_archivo_historial, usuario)
+
+def cargar_historial(usuario):
+    path = os.path.join(DATA_DIR, f"{usuario}.json")
+    if not os.path.exists(path): return []
+    try:
+        with open(path,"r",encoding="utf-8") as f:
+            return json.load(f)
+    except:
+        return []
+
+# ---------------- CLIMA ----------------
+def _url_clima(ciudad=None, lat=None, lon=None):
+    if lat and lon:
+        return f"http://api.openweathermap.org/data/2.5/weather?lat={lat}&lon={lon}&appid={OWM_API_KEY}&units=metric&lang=es"
+    ciudad = ciudad if ciudad else "Buenos Aires"
+    return f"http://api.openweathermap.org/data/2.5/weather?q={ciudad}&appid={OWM_API_KEY}&units=metric&lang=es"
+
+
+def _texto_clima(status, data, ciudad=None):
+    if status != 200:
+        msg = data.get("message", "Respuesta no OK de OpenWeatherMap.")
+        return f"No pude obtener el clima: {status} - {msg}"
+    desc = data.get("weather", [{}])[0].get("description", "Sin descripción").capitalize()
+    temp = data.get("main", {}).get("temp")
+    hum = data.get("main", {}).get("humidity")
+    name = data.get("name", ciudad if ciudad else "la ubicación")
+    parts = [f"El clima en {name} es {desc}"]
+    if temp is not None:
+        parts.append(f"temperatura {round(temp)}°C")
+    if hum is not None:
+        parts.append(f"humedad {hum}%")
+    return ", ".join(parts) + "."
+
+
+def obtener_clima(ciudad=None, lat=None, lon=None):
+    if not OWM_API_KEY:
+        return "No está configurada la API de clima (OWM_API_KEY)."
+    try:
+        r = HTTPS.get(_url_clima(ciudad, lat, lon), timeout=3)
+        return _texto_clima(r.status_code, r.json(), ciudad)
+    except:
+        return "No pude obtener el clima."
+
+
+async def obtener_clima_async(ciudad=None, lat=None, lon=None):
+    """obtener_clima() sin ocupar un hilo mientras responde OpenWeatherMap."""
+    from asincronico import obtener_json
+
+    if not OWM_API_KEY:
+        return "No está configurada la API de clima (OWM_API_KEY)."
+    try:
+        status, data = await obtener_json(_url_clima(ciudad, lat, lon), timeout=3)
+        return _texto_clima(status, data, ciudad)
+    except:
+        return "No pude obtener el clima."
+
+# ---------------- RECORDATORIOS ----------------
+RECORD_FILE = os.path.join(DATA_DIR, "recordatorios.json")
+TZ = pytz.timezone("America/Argentina/Buenos_Aires")
+
+def load_recordatorios():
+    if not os.path.exists(RECORD_FILE): return []
+    try:
+        with open(RECORD_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except:
+        return []
+
+def save_recordatorios(lista):
+    try:
+        with open(RECORD_FILE, "w", encoding="utf-8") as f:
+            json.dump(lista, f, ensure_ascii=False, indent=2)
+    except Exception as e:
+        print("Error guardando recordatorios:", e)
+
+def interpretar_fecha_hora(texto):
+    """Intenta interpretar frases de tiempo en español. Devuelve datetime (con TZ) o None."""
+    ahora = datetime.now(TZ)
+
+    m = re.search(r"en (\d+)\s*minutos?", texto)
+    if m:
+        return ahora + timedelta(minutes=int(m.group(1)))
+
+    m = re.search(r"en (\d+)\s*horas?", texto)
+    if m:
+        return ahora + timedelta(hours=int(m.group(1)))
+
+    m = re.search(r"mañana a las (\d{1,2})(?::(\d{2}))?", texto)
+    if m:
+        hora = int(m.group(1))
+        minuto = int(m.group(2)) if m.group(2) else 0
+        mañana = (ahora + timedelta(days=1)).replace(hour=hora, minute=minuto, second=0, microsecond=0)
+        return mañana
+
+    m = re.search(r"a las (\d{1,2}):(\d{2})", texto)
+    if m:
+        hora = int(m.group(1))
+        minuto = int(m.group(2))
+        posible = ahora.replace(hour=hora, minute=minuto, second=0, microsecond=0)
+        if posible <= ahora:
+            posible = posible + timedelta(days=1)
+        return posible
+
+    m = re.search(r"el (\d{1,2}) de (\w+) a las (\d{1,2})(?::(\d{2}))?", texto)
+    if m:
+        dia = int(m.group(1))
+        mes_texto = m.group(2).lower()
+        hora = int(m.group(3))
+        minuto = int(m.group(4)) if m.group(4) else 0
+        meses = {
+            "enero":1,"febrero":2,"marzo":3,"abril":4,"mayo":5,"junio":6,
+            "julio":7,"agosto":8,"septiembre":9,"octubre":10,"noviembre":11,"diciembre":12
+        }
+        mes = meses.get(mes_texto)
+        if mes:
+            año = ahora.year
+            try:
+                candidato = datetime(año, mes, dia, hora, minuto)
+                candidato = TZ.localize(candidato)
+            except Exception:
+                return None
+            if candidato <= ahora:
+                try:
+                    candidato = datetime(año+1, mes, dia, hora, minuto)
+                    candidato = TZ.localize(candidato)
+                except:
+                    return None
+            return candidato
+
+    return None
+
+def agregar_recordatorio(usuario, motivo_texto, fecha_hora_dt):
+    """Agrega un recordatorio persistente. fecha_hora_dt debe ser datetime con TZ (o naive en TZ)."""
+    if fecha_hora_dt.tzinfo is None:
+        fecha_hora_dt = fecha_hora_dt.replace(tzinfo=TZ)
+    lista = load_recordatorios()
+    lista.append({
+        "usuario": usuario,
+        "motivo": motivo_texto.strip(),
+        "cuando": fecha_hora_dt.strftime("%Y-%m-%d %H:%M:%S")
+    })
+    save_recordatorios(lista)
+
+def listar_recordatorios(usuario):
+    lista = load_recordatorios()
+    return [r for r in lista if r.get("usuario") == usuario]
+
+def borrar_recordatorios(usuario):
+    lista = load_recordatorios()
+    lista = [r for r in lista if r.get("usuario") != usuario]
+    save_recordatorios(lista)
+
+# ---------------- learn_from_message (registro de memoria) ----------------
+def learn_from_message(usuario, mensaje, respuesta):
+    # La memoria en RAM se actualiza ya (el próximo mensaje la ve); el
+    # memory.json se escribe en segundo plano (ver escritura_diferida.py)
+    try:
+        memory = load_json(MEMORY_FILE)
+        with MEMORY_LOCK:
+            if usuario not in memory:
+                memory[usuario] = {"temas": {}, "mensajes": [], "ultima_interaccion": None}
+            # Guardar texto en memoria (limitamos)
+            # "turnos" cuenta todos los mensajes (la lista se recorta a 200);
+            # con él contexto_chat.py sabe cuáles ya entraron al resumen
+            memory[usuario]["turnos"] = memory[usuario].get("turnos", len(memory[usuario]["mensajes"])) + 1
+            memory[usuario]["mensajes"].append({"usuario": str(mensaje), "foschi": str(respuesta)})
+            memory[usuario]["mensajes"] = memory[usuario]["mensajes"][-200:]
+            ahora = datetime.now(pytz.timezone("America/Argentina/Buenos_Aires"))
+            memory[usuario]["ultima_interaccion"] = ahora.strftime("%d/%m/%Y %H:%M:%S")
+            # Tópicos simples
+            for palabra in str(mensaje).lower().split():
+                if len(palabra) > 3:
+                    memory[usuario]["temas"][palabra] = memory[usuario]["temas"].get(palabra, 0) + 1
+        guardar_memoria_diferido()
+    except Exception as e:
+        print("Error en learn_from_message:", e)
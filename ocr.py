@@ -0,0 +1,214 @@
+# ocr.py
+# -----------------
+# OCR local (Tesseract) con escalado al modelo de visión.
+#
+# Para imágenes y páginas escaneadas primero se intenta OCR local, que es
+# gratis y rápido. Sólo si la confianza promedio queda por debajo del
+# umbral (foto torcida, letra manuscrita, poca luz...) se manda la imagen
+# a gpt-4o.
+#
+# Dependencias opcionales (si faltan, todo va directo al modelo de visión):
+#   pip install pytesseract      + binario tesseract (apt install tesseract-ocr tesseract-ocr-spa)
+#   pip install pypdfium2        para renderizar páginas de PDFs escaneados
+
+import base64
+import os
+import time
+
+from PIL import Image, ImageOps
+
+import imagenes
+
+try:
+    import pytesseract
+except ImportError:
+    pytesseract = None
+
+try:
+    import pypdfium2
+except ImportError:
+    pypdfium2 = None
+
+OCR_IDIOMAS = os.getenv("OCR_IDIOMAS", "spa+eng")
+OCR_CONFIANZA_MINIMA = float(os.getenv("OCR_CONFIANZA_MINIMA", "70"))
+OCR_MIN_CARACTERES = 10        # menos texto que esto en una página = "página escaneada"
+OCR_DPI_PDF = 200
+MAX_PAGINAS_VISION = 30        # tope de páginas por PDF que se mandan a gpt-4o
+OCR_PRESUPUESTO_SEGUNDOS = int(os.getenv("OCR_PRESUPUESTO_SEGUNDOS", "60"))  # por PDF
+
+PROMPT_VISION = "Extraé TODO el texto visible."
+
+_tesseract_ok = [None]
+
+
+def tesseract_disponible():
+    """True si pytesseract está instalado y encuentra el binario tesseract."""
+    if _tesseract_ok[0] is None:
+        if pytesseract is None:
+            _tesseract_ok[0] = False
+        else:
+            try:
+                pytesseract.get_tesseract_version()
+                _tesseract_ok[0] = True
+            except Exception:
+                print("OCR: pytesseract instalado pero no se encontró el binario tesseract")
+                _tesseract_ok[0] = False
+    return _tesseract_ok[0]
+
+
+def ocr_local(imagen):
+    """
+    OCR con Tesseract. Devuelve (texto, confianza 0-100).
+    Si Tesseract no está disponible devuelve ("", 0).
+    """
+    if not tesseract_disponible():
+        return "", 0.0
+
+    try:
+        datos = pytesseract.image_to_data(
+            imagen, lang=OCR_IDIOMAS, output_type=pytesseract.Output.DICT
+        )
+    except Exception as e:
+        print("Error en OCR local:", e)
+        return "", 0.0
+
+    lineas = {}
+    confianzas = []
+    for i, palabra in enumerate(datos["text"]):
+        palabra = (palabra or "").strip()
+        try:
+            conf = float(datos["conf"][i])
+        except (TypeError, ValueError):
+            conf = -1
+        if not palabra or conf < 0:
+            continue
+        clave = (datos["block_num"][i], datos["par_num"][i], datos["line_num"][i])
+        lineas.setdefault(clave, []).append(palabra)
+        # ponderar por largo: una palabra larga pesa más que un "a"
+        confianzas.extend([conf] * len(palabra))
+
+    texto = "\n".join(" ".join(palabras) for _, palabras in sorted(lineas.items()))
+    confianza = sum(confianzas) / len(confianzas) if confianzas else 0.0
+    return texto, confianza
+
+
+def ocr_vision(imagen, mime=None, datos=None, timeout=None):
+    """
+    Extrae el texto con gpt-4o. Recibe una imagen PIL (se reduce a la
+    resolución efectiva del modelo) o directamente los bytes ya preparados
+    (datos + mime). Usa el cliente compartido del proceso (nucleo.client).
+    """
+    if datos is None:
+        datos, mime = imagenes.codificar(imagenes.reducir(imagen, "vision"), "vision")
+
+    # importado acá: documentos (y con él ocr) se precarga en el forkserver
+    # de los procesos de PDF, que no necesitan nucleo ni Flask
+    from nucleo import client
+
+    # with_options comparte el pool de conexiones del cliente
+    cliente = client.with_options(timeout=timeout) if timeout else client
+    respuesta = cliente.chat.completions.create(
+        model="gpt-4o",
+        messages=[
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": PROMPT_VISION},
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": f"data:{mime or 'image/png'};base64," + base64.b64encode(datos).decode()
+                        }
+                    }
+                ]
+            }
+        ],
+        max_tokens=4000
+    )
+    return respuesta.choices[0].message.content or ""
+
+
+def extraer_texto_imagen(ruta, mime=None, preparada=None):
+    """
+    Texto de una imagen: primero OCR local y, si la confianza es baja,
+    modelo de visión. Devuelve (texto, origen) con origen "tesseract" o "vision".
+    preparada: resultado de imagenes.preparar_imagen(ruta, "vision"); si
+    viene, es lo que se manda al modelo en lugar del archivo original.
+    """
+    if tesseract_disponible():
+        with Image.open(ruta) as original:
+            # Tesseract usa la resolución completa, pero bien orientada
+            texto, confianza = ocr_local(ImageOps.exif_transpose(original))
+
+        if texto.strip() and confianza >= OCR_CONFIANZA_MINIMA:
+            return texto, "tesseract"
+
+        if texto.strip():
+            print(f"OCR: confianza {confianza:.0f} < {OCR_CONFIANZA_MINIMA:.0f}, se usa el modelo de visión")
+
+    if preparada:
+        ruta, mime = preparada["ruta"], preparada["mime"]
+    with open(ruta, "rb") as f:
+        datos = f.read()
+    return ocr_vision(None, mime=mime, datos=datos), "vision"
+
+
+def ocr_paginas_pdf(path, paginas, presupuesto=OCR_PRESUPUESTO_SEGUNDOS):
+    """
+    OCR de páginas escaneadas de un PDF (índices en `paginas`).
+    Devuelve ({indice: texto}, páginas que quedaron sin leer por falta de
+    tiempo). Necesita pypdfium2 para renderizar; sin él no lee ninguna. Las páginas con baja
+    confianza local van al modelo de visión, hasta MAX_PAGINAS_VISION por
+    documento. Corre dentro del request: pasados `presupuesto` segundos se
+    corta y queda lo leído hasta ahí.
+    """
+    if pypdfium2 is None or not paginas:
+        if paginas and pypdfium2 is None:
+            print("OCR: instalá pypdfium2 para leer PDFs escaneados")
+        return {}, 0
+
+    limite = time.monotonic() + presupuesto
+    resultado = {}
+    enviadas_a_vision = 0
+
+    try:
+        pdf = pypdfium2.PdfDocument(path)
+    except Exception as e:
+        print("Error abriendo PDF para OCR:", e)
+        return {}, 0
+
+    try:
+        for n, i in enumerate(paginas):
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                print(f"OCR: presupuesto de tiempo agotado ({presupuesto}s), faltan {len(paginas) - n} páginas")
+                return resultado, len(paginas) - n
+
+            try:
+                imagen = pdf[i].render(scale=OCR_DPI_PDF / 72).to_pil()
+            except Exception as e:
+                print(f"Error renderizando página {i} para OCR:", e)
+                continue
+
+            texto, confianza = ocr_local(imagen)
+            if texto.strip() and confianza >= OCR_CONFIANZA_MINIMA:
+                resultado[i] = texto
+                continue
+
+            if enviadas_a_vision >= MAX_PAGINAS_VISION:
+                if texto.strip():
+                    resultado[i] = texto  # mejor algo que nada
+                continue
+
+            try:
+                # la llamada tampoco puede pasarse del presupuesto
+                resultado[i] = ocr_vision(imagen, timeout=max(5.0, limite - time.monotonic()))
+                enviadas_a_vision += 1
+            except Exception as e:
+                print(f"Error en OCR con visión (página {i}):", e)
+                if texto.strip():
+                    resultado[i] = texto
+    finally:
+        pdf.close()
+
+    return resultado, 0
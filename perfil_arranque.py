@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# coding: utf-8
+"""
+perfil_arranque.py — mide cuánto tarda en importarse la app.
+
+Corre `python -X importtime -c "import FOSCHI_IA_PRO14"` en un proceso
+nuevo (arranque en frío), y muestra:
+  · el tiempo total de import de la app
+  · los imports directos más caros
+  · si alguna dependencia pesada (openai, Pillow, pptx, ...) se cargó al
+    arrancar en lugar de en la primera ruta que la usa (ver carga_diferida.py)
+
+Sirve también como chequeo de presupuesto: sale con código 1 si el import
+supera el presupuesto o si se coló una dependencia pesada.
+
+Uso:
+  python perfil_arranque.py                     # reporte
+  python perfil_arranque.py --presupuesto 400   # presupuesto en ms
+  python perfil_arranque.py --guardar           # actualiza perfil_arranque.txt
+  python perfil_arranque.py --repeticiones 5    # mediana de 5 corridas
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+
+MODULO_APP = "FOSCHI_IA_PRO14"
+PRESUPUESTO_MS = int(os.getenv("ARRANQUE_PRESUPUESTO_MS", "500"))
+REPORTE = "perfil_arranque.txt"
+
+# No deben importarse al arrancar: se cargan en la primera ruta que los usa
+PESADOS = [
+    "openai", "PIL", "pptx", "docx", "PyPDF2", "gtts", "mercadopago",
+    "whisper", "torch", "ffmpeg", "moviepy", "pygame", "pytesseract", "pypdfium2",
+]
+
+_LINEA_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def medir_una_vez():
+    """Importa la app en un proceso nuevo. Devuelve [(acumulado_us, nivel, modulo)]."""
+    carpeta = os.path.dirname(os.path.abspath(__file__))
+    resultado = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {MODULO_APP}"],
+        cwd=carpeta,
+        capture_output=True,
+        text=True,
+    )
+    if resultado.returncode != 0:
+        print(resultado.stderr[-3000:])
+        raise SystemExit(f"No se pudo importar {MODULO_APP} (código {resultado.returncode})")
+
+    filas = []
+    for linea in resultado.stderr.splitlines():
+        m = _LINEA_RE.match(linea)
+        if m:
+            filas.append((int(m.group(2)), len(m.group(3)), m.group(4)))
+    return filas
+
+
+def analizar(filas):
+    app = [f for f in filas if f[2] == MODULO_APP]
+    if not app:
+        raise SystemExit("importtime no informó el módulo de la app")
+    total_us, nivel_app, _ = app[0]
+
+    directos = sorted(
+        [(us, mod) for us, nivel, mod in filas if nivel == nivel_app + 2],
+        reverse=True,
+    )
+    cargados = {mod.split(".")[0] for _, _, mod in filas}
+    pesados = [p for p in PESADOS if p in cargados]
+    return total_us / 1000, directos, pesados
+
+
+def armar_reporte(total_ms, directos, pesados, presupuesto, corridas, top=15):
+    lineas = [
+        f"Perfil de arranque de {MODULO_APP} — {datetime.now().strftime('%Y-%m-%d %H:%M')}",
+        f"python {sys.version.split()[0]} · mediana de {corridas} corrida(s)",
+        "",
+        f"Import total: {total_ms:.0f} ms (presupuesto {presupuesto} ms)",
+        "",
+        "Imports directos más caros (acumulado, ms):",
+    ]
+    for us, mod in directos[:top]:
+        lineas.append(f"  {us / 1000:8.1f}  {mod}")
+    lineas.append("")
+    if pesados:
+        lineas.append("Dependencias pesadas cargadas al arrancar: " + ", ".join(pesados))
+    else:
+        lineas.append("Dependencias pesadas cargadas al arrancar: ninguna")
+    return "\n".join(lineas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perfil de arranque (python -X importtime)")
+    parser.add_argument("--presupuesto", type=int, default=PRESUPUESTO_MS, help="ms máximos de import")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--guardar", action="store_true", help=f"escribe el reporte en {REPORTE}")
+    args = parser.parse_args()
+
+    corridas = [analizar(medir_una_vez()) for _ in range(max(1, args.repeticiones))]
+    total_ms = statistics.median(c[0] for c in corridas)
+    # para el detalle se usa la corrida más cercana a la mediana
+    _, directos, pesados = min(corridas, key=lambda c: abs(c[0] - total_ms))
+
+    reporte = armar_reporte(total_ms, directos, pesados, args.presupuesto, len(corridas))
+    print(reporte)
+
+    if args.guardar:
+        ruta = os.path.join(os.path.dirname(os.path.abspath(__file__)), REPORTE)
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write(reporte + "\n")
+        print(f"\nReporte guardado en {REPORTE}")
+
+    errores = []
+    if total_ms > args.presupuesto:
+        errores.append(f"el import tarda {total_ms:.0f} ms (presupuesto {args.presupuesto} ms)")
+    if pesados:
+        errores.append("se importan al arrancar: " + ", ".join(pesados))
+
+    if errores:
+        print("\n❌ Arranque fuera de presupuesto: " + "; ".join(errores))
+        return 1
+    print("\n✅ Arranque dentro del presupuesto")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
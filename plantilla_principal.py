@@ -0,0 +1,2636 @@
+# plantilla_principal.py
+# -----------------
+# HTML de la página principal (plantilla Jinja; la única variable es
+# APP_NAME). Se renderiza una sola vez al crear la app: ver
+# rutas_chat.preparar_pagina_principal().
+
+# ---------------- Plantilla HTML (modificada para menu clip + subir pdf/docx) ----------------
+HTML_TEMPLATE = """  
+<!doctype html>
+<html>
+<head>
+<title>{{APP_NAME}}</title>
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<style>
+/* --- ESTILOS GENERALES --- */
+body{
+ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+ background:#000814;
+ color:#00eaff;
+ margin:0;
+ padding:0;
+ display:flex;
+ flex-direction:column;
+ height:100vh;
+ overflow:hidden;
+ text-shadow:0 0 6px #00eaff;
+}
+
+/* --- HEADER SUPERIOR (LOGO + BOTONES) --- */
+#header{
+  display:flex;
+  align-items:center;
+  justify-content:space-between;
+  padding:8px 16px;
+  background: linear-gradient(#000814,#00111a);
+  flex-shrink:0;
+  position:sticky;
+  top:0;
+  z-index:10;
+  box-shadow:0 0 12px #00eaff66;
+}
+
+#leftButtons{
+  display:flex;
+  align-items:center;
+  gap:12px;
+}
+
+#rightButtons{
+  display:flex;
+  align-items:center;
+  gap:8px;
+}
+
+.separator{
+  border-left:1px solid #00eaff55;
+  height:32px;
+  margin:0 8px;
+}
+
+#header button{
+  font-size:14px;
+  padding:6px 10px;
+  border-radius:6px;
+  background:#001f2e;
+  color:#00eaff;
+  border:1px solid #006688;
+  cursor:pointer;
+  text-shadow:0 0 4px #00eaff;
+  box-shadow:0 0 8px #0099bb;
+  transition:0.3s;
+}
+/* ===================== */
+/* === MODO DAY ======== */
+/* ===================== */
+body.day{
+  background:#ffffff;
+  color:#000000;
+  text-shadow:none;
+}
+
+body.day #header{
+  background:#ffffff;
+  box-shadow:0 2px 8px rgba(0,0,0,0.1);
+}
+
+body.day #chat{
+  background:#f5f5f5;
+  border-top:1px solid #ccc;
+  border-bottom:1px solid #ccc;
+  box-shadow:none;
+}
+
+body.day #inputBar{
+  background:#ffffff;
+  border-top:1px solid #ccc;
+}
+
+body.day button{
+  background:#ffffff !important;
+  color:#000000 !important;
+  border:1px solid #000000 !important;
+  box-shadow:none !important;
+  text-shadow:none !important;
+}
+
+body.day input{
+  background:#ffffff !important;
+  color:#000000 !important;
+  border:1px solid #000000 !important;
+  box-shadow:none !important;
+}
+
+/* Premium en Day */
+body.day #premiumBtn{
+  animation:none;
+  font-weight:600;
+}
+
+#header button:hover{
+  background:#003547;
+  box-shadow:0 0 14px #00eaff;
+}
+
+#premiumBtn{
+  animation: neonGlow 1.5s ease-in-out infinite alternate;
+}
+
+@keyframes neonGlow {
+  0% { box-shadow: 0 0 8px #00eaff, 0 0 12px #00eaff, 0 0 16px #00eaff; color:#00eaff; }
+  50% { box-shadow: 0 0 12px #00ffff, 0 0 20px #00ffff, 0 0 28px #00ffff; color:#00ffff; }
+  100% { box-shadow: 0 0 8px #00eaff, 0 0 12px #00eaff, 0 0 16px #00eaff; color:#00eaff; }
+}
+
+#logo{
+  width:120px;
+  cursor:pointer;
+  transition: transform 0.5s, filter 0.5s;
+  filter: drop-shadow(0 0 12px #00eaff);
+}
+#logo:hover{
+  transform:scale(1.2) rotate(6deg);
+  filter:drop-shadow(0 0 20px #00eaff);
+}
+
+/* --- CHAT --- */
+#chat{
+  flex:1;
+  overflow-y:auto;
+  padding:10px;
+  background: linear-gradient(#00111a,#000814);
+  border-top:2px solid #00eaff44;
+  border-bottom:2px solid #00eaff44;
+  box-shadow: inset 0 0 15px #00eaff55;
+  padding-bottom:120px; /* espacio para la barra inferior */
+}
+
+/* --- MENSAJES --- */
+.message{
+ margin:5px 0;
+ padding:8px 12px;
+ border-radius:15px;
+ max-width:80%;
+ word-wrap:break-word;
+ opacity:0;
+ transition:opacity 0.5s, box-shadow 0.5s, background 0.5s;
+ font-size:15px;
+}
+.message.show{ opacity:1; }
+.user{
+ background:rgba(51,0,255,0.3);
+ color:#b4b7ff;
+ margin-left:auto;
+ text-align:right;
+ border:1px solid #4455ff;
+ box-shadow:0 0 8px #3344ff;
+}
+.ai{
+ background:rgba(0,255,255,0.2);
+ color:#00eaff;
+ margin-right:auto;
+ text-align:left;
+ border:1px solid #00eaff;
+ box-shadow:0 0 10px #00eaff;
+}
+a{ color:#00eaff; text-decoration:underline; }
+img{ max-width:300px; border-radius:10px; margin:5px 0; box-shadow:0 0 10px #00eaff88; border:1px solid #00eaff55; }
+
+/* --- BARRA DE ENTRADA FIJA ABAJO --- */
+#inputBar{
+ display:flex;
+ align-items:center;
+ gap:6px;
+ padding:8px;
+ background:#001d29;
+ border-top:2px solid #00eaff44;
+ flex-shrink:0;
+ position:fixed;
+ bottom:0;
+ left:0;
+ width:100%;
+ box-sizing:border-box;
+ z-index:20;
+}
+#inputBar input[type=text]{
+ flex:1;
+ padding:10px;
+ font-size:16px;
+ background:#00121d;
+ color:#00eaff;
+ border:1px solid #003344;
+ box-shadow:0 0 6px #00eaff55 inset;
+ border-radius:5px;
+}
+#inputBar button{
+ padding:10px;
+ font-size:16px;
+ border:none;
+ border-radius:5px;
+ background:#001f2e;
+ color:#00eaff;
+ cursor:pointer;
+ border:1px solid #006688;
+ text-shadow:0 0 4px #00eaff;
+ box-shadow:0 0 8px #0099bb;
+ transition:0.25s;
+}
+#inputBar button:hover{
+ background:#003547;
+ box-shadow:0 0 14px #00eaff;
+}
+
+/* --- BOTONES PEQUEÑOS --- */
+#vozBtn,#borrarBtn,#premiumBtn{ font-size:14px; padding:6px 10px; }
+
+/* --- BOTÓN ADJUNTAR (CLIP) --- */
+#clipBtn{
+  width:40px;
+  height:40px;
+  display:flex;
+  align-items:center;
+  justify-content:center;
+  font-size:20px;
+  cursor:pointer;
+  border-radius:6px;
+  background:#001f2e;
+  color:#00eaff;
+  border:1px solid #006688;
+  box-shadow:0 0 10px #0099bb;
+  transition:0.25s;
+  user-select:none;
+}
+
+#clipBtn:hover{
+  background:#003547;
+  box-shadow:0 0 16px #00eaff;
+  transform:scale(1.08);
+}
+
+/* --- CLIP EN MODO DAY --- */
+body.day #clipBtn{
+  background:#ffffff;
+  color:#000000;
+  border:1px solid #000000;
+  box-shadow:none;
+}
+
+body.day #clipBtn:hover{
+  background:#f0f0f0;
+}
+
+/* --- MENÚ DE ADJUNTOS (overlay fijo sobre la barra) --- */
+#adjuntos_menu{
+ position:fixed;
+ left:10px;
+ bottom:62px;
+ display:none;
+ background:#001f2e;
+ border:1px solid #003547;
+ padding:8px;
+ border-radius:8px;
+ box-shadow:0 6px 16px rgba(0,0,0,0.6);
+ z-index:999;
+ max-width:90vw;
+}
+#adjuntos_menu button{ display:block; width:200px; margin:4px 0; text-align:left; transition:0.2s; }
+.hidden_file_input{ display:none; }
+
+/* --- MENÚ PREMIUM --- */
+#premiumMenu button{
+  display:block;
+  width:120px;
+  margin:4px 0;
+  text-align:left;
+}
+
+/* Opciones del menú de adjuntos: se iluminan al pasar el mouse o al elegirlas */
+#adjuntos_menu button:hover,
+#adjuntos_menu button.opcion-seleccionada{
+  background:#003547 !important;
+  color:#ffd700 !important;
+  border:1px solid #ffd700 !important;
+  box-shadow:0 0 16px #ffd700, 0 0 28px #ffd70066 !important;
+}
+
+#adjuntos_menu button.opcion-seleccionada{
+  animation: iluminarOpcionAdjunto 0.4s ease-in-out;
+}
+
+@keyframes iluminarOpcionAdjunto{
+  0%{ box-shadow:0 0 2px #ffd70033; }
+  50%{ box-shadow:0 0 26px #ffd700; }
+  100%{ box-shadow:0 0 16px #ffd700; }
+}
+
+/* --- AVISO "ACÁ ESTÁ EL MENÚ" SOBRE EL CLIP (solo usuarios no premium) --- */
+#clipBtn{ position:relative; }
+
+#adjuntosHint{
+  position:absolute;
+  bottom:50px;
+  left:0;
+  background:#001f2e;
+  color:#00eaff;
+  border:1px solid #00eaff;
+  font-size:12px;
+  padding:6px 10px;
+  border-radius:6px;
+  white-space:nowrap;
+  box-shadow:0 0 14px #00eaff99;
+  z-index:99;
+  pointer-events:none;
+  animation: pulsoAdjuntosHint 1.6s ease-in-out infinite;
+}
+
+#adjuntosHint::after{
+  content:"";
+  position:absolute;
+  bottom:-6px;
+  left:14px;
+  border-width:6px 6px 0 6px;
+  border-style:solid;
+  border-color:#00eaff transparent transparent transparent;
+}
+
+@keyframes pulsoAdjuntosHint{
+  0%,100%{ box-shadow:0 0 8px #00eaff66; opacity:0.9; }
+  50%{ box-shadow:0 0 20px #00eaff; opacity:1; }
+}
+
+body.day #adjuntosHint{
+  background:#ffffff;
+  color:#0077aa;
+  border-color:#0077aa;
+}
+body.day #adjuntosHint::after{
+  border-color:#0077aa transparent transparent transparent;
+}
+
+/* --- AJUSTES RESPONSIVE PARA MÓVIL --- */
+@media (max-width:600px){
+  #inputBar input[type=text]{ font-size:18px; padding:12px; }
+  #inputBar button{ font-size:16px; padding:10px; }
+  #logo{ width:140px; } /* logo más grande en móvil */
+}
+/* =============================== */
+/* === MENSAJES EN MODO DAY ====== */
+/* =============================== */
+
+body.day .user{
+  background:#e9e9e9;
+  color:#000000;
+  border:1px solid #000000;
+  box-shadow:none;
+}
+
+body.day .ai{
+  background:#f5f5f5;
+  color:#000000;
+  border:1px solid #000000;
+  box-shadow:none;
+}
+
+body.day .ai a,
+body.day .user a{
+  color:#000000;
+}
+
+/* ===== FORMULARIO PREMIUM CENTRADO ===== */
+.form-premium{
+  width:100%;
+  max-width:320px;
+  margin:0 auto;
+  display:flex;
+  flex-direction:column;
+  align-items:center;
+  gap:10px;
+}
+
+.form-premium input{
+  width:100%;
+  padding:10px;
+  border-radius:6px;
+  border:1px solid #006688;
+  background:#00121d;
+  color:#00eaff;
+  box-shadow:0 0 6px #00eaff55 inset;
+}
+
+.form-premium button{
+  width:100%;
+  padding:10px;
+  border-radius:6px;
+  border:1px solid #006688;
+  background:#001f2e;
+  color:#00eaff;
+  cursor:pointer;
+  box-shadow:0 0 8px #0099bb;
+}
+
+.form-premium button:hover{
+  background:#003547;
+  box-shadow:0 0 14px #00eaff;
+}
+
+.wave{
+ width:6px;
+ height:20px;
+ background:#00eaff;
+ animation:wave 1s infinite ease-in-out;
+ border-radius:4px;
+}
+
+.wave:nth-child(2){animation-delay:0.1s;}
+.wave:nth-child(3){animation-delay:0.2s;}
+.wave:nth-child(4){animation-delay:0.3s;}
+.wave:nth-child(5){animation-delay:0.4s;}
+/* ========================= */
+/* 🎤 DICTADO PRO */
+/* ========================= */
+
+/* Panel de texto acumulado durante dictado */
+#dictadoPanel{
+  position:fixed;
+  bottom:62px;
+  left:0; right:0;
+  max-height:180px;
+  overflow-y:auto;
+  background:#00060d;
+  border-top:2px solid #ff003366;
+  padding:10px 16px;
+  font-size:15px;
+  color:#ffffff;
+  line-height:1.7;
+  z-index:25;
+  display:none;
+  white-space:pre-wrap;
+  word-break:break-word;
+  scrollbar-width:thin;
+  scrollbar-color:#ff003366 transparent;
+}
+#dictadoPanel::-webkit-scrollbar{ width:4px; }
+#dictadoPanel::-webkit-scrollbar-thumb{ background:#ff003366; border-radius:4px; }
+
+body.day #dictadoPanel{
+  background:#f5f5f5;
+  color:#111;
+  border-color:#cc000055;
+}
+
+#dictadoBtn.activo{
+  background:#ff0033 !important;
+  color:#fff !important;
+  border:1px solid #ff3355 !important;
+  box-shadow:0 0 20px #ff0033 !important;
+  animation:pulseDictado 1s infinite;
+}
+
+@keyframes pulseDictado{
+  0%{transform:scale(1);}
+  50%{transform:scale(1.06);}
+  100%{transform:scale(1);}
+}
+
+#dictadoEstado{
+  box-shadow:0 0 20px #ff0033;
+  animation:pulseEstado 1s infinite;
+}
+
+@keyframes pulseEstado{
+  0%{opacity:1;}
+  50%{opacity:0.6;}
+  100%{opacity:1;}
+}
+
+@keyframes wave{
+0%,100%{height:10px;}
+50%{height:40px;}
+}
+
+/* --- EDITOR / GENERADOR DE IMÁGENES --- */
+  #btnAplicarEdicion:disabled, #btnGenerarImagen:disabled { opacity:0.5; cursor:not-allowed; }
+  .img-box{
+    width:100%;
+    height:280px;
+    object-fit:contain;
+    border-radius:10px;
+    border:1px solid #00eaff22;
+    background:#001122;
+  }
+  .img-placeholder{
+    align-items:center;
+    justify-content:center;
+    height:280px;
+    border-radius:10px;
+    border:2px dashed #00eaff22;
+    background:#001122;
+    color:#00eaff33;
+    font-size:13px;
+    text-align:center;
+    padding:0 12px;
+    box-sizing:border-box;
+  }
+
+</style>
+</head>
+
+<body>
+<!-- HEADER -->
+<div id="header">
+  <div id="leftButtons">
+    <img src="/static/logo.png" id="logo" onclick="logoClick()" alt="logo">
+
+    <div id="premiumContainer" style="position:relative; margin-left:12px;">
+      <button id="dayNightBtn" onclick="toggleDayNight()">🌙</button>
+
+      <button id="premiumBtn" onclick="togglePremiumMenu()">
+          💎 Pasar a Premium
+      </button>
+
+      <div id="premiumMenu"
+           style="display:none; position:absolute; top:36px; left:0;
+                  background:#001f2e; border:1px solid #003547;
+                  border-radius:6px; padding:6px;
+                  box-shadow:0 6px 16px rgba(0,0,0,0.6); z-index:100;">
+        <button onclick="irPremium('mensual')">💎 Pago Mensual</button>
+        <button onclick="irPremium('anual')">💎 Pago Anual</button>
+      </div>
+    </div>
+  </div>
+
+  <div id="rightButtons">
+    <div class="separator"></div>
+    <button onclick="detenerVoz()">⏹️ Detener voz</button>
+    <button id="vozBtn" onclick="toggleVoz()">🔊 Voz activada</button>
+    <button id="borrarBtn" onclick="borrarPantalla()">🧹 Borrar pantalla</button>
+    <button onclick="verHistorial()">🗂️ Historial</button>
+  </div>
+</div>
+
+<!-- CHAT -->
+<div id="chat" role="log" aria-live="polite"></div>
+
+<!-- MODAL FLOTANTE EDITOR DE IMAGEN -->
+<div id="editorImagen" style="display:none;position:fixed;inset:0;z-index:9998;background:rgba(0,8,20,0.88);align-items:center;justify-content:center;padding:12px;box-sizing:border-box;">
+  <div style="background:linear-gradient(135deg,#001a2e,#002a44);border:1px solid #00eaff55;border-radius:18px;box-shadow:0 0 40px #00eaff33;width:100%;max-width:900px;max-height:94vh;overflow-y:auto;padding:22px;box-sizing:border-box;">
+
+    <!-- Título y botón cerrar -->
+    <div style="display:flex;align-items:center;justify-content:space-between;margin-bottom:16px;">
+      <span style="color:#00eaff;font-size:17px;font-weight:700;text-shadow:0 0 8px #00eaff;letter-spacing:1px;">✏️ Editor de Imagen IA</span>
+      <button onclick="cancelarEdicionImagen()" style="background:transparent;border:1px solid #ff444466;color:#ff6666;border-radius:8px;padding:6px 16px;font-size:15px;cursor:pointer;">✕ Cerrar</button>
+    </div>
+
+    <!-- Original | Resultado -->
+    <div style="display:flex;gap:12px;flex-wrap:wrap;margin-bottom:14px;">
+      <div style="flex:1;min-width:200px;text-align:center;">
+        <div style="color:#00eaff66;font-size:11px;letter-spacing:1px;text-transform:uppercase;margin-bottom:6px;">Original</div>
+        <img id="previewImagen" src="" class="img-box" style="display:none;">
+        <div id="placeholderOrig" class="img-placeholder" style="display:flex;">Sin imagen</div>
+      </div>
+      <div style="flex:1;min-width:200px;text-align:center;">
+        <div style="color:#00eaff66;font-size:11px;letter-spacing:1px;text-transform:uppercase;margin-bottom:6px;">Resultado</div>
+        <img id="resultadoImagen" src="" class="img-box" style="display:none;">
+        <div id="placeholderResult" class="img-placeholder" style="display:flex;">Aquí aparecerá la edición</div>
+      </div>
+    </div>
+
+    <!-- Prompt -->
+    <textarea id="promptImagen" placeholder="Describí qué querés cambiar... (ej: cambiá el fondo por un bosque, poné lentes al personaje)" style="width:100%;height:75px;background:#001122;color:#00eaff;border:1px solid #006688;border-radius:10px;padding:10px 12px;font-size:14px;resize:vertical;box-sizing:border-box;outline:none;font-family:'Segoe UI',sans-serif;"></textarea>
+
+    <!-- Botones -->
+    <div style="display:flex;gap:10px;margin-top:14px;flex-wrap:wrap;align-items:center;">
+      <button id="btnAplicarEdicion" type="button" onclick="editarImagenActual()" style="padding:11px 24px;background:linear-gradient(135deg,#005577,#007799);color:#fff;border:none;border-radius:10px;font-size:15px;font-weight:600;cursor:pointer;box-shadow:0 0 14px #00eaff44;">✨ Aplicar con IA</button>
+      <a id="btnDescargarEdicion" download="foschi_editada.png" style="display:none;padding:11px 18px;background:linear-gradient(135deg,#004400,#006600);color:#00ff88;border:1px solid #00ff8844;border-radius:10px;font-size:14px;font-weight:600;text-decoration:none;cursor:pointer;">⬇️ Descargar</a>
+      <span id="editorEstado" style="display:none;align-items:center;gap:8px;color:#00eaff88;font-size:13px;">
+        <span style="display:inline-block;width:15px;height:15px;border:2px solid #00eaff33;border-top-color:#00eaff;border-radius:50%;animation:spinImg 0.7s linear infinite;"></span>
+        Procesando con IA...
+      </span>
+    </div>
+
+  </div>
+</div>
+
+<!-- MODAL FLOTANTE GENERADOR DE IMAGEN -->
+<div id="generadorImagen" style="display:none;position:fixed;inset:0;z-index:9998;background:rgba(0,8,20,0.88);align-items:center;justify-content:center;padding:12px;box-sizing:border-box;">
+  <div style="background:linear-gradient(135deg,#001a2e,#002a44);border:1px solid #00eaff55;border-radius:18px;box-shadow:0 0 40px #00eaff33;width:100%;max-width:900px;max-height:94vh;overflow-y:auto;padding:22px;box-sizing:border-box;">
+
+    <!-- Título y botón cerrar -->
+    <div style="display:flex;align-items:center;justify-content:space-between;margin-bottom:16px;">
+      <span style="color:#00eaff;font-size:17px;font-weight:700;text-shadow:0 0 8px #00eaff;letter-spacing:1px;">🎨 Generador de Imagen IA</span>
+      <button onclick="cancelarGeneradorImagen()" style="background:transparent;border:1px solid #ff444466;color:#ff6666;border-radius:8px;padding:6px 16px;font-size:15px;cursor:pointer;">✕ Cerrar</button>
+    </div>
+
+    <!-- Resultado -->
+    <div style="text-align:center;margin-bottom:14px;">
+      <div style="color:#00eaff66;font-size:11px;letter-spacing:1px;text-transform:uppercase;margin-bottom:6px;">Resultado</div>
+      <img id="resultadoGenerador" src="" class="img-box" style="display:none;">
+      <div id="placeholderGenerador" class="img-placeholder" style="display:flex;">Aquí aparecerá tu imagen generada</div>
+    </div>
+
+    <!-- Prompt -->
+    <textarea id="promptGenerador" placeholder="Describí la imagen que querés generar... (ej: un atardecer en la playa, estilo realista)" style="width:100%;height:75px;background:#001122;color:#00eaff;border:1px solid #006688;border-radius:10px;padding:10px 12px;font-size:14px;resize:vertical;box-sizing:border-box;outline:none;font-family:'Segoe UI',sans-serif;"></textarea>
+
+    <!-- Botones -->
+    <div style="display:flex;gap:10px;margin-top:14px;flex-wrap:wrap;align-items:center;">
+      <button id="btnGenerarImagen" type="button" onclick="generarImagenIA()" style="padding:11px 24px;background:linear-gradient(135deg,#005577,#007799);color:#fff;border:none;border-radius:10px;font-size:15px;font-weight:600;cursor:pointer;box-shadow:0 0 14px #00eaff44;">✨ Generar con IA</button>
+      <a id="btnDescargarGenerador" download="foschi_generada.png" style="display:none;padding:11px 18px;background:linear-gradient(135deg,#004400,#006600);color:#00ff88;border:1px solid #00ff8844;border-radius:10px;font-size:14px;font-weight:600;text-decoration:none;cursor:pointer;">⬇️ Descargar</a>
+      <span id="generadorEstado" style="display:none;align-items:center;gap:8px;color:#00eaff88;font-size:13px;">
+        <span style="display:inline-block;width:15px;height:15px;border:2px solid #00eaff33;border-top-color:#00eaff;border-radius:50%;animation:spinImg 0.7s linear infinite;"></span>
+        Generando con IA...
+      </span>
+    </div>
+
+  </div>
+</div>
+
+<!-- MODAL FLOTANTE GENERADOR DE PRESENTACIONES -->
+<div id="generadorPresentacion" style="display:none;position:fixed;inset:0;z-index:9998;background:rgba(0,8,20,0.88);align-items:center;justify-content:center;padding:12px;box-sizing:border-box;">
+  <div style="background:linear-gradient(135deg,#001a2e,#002a44);border:1px solid #00eaff55;border-radius:18px;box-shadow:0 0 40px #00eaff33;width:100%;max-width:640px;max-height:94vh;overflow-y:auto;padding:22px;box-sizing:border-box;">
+
+    <!-- Título y botón cerrar -->
+    <div style="display:flex;align-items:center;justify-content:space-between;margin-bottom:16px;">
+      <span style="color:#00eaff;font-size:17px;font-weight:700;text-shadow:0 0 8px #00eaff;letter-spacing:1px;">🖥️ Crear Presentación con IA</span>
+      <button onclick="cerrarGeneradorPresentacion()" style="background:transparent;border:1px solid #ff444466;color:#ff6666;border-radius:8px;padding:6px 16px;font-size:15px;cursor:pointer;">✕ Cerrar</button>
+    </div>
+
+    <div id="presInfoDoc" style="display:none;background:#00223a;border:1px solid #00eaff33;border-radius:10px;padding:10px 12px;color:#00eaff;font-size:13px;margin-bottom:12px;"></div>
+
+    <label style="color:#00eaff99;font-size:12px;letter-spacing:1px;text-transform:uppercase;display:block;margin-bottom:6px;">Título (opcional)</label>
+    <input id="presTitulo" type="text" placeholder="Ej: Plan de marketing 2026" style="width:100%;background:#001122;color:#00eaff;border:1px solid #006688;border-radius:10px;padding:10px 12px;font-size:14px;box-sizing:border-box;outline:none;font-family:'Segoe UI',sans-serif;margin-bottom:12px;">
+
+    <label style="color:#00eaff99;font-size:12px;letter-spacing:1px;text-transform:uppercase;display:block;margin-bottom:6px;">Tema / qué querés que incluya</label>
+    <textarea id="presTema" placeholder="Describí el tema, el público y los puntos clave que querés tratar... (si subiste un documento, esto se usa como enfoque opcional)" style="width:100%;height:90px;background:#001122;color:#00eaff;border:1px solid #006688;border-radius:10px;padding:10px 12px;font-size:14px;resize:vertical;box-sizing:border-box;outline:none;font-family:'Segoe UI',sans-serif;margin-bottom:12px;"></textarea>
+
+    <div style="display:flex;gap:12px;flex-wrap:wrap;margin-bottom:12px;">
+      <div style="flex:1;min-width:140px;">
+        <label style="color:#00eaff99;font-size:12px;letter-spacing:1px;text-transform:uppercase;display:block;margin-bottom:6px;">Cantidad de diapositivas</label>
+        <input id="presNumSlides" type="number" min="3" max="20" value="8" style="width:100%;background:#001122;color:#00eaff;border:1px solid #006688;border-radius:10px;padding:10px 12px;font-size:14px;box-sizing:border-box;outline:none;font-family:'Segoe UI',sans-serif;">
+      </div>
+      <div style="flex:1;min-width:140px;display:flex;align-items:center;">
+        <label style="color:#00eaff;font-size:14px;display:flex;align-items:center;gap:8px;cursor:pointer;margin-top:18px;">
+          <input id="presIncluirImagenes" type="checkbox" checked style="width:18px;height:18px;cursor:pointer;">
+          🎨 Generar imágenes con IA
+        </label>
+      </div>
+    </div>
+
+    <label style="color:#00eaff99;font-size:12px;letter-spacing:1px;text-transform:uppercase;display:block;margin-bottom:6px;">Videos cortos (opcional, .mp4)</label>
+    <input id="presVideos" type="file" accept="video/mp4,video/*" multiple style="width:100%;color:#00eaff;font-size:13px;margin-bottom:6px;">
+    <div style="color:#00eaff66;font-size:12px;margin-bottom:14px;">Si subís videos, se insertan en las primeras diapositivas en lugar de las imágenes generadas.</div>
+
+    <!-- Botones -->
+    <div style="display:flex;gap:10px;margin-top:6px;flex-wrap:wrap;align-items:center;">
+      <button id="btnGenerarPresentacion" type="button" onclick="generarPresentacionIA()" style="padding:11px 24px;background:linear-gradient(135deg,#005577,#007799);color:#fff;border:none;border-radius:10px;font-size:15px;font-weight:600;cursor:pointer;box-shadow:0 0 14px #00eaff44;">✨ Generar presentación</button>
+      <span id="presEstado" style="display:none;align-items:center;gap:8px;color:#00eaff88;font-size:13px;">
+        <span style="display:inline-block;width:15px;height:15px;border:2px solid #00eaff33;border-top-color:#00eaff;border-radius:50%;animation:spinImg 0.7s linear infinite;"></span>
+        Generando presentación con IA... esto puede tardar 1-2 minutos, no cierres esta ventana.
+      </span>
+    </div>
+
+  </div>
+</div>
+<div id="voiceWave" style="
+position:fixed;
+bottom:110px;
+left:50%;
+transform:translateX(-50%);
+display:none;
+align-items:center;
+gap:4px;
+z-index:999;
+">
+<div class="wave"></div>
+<div class="wave"></div>
+<div class="wave"></div>
+<div class="wave"></div>
+<div class="wave"></div>
+<button onclick="detenerConversacion()" title="Salir del modo conversación" style="margin-left:10px;background:#ff0000;color:#fff;border:none;border-radius:50%;width:28px;height:28px;font-size:14px;font-weight:bold;line-height:1;cursor:pointer;display:flex;align-items:center;justify-content:center;box-shadow:0 0 10px #ff000066;">✕</button>
+</div>
+
+<div id="dictadoEstado" style="
+ position:fixed;
+ bottom:70px;
+ right:10px;
+ background:#ff0000;
+ color:white;
+ padding:6px 10px;
+ border-radius:6px;
+ display:none;
+ font-weight:bold;
+ z-index:999;">
+🎤 Dictado activo
+</div>
+<!-- MENÚ ADJUNTOS (overlay fuera de la barra) -->
+<div id="adjuntos_menu" aria-hidden="true">
+  <button onclick="toggleModoConversacion()">🧠 Modo conversación</button>
+  <button onclick="checkPremium('audio')">🎵 Audio (mp3/wav) a Texto</button>
+  <button onclick="checkPremium('doc')">📄 Analizar Documento</button>
+  <button onclick="abrirDictadoDesdeMenu()">🎤 Dictado</button>
+  <button onclick="checkPremium('ocr')">
+📷 Imagen a Word
+</button>
+
+<button onclick="checkPremium('editar_imagen')">
+🖼️ Editar Imagen
+</button>
+
+<button onclick="abrirGeneradorImagen()">
+🎨 Generar Imagen
+</button>
+
+<button onclick="abrirGeneradorPresentacion()">
+🖥️ Crear Presentación
+</button>
+
+<button onclick="checkIngles()">
+🎓 Academia de Inglés
+</button>
+</div>
+
+<!-- INPUTS OCULTOS -->
+<input id="audioInput" class="hidden_file_input" type="file" accept=".mp3,audio/*,.wav" />
+<input
+  id="imagenInput"
+  class="hidden_file_input"
+  type="file"
+  accept="image/*"
+/>
+<input id="archivo_pdf_word" class="hidden_file_input" type="file" accept=".pdf,.docx" />
+
+<!-- BARRA DE ENTRADA -->
+<div id="inputBar">
+
+  <!-- Clip — visible cuando NO está dictando -->
+  <div id="clipBtn" title="Adjuntar" onclick="toggleAdjuntosMenu()">
+    📎
+    <span id="adjuntosHint">👉 Funciones Premium acá</span>
+  </div>
+
+  <!-- Input de texto -->
+  <input type="text" id="mensaje" placeholder="Escribí tu mensaje o hablá" />
+
+  <!-- Botones normales — se ocultan durante dictado -->
+  <div id="botonesNormales" style="display:flex;gap:6px;align-items:center;">
+    <button onclick="checkDailyLimit()">Enviar</button>
+    <button onclick="hablar()">🎤 Hablar</button>
+  </div>
+
+  <!-- Botones dictado — solo visibles durante dictado -->
+  <div id="botonesDictado" style="display:none;gap:6px;align-items:center;">
+    <button id="dictadoBtn" onclick="toggleDictado()">⏸️ Pausar</button>
+    <button id="finalizarDictadoBtn"
+      onclick="finalizarDictadoManual()"
+      style="background:#ff0033;color:white;border:1px solid #ff5577;">
+      ✅ Finalizar
+    </button>
+    <button onclick="cancelarDictado()"
+      style="background:#333;color:#ccc;border:1px solid #555;">
+      ❌ Cancelar
+    </button>
+  </div>
+
+</div>
+
+<script>
+// --- Variables y funciones generales ---
+// Los datos del usuario llegan de /api/bootstrap (la página es la misma
+// para todos y el navegador la cachea; ver aplicarBootstrap más abajo).
+let usuario_id="";
+let documentoActual = null;
+let textoDocumento = "";
+let vozActiva=true,audioActual=null,mensajeActual=null;
+let modoConversacion = false;
+let escuchandoContinuo = false;
+let recognitionConversacion = null;
+let silencioTimer=null;
+let modoImagen = "";
+let imagenActualArchivo = null;
+let imagenActualBase64 = null;
+
+function toggleModoConversacion(){
+
+  if(!isPremium && !isSuper){
+    alert("🔒 El modo conversación es Premium");
+    return;
+  }
+
+  if(!modoConversacion){
+    iniciarConversacion();
+  }else{
+    detenerConversacion();
+  }
+
+}
+
+function iniciarConversacion(){
+
+  if(!('webkitSpeechRecognition' in window)){
+    alert("Tu navegador no soporta conversación por voz");
+    return;
+  }
+
+  document.getElementById("voiceWave").style.display="flex";
+
+
+  const Rec = window.SpeechRecognition || window.webkitSpeechRecognition;
+
+  recognitionConversacion = new Rec();
+
+  recognitionConversacion.lang = "es-AR";
+  recognitionConversacion.continuous = true;
+  recognitionConversacion.interimResults = false;
+
+  modoConversacion = true;
+  escuchandoContinuo = true;
+
+  agregar("🧠 Modo conversación activado","ai");
+
+recognitionConversacion.onresult = function(event){
+
+  let texto = event.results[event.results.length-1][0].transcript;
+  if(texto.length < 3) return;
+
+  if(texto.trim() === "") return;
+
+  if(audioActual){
+  audioActual.pause();
+  audioActual.currentTime = 0;
+}
+  document.getElementById("mensaje").value = texto;
+
+  enviar();
+
+  // 👇 DETECTOR DE SILENCIO
+  clearTimeout(silencioTimer);
+
+  silencioTimer = setTimeout(()=>{
+     console.log("Silencio detectado");
+  },2000);
+
+};
+
+  recognitionConversacion.onend = function(){
+
+  if(modoConversacion && !audioActual){
+    safeStartRecognition();
+  }
+
+};
+
+  safeStartRecognition();
+
+}
+
+// Evita "InvalidStateError: recognition has already started"
+// cuando varios eventos intentan reiniciar el reconocimiento al mismo tiempo
+function safeStartRecognition(){
+  if(!recognitionConversacion) return;
+  try{
+    recognitionConversacion.start();
+  }catch(e){
+    // ya estaba escuchando, no hacemos nada
+  }
+}
+
+function detenerConversacion(){
+
+  modoConversacion = false;
+  escuchandoContinuo = false;
+
+  if(recognitionConversacion){
+    recognitionConversacion.stop();
+    recognitionConversacion = null;
+  }
+
+  document.getElementById("voiceWave").style.display = "none";
+
+  agregar("🛑 Modo conversación desactivado","ai");
+
+}
+
+let MAX_NO_PREMIUM = 5;
+let isPremium = false;
+const hoy = new Date().toISOString().slice(0,10); // YYYY-MM-DD
+let preguntasHoy = parseInt(
+  localStorage.getItem("preguntasHoy_" + hoy) || "0"
+);
+
+let isSuper = false;
+let rolUsuario = "";
+let nivelUsuario = 0;
+
+function aplicarBootstrap(datos){
+  usuario_id = datos.usuario_id || "";
+  isPremium = !!datos.premium;
+  isSuper = !!datos.is_super;
+  rolUsuario = datos.rol || "";
+  nivelUsuario = datos.nivel || 0;
+
+  if(isPremium){
+    document.getElementById("premiumBtn").textContent = "💎 Premium activo";
+    const menu = document.getElementById("premiumMenu");
+    if(menu) menu.remove();
+    const hint = document.getElementById("adjuntosHint");
+    if(hint) hint.remove();
+  }
+}
+
+const bootstrapListo = fetch("/api/bootstrap", { credentials:"same-origin" })
+  .then(r=>r.json())
+  .then(aplicarBootstrap)
+  .catch(e=>console.error("Error cargando datos del usuario:", e));
+
+function logoClick(){ alert("FOSCHI NUNCA MUERE, TRASCIENDE..."); }
+function toggleVoz(estado=null){ vozActiva=estado!==null?estado:!vozActiva; document.getElementById("vozBtn").textContent=vozActiva?"🔊 Voz activada":"🔇 Silenciada"; }
+function detenerVoz(){ if(audioActual){ audioActual.pause(); audioActual.currentTime=0; audioActual.src=""; audioActual.load(); audioActual=null; if(mensajeActual) mensajeActual.classList.remove("playing"); mensajeActual=null; } }
+
+function agregar(msg,cls,imagenes=[]){
+  let c=document.getElementById("chat"),div=document.createElement("div");
+  div.className="message "+cls; div.innerHTML=msg;
+  c.appendChild(div);
+  setTimeout(()=>div.classList.add("show"),50);
+  imagenes.forEach(url=>{ let img=document.createElement("img"); img.src=url; div.appendChild(img); });
+  c.scroll({top:c.scrollHeight,behavior:"smooth"});
+  if(cls==="ai") hablarTexto(msg,div);
+  return div;
+}
+
+function checkDailyLimit(){
+  if(!isPremium && !isSuper && preguntasHoy >= MAX_NO_PREMIUM){
+    alert(`⚠️ Has alcanzado el límite de ${MAX_NO_PREMIUM} preguntas diarias. Pasá a Premium para más.`);
+    return;
+  }
+
+  enviar();
+
+  if(!isPremium){
+    preguntasHoy++;
+    localStorage.setItem("preguntasHoy_" + hoy, preguntasHoy);
+  }
+}
+
+function enviar(){
+  let msg=document.getElementById("mensaje").value.trim(); 
+  if(!msg) return;
+
+  agregar(msg,"user"); 
+
+  document.getElementById("mensaje").value="";
+    // ============================
+  // ❌ SALIR DEL MODO DOCUMENTO
+  // ============================
+
+  if(
+    msg.toLowerCase().includes("salir del documento") ||
+    msg.toLowerCase().includes("cerrar archivo") ||
+    msg.toLowerCase().includes("modo normal")
+  ){
+
+    salirModoDocumento();
+
+    return;
+  }
+
+  fetch("/preguntar",{
+    method:"POST",
+    headers:{
+      "Content-Type":"application/json"
+    },
+    body:JSON.stringify({
+      mensaje: msg,
+      usuario_id: usuario_id,
+      doc_id: documentoActual,
+      preguntar_doc: modoPreguntasDocumento
+    })
+  })
+
+  .then(r=>r.json())
+
+  .then(data=>{
+
+    agregar(data.texto,"ai",data.imagenes);
+
+    if(data.borrar_historial){
+      document.getElementById("chat").innerHTML="";
+    }
+
+  })
+
+  .catch(e=>{
+
+    agregar("Error al comunicarse con el servidor.","ai");
+
+    console.error(e);
+
+  });
+}
+
+document.getElementById("mensaje").addEventListener("keydown",e=>{ if(e.key==="Enter"){ e.preventDefault(); checkDailyLimit(); } });
+
+// Saca emojis del texto para que la voz no los lea (ej: "manos en oración", "diamante", "mano saludando")
+function quitarEmojisParaVoz(texto){
+  return texto
+    .replace(/[\\u{1F1E6}-\\u{1F1FF}\\u{1F300}-\\u{1FAFF}\\u{2190}-\\u{21FF}\\u{2300}-\\u{27BF}\\u{2B00}-\\u{2BFF}\\u{FE0F}\\u{200D}\\u{20E3}]/gu, "")
+    .replace(/\s{2,}/g, " ")
+    .trim();
+}
+
+function hablarTexto(texto, div=null){
+
+  if(!vozActiva) return;
+
+  // 🛑 detener escucha solo si está en modo conversación
+  if(modoConversacion && recognitionConversacion){
+    recognitionConversacion.stop();
+  }
+
+  detenerVoz();
+
+  if(mensajeActual) mensajeActual.classList.remove("playing");
+  if(div) div.classList.add("playing");
+  mensajeActual = div;
+
+  const textoParaVoz = quitarEmojisParaVoz(texto);
+  audioActual = new Audio("/tts?texto=" + encodeURIComponent(textoParaVoz));
+  audioActual.playbackRate = 1.25;
+
+  audioActual.onended = () => {
+
+    if(mensajeActual) mensajeActual.classList.remove("playing");
+    mensajeActual = null;
+
+    // 🎤 volver a escuchar cuando termina
+    if(modoConversacion && recognitionConversacion){
+      safeStartRecognition();
+    }
+
+  };
+
+  audioActual.play();
+}
+
+function togglePremiumMenu(){
+  if(isPremium) return;
+
+  const menu = document.getElementById("premiumMenu");
+  if(!menu) return;
+
+  menu.style.display = (menu.style.display === "block") ? "none" : "block";
+
+  if(menu.style.display === "block"){
+    setTimeout(() => {
+      window.addEventListener("click", closePremiumMenuOnClickOutside);
+    }, 50);
+  }
+}
+
+function closePremiumMenuOnClickOutside(e){
+  const menu = document.getElementById("premiumMenu");
+  const btn = document.getElementById("premiumBtn");
+  if(!menu.contains(e.target) && !btn.contains(e.target)){
+    menu.style.display="none";
+    window.removeEventListener('click', closePremiumMenuOnClickOutside);
+  }
+}
+
+function irPremium(tipo){
+  fetch(`/premium?tipo=${tipo}`)
+    .then(r => {
+      if(r.status === 401){
+        openAuth();
+        return null;
+      }
+      return r.json();
+    })
+    .then(data => {
+      if(!data) return;
+      if(data.init_point){
+        window.location.href = data.init_point;
+      }
+    })
+    .catch(err => console.error(err));
+}
+
+function checkPremium(tipo){
+
+  if(!isPremium){
+    alert("⚠️ Esta función requiere Premium. Pasá a Premium para usarla.");
+    return;
+  }
+
+  if(tipo === "ocr"){
+    modoImagen = "ocr";
+    document.getElementById("imagenInput").click();
+    return;
+  }
+
+  if(tipo === "editar_imagen"){
+
+  modoImagen = "editar";
+
+  document.getElementById(
+    "imagenInput"
+  ).click();
+
+  return;
+}
+
+  if(tipo === "audio"){
+    document.getElementById("audioInput").click();
+    return;
+  }
+
+  if(tipo === "doc"){
+    document.getElementById("archivo_pdf_word").click();
+    return;
+  }
+
+}
+
+let adjuntosInactivityTimer = null;
+
+function iniciarTemporizadorInactividadAdjuntos(){
+  // Se reinicia cada vez que el mouse se mueve mientras el menú está abierto
+  document.addEventListener("mousemove", resetAdjuntosInactivityTimer);
+  resetAdjuntosInactivityTimer();
+}
+
+function detenerTemporizadorInactividadAdjuntos(){
+  clearTimeout(adjuntosInactivityTimer);
+  adjuntosInactivityTimer = null;
+  document.removeEventListener("mousemove", resetAdjuntosInactivityTimer);
+}
+
+function resetAdjuntosInactivityTimer(){
+  clearTimeout(adjuntosInactivityTimer);
+  adjuntosInactivityTimer = setTimeout(cerrarAdjuntosMenu, 6000); // 6s sin mover el mouse
+}
+
+function cerrarAdjuntosMenu(){
+  const m = document.getElementById("adjuntos_menu");
+  if(m) m.style.display = "none";
+  window.removeEventListener('click', closeMenuOnClickOutside);
+  detenerTemporizadorInactividadAdjuntos();
+}
+
+function toggleAdjuntosMenu(){
+  // Una vez que el usuario abre el menú, ya no necesita el aviso
+  const hint = document.getElementById("adjuntosHint");
+  if(hint) hint.style.display = "none";
+
+  const m = document.getElementById("adjuntos_menu");
+  const seAbre = m.style.display !== "block";
+  m.style.display = seAbre ? "block" : "none";
+
+  if(seAbre){
+    m.querySelectorAll("button").forEach(b => b.classList.remove("opcion-seleccionada"));
+    setTimeout(()=>window.addEventListener('click', closeMenuOnClickOutside),50);
+    iniciarTemporizadorInactividadAdjuntos();
+  } else {
+    detenerTemporizadorInactividadAdjuntos();
+  }
+}
+
+// Cierra el menú de adjuntos automáticamente si el mouse se va de encima
+document.getElementById("adjuntos_menu").addEventListener("mouseleave", cerrarAdjuntosMenu);
+
+// Ilumina la opción elegida y luego cierra el menú
+document.getElementById("adjuntos_menu").addEventListener("click", function(e){
+  const btn = e.target.closest("button");
+  if(!btn) return;
+
+  document.querySelectorAll("#adjuntos_menu button").forEach(b => b.classList.remove("opcion-seleccionada"));
+  btn.classList.add("opcion-seleccionada");
+
+  setTimeout(cerrarAdjuntosMenu, 180);
+});
+function closeMenuOnClickOutside(e){
+  const menu = document.getElementById("adjuntos_menu");
+  const clip = document.getElementById("clipBtn");
+  if(!menu.contains(e.target) && !clip.contains(e.target)){
+    menu.style.display="none";
+    window.removeEventListener('click', closeMenuOnClickOutside);
+    detenerTemporizadorInactividadAdjuntos();
+  }
+}
+function abrirDictadoDesdeMenu(){
+  toggleDictado();
+}
+
+function checkIngles(){
+  if(!isPremium && !isSuper){
+    alert("⚠️ La Academia de Inglés es una función Premium. Activá Foschi IA Premium para usarla.");
+    return;
+  }
+  window.location.href = "/ingles";
+}
+
+function verHistorial(){
+  fetch("/historial/"+usuario_id).then(r=>r.json()).then(data=>{
+    document.getElementById("chat").innerHTML="";
+    if(data.length===0){agregar("No hay historial todavía.","ai");return;}
+    data.slice(-20).forEach(e=>{ agregar(`<small>${e.fecha}</small><br>${e.usuario}`,"user"); agregar(`<small>${e.fecha}</small><br>${e.foschi}`,"ai"); });
+  });
+}
+
+function borrarPantalla(){
+    detenerVoz(); 
+    document.getElementById("chat").innerHTML = ""; 
+}
+
+function openAuth() {
+  document.getElementById("authModal").style.display = "block";
+}
+
+function closeAuth() {
+  document.getElementById("authModal").style.display = "none";
+}
+
+async function login() {
+  const email = authEmail.value;
+  const password = authPassword.value;
+
+  const r = await fetch("/auth/login", {
+    method: "POST",
+    headers: {"Content-Type":"application/json"},
+    body: JSON.stringify({email, password})
+  });
+
+  const j = await r.json();
+  if (j.ok) location.reload();
+  else authMsg.innerText = j.msg;
+}
+
+async function register() {
+  const email = authEmail.value;
+  const password = authPassword.value;
+
+  const r = await fetch("/auth/register", {
+    method: "POST",
+    headers: {"Content-Type":"application/json"},
+    body: JSON.stringify({email, password})
+  });
+
+  const j = await r.json();
+  if (j.ok) location.reload();
+  else authMsg.innerText = j.msg;
+}
+
+function hablar(){
+  if('webkitSpeechRecognition' in window || 'SpeechRecognition' in window){
+
+    const Rec = window.SpeechRecognition || window.webkitSpeechRecognition;
+    const recognition = new Rec();
+
+    recognition.lang='es-AR';
+    recognition.continuous=false;
+    recognition.interimResults=false;
+
+    recognition.onresult = function(event){
+
+      let textoReconocido = event.results[0][0].transcript;
+let txt = textoReconocido.toLowerCase();
+
+// 👉 ACTIVAR DICTADO
+if(txt.includes("activar dictado")){
+  iniciarDictado();
+  return;
+}
+
+// 👉 DESACTIVAR DICTADO
+if(txt.includes("desactivar dictado")){
+  detenerDictado();
+  return;
+}
+
+// ============================
+// BORRAR DESDE / HASTA
+// ============================
+
+let borrarMatch = txt.match(/borrar desde (.+) hasta (.+)/i);
+
+if(borrarMatch){
+
+  let desde = borrarMatch[1].trim();
+  let hasta = borrarMatch[2].trim();
+
+  let regex = new RegExp(
+    desde + "[\\s\\S]*?" + hasta,
+    "i"
+  );
+
+  let caja = document.getElementById("mensaje");
+
+  caja.value = caja.value.replace(regex, "");
+
+  alert("Texto eliminado");
+
+  return;
+}
+
+// ============================
+// CORREGIR PALABRA
+// ============================
+
+let corregirMatch = txt.match(
+  /corregir (.+) por (.+)/i
+);
+
+if(corregirMatch){
+
+  let original = corregirMatch[1].trim();
+  let nuevo = corregirMatch[2].trim();
+
+  let caja = document.getElementById("mensaje");
+
+  let regex = new RegExp(original, "gi");
+
+  caja.value = caja.value.replace(regex, nuevo);
+
+  alert("Texto corregido");
+
+  return;
+}
+
+// 👉 comportamiento normal
+let caja = document.getElementById("mensaje");
+
+caja.value += " " + txt;
+
+checkDailyLimit();
+    };
+
+    recognition.onerror = function(e){
+      console.log(e);
+      alert("Error reconocimiento de voz: " + e.error);
+    }
+
+    recognition.start();
+
+  }else{
+    alert("Tu navegador no soporta reconocimiento de voz.");
+  }
+}
+
+function chequearRecordatorios(){
+  fetch("/avisos",{ method:"POST", headers:{"Content-Type":"application/json"}, body:JSON.stringify({usuario_id}) })
+  .then(r=>r.json()).then(data=>{ if(Array.isArray(data) && data.length>0){ data.forEach(r=>{ agregar(`⏰ Tenés un recordatorio: ${r.motivo||"(sin motivo)"}`,"ai"); }); } }).catch(e=>console.error(e));
+}
+setInterval(chequearRecordatorios,10000);
+
+/* --- SALUDO INICIAL --- */
+window.onload = async function() {
+    await bootstrapListo;
+    let textoSaludo = isPremium
+      ? "🙏 ¡Gracias por ser parte de Foschi IA Premium! 💎 Ya tenés todas las funciones desbloqueadas."
+      : "👋 ¡Hola! Bienvenido a Foschi IA";
+
+    agregar(textoSaludo,"ai");
+};
+/* =============================== */
+/* === BOTÓN MODO DAY / NIGHT ==== */
+/* =============================== */
+function toggleDayNight(){
+  const body = document.body;
+  body.classList.toggle("day");
+
+  const btn = document.getElementById("dayNightBtn");
+  if(btn){
+    btn.textContent = body.classList.contains("day") ? "☀️" : "🌙";
+  }
+}
+// =====================
+// 🎤 DICTADO PRO
+// =====================
+
+let dictadoActivo = false;
+let dictadoPausado = false;
+let reconocimiento = null;
+let textoDictado = localStorage.getItem("dictado_guardado") || "";
+let ultimoTexto = "";
+let reinicioDictado = false;
+
+// Crea el panel de previsualización una sola vez
+function getPanelDictado(){
+  let p = document.getElementById("dictadoPanel");
+  if(!p){
+    p = document.createElement("div");
+    p.id = "dictadoPanel";
+    document.body.appendChild(p);
+  }
+  return p;
+}
+
+// Refresca lo que se ve en el panel:
+// texto confirmado (blanco) + lo que se está diciendo ahora (gris)
+function actualizarPanel(parcial){
+  const panel = getPanelDictado();
+  const enCurso = parcial
+    ? '<span style="color:#888">' + parcial + '</span>'
+    : "";
+  panel.innerHTML = textoDictado + enCurso;
+  panel.scrollTop = panel.scrollHeight;
+}
+
+function _resetUI(){
+  document.getElementById("dictadoEstado").style.display = "none";
+  document.getElementById("clipBtn").style.display = "flex";
+  document.getElementById("botonesNormales").style.display = "flex";
+  document.getElementById("botonesDictado").style.display = "none";
+  document.getElementById("mensaje").value = "";
+  document.getElementById("mensaje").placeholder = "Escribí tu mensaje o hablá";
+  const panel = getPanelDictado();
+  panel.style.display = "none";
+  panel.innerHTML = "";
+}
+
+function toggleDictado(){
+  if(!isPremium && !isSuper){
+    alert("🔒 Esta función es solo Premium");
+    return;
+  }
+  if(!dictadoActivo){ iniciarDictado(); return; }
+  if(dictadoActivo && !dictadoPausado){ pausarDictado(); return; }
+  if(dictadoActivo && dictadoPausado){ continuarDictado(); }
+}
+
+function iniciarDictado(){
+
+  const SpeechRecognition =
+    window.SpeechRecognition || window.webkitSpeechRecognition;
+
+  if(!SpeechRecognition){
+    alert("Tu navegador no soporta dictado");
+    return;
+  }
+
+  reconocimiento = new SpeechRecognition();
+  reconocimiento.lang = "es-AR";
+  reconocimiento.continuous = true;
+  reconocimiento.interimResults = true;
+  reconocimiento.maxAlternatives = 1;
+
+  dictadoActivo = true;
+  dictadoPausado = false;
+  reinicioDictado = true;
+  if(!textoDictado) textoDictado = "";
+  ultimoTexto = "";
+
+  // UI: estado visible, clip+botones normales ocultos, botones dictado visibles
+  document.getElementById("dictadoEstado").style.display = "block";
+  document.getElementById("dictadoEstado").innerText = "🎤 Dictando...";
+  document.getElementById("clipBtn").style.display = "none";
+  document.getElementById("botonesNormales").style.display = "none";
+  document.getElementById("botonesDictado").style.display = "flex";
+  document.getElementById("adjuntos_menu").style.display = "none";
+  document.getElementById("dictadoBtn").classList.add("activo");
+  document.getElementById("dictadoBtn").innerText = "⏸️ Pausar";
+
+  // Mostrar panel y limpiar input
+  const panel = getPanelDictado();
+  panel.style.display = "block";
+  actualizarPanel("");
+  document.getElementById("mensaje").value = "";
+  document.getElementById("mensaje").placeholder = "🎤 Dictando...";
+
+ reconocimiento.onresult = function(event){
+
+    let parcial = "";
+
+    for(let i = event.resultIndex; i < event.results.length; i++){
+
+      let trans = event.results[i][0].transcript.trim();
+
+      if(!trans) continue;
+
+      let txt = trans.toLowerCase();
+
+      // ============================
+      // 🗑️ BORRAR PALABRAS
+      // ============================
+
+      // borrar eso
+      if(
+        txt.includes("borrar eso") ||
+        txt.includes("borrar esa palabra")
+      ){
+
+        let palabras = textoDictado.trim().split(" ");
+
+        palabras.pop();
+
+        textoDictado = palabras.join(" ");
+
+        document.getElementById("mensaje").value = textoDictado;
+
+        return;
+      }
+
+      // ============================
+// 🗑️ BORRAR X PALABRAS
+// ============================
+
+if(
+  txt.includes("borrar") &&
+  txt.includes("palabras")
+){
+
+  let numero = 1;
+
+  // números escritos
+  if(txt.includes("dos")) numero = 2;
+  else if(txt.includes("tres")) numero = 3;
+  else if(txt.includes("cuatro")) numero = 4;
+  else if(txt.includes("cinco")) numero = 5;
+  else if(txt.includes("seis")) numero = 6;
+  else if(txt.includes("siete")) numero = 7;
+  else if(txt.includes("ocho")) numero = 8;
+  else if(txt.includes("nueve")) numero = 9;
+  else if(txt.includes("diez")) numero = 10;
+
+  // números normales
+  let match = txt.match(/\d+/);
+
+  if(match){
+    numero = parseInt(match[0]);
+  }
+
+  let palabras = textoDictado.trim().split(/\s+/);
+
+  palabras.splice(-numero);
+
+  textoDictado = palabras.join(" ");
+
+  document.getElementById("mensaje").value = textoDictado;
+
+  return;
+}
+
+      // ============================
+      // 🎤 COMANDOS DE VOZ
+      // ============================
+
+      if(txt.includes("pausar dictado"))   {
+        pausarDictado();
+        return;
+      }
+
+      if(txt.includes("continuar dictado")){
+        continuarDictado();
+        return;
+      }
+
+      if(txt.includes("finalizar dictado")){
+        finalizarDictado();
+        return;
+      }
+
+      if(
+        txt.includes("cancelar dictado") ||
+        txt.includes("borrar dictado") ||
+        txt.includes("borrar todo")
+      ){
+        cancelarDictado();
+        return;
+      }
+
+      trans = mejorarTextoDictado(trans);
+
+      if(event.results[i].isFinal){
+
+        // Evitar duplicado del último fragmento final
+        if(trans !== ultimoTexto){
+
+          ultimoTexto = trans;
+
+          textoDictado += trans + " ";
+
+          localStorage.setItem(
+            "dictado_guardado",
+            textoDictado
+          );
+        }
+
+      } else {
+
+        parcial += trans + " ";
+      }
+    }
+
+    // Refrescar panel con acumulado + parcial en gris
+    actualizarPanel(parcial);
+
+    // El input solo muestra conteo para no distraer
+    const palabras = textoDictado.trim().split(/\s+/).filter(Boolean).length;
+    document.getElementById("mensaje").placeholder =
+      "🎤 " + palabras + " palabra" + (palabras !== 1 ? "s" : "") + " dictada" + (palabras !== 1 ? "s" : "");
+  };
+
+  reconocimiento.onerror = function(e){
+    console.log("Error dictado:", e.error);
+    if(e.error === "not-allowed"){
+      alert("Micrófono bloqueado");
+      finalizarDictado();
+    }
+  };
+
+  reconocimiento.onend = function(){
+    if(dictadoActivo && !dictadoPausado && reinicioDictado){
+      try{ reconocimiento.start(); }catch(err){ console.log("Reinicio:", err); }
+    }
+  };
+
+  reconocimiento.start();
+}
+
+function pausarDictado(){
+  dictadoPausado = true;
+  if(reconocimiento){ reinicioDictado = false; reconocimiento.stop(); }
+  document.getElementById("dictadoEstado").innerText = "⏸️ Dictado pausado";
+  document.getElementById("dictadoBtn").innerText = "▶️ Continuar";
+}
+
+function continuarDictado(){
+  if(!dictadoActivo) return;
+  dictadoPausado = false;
+  reinicioDictado = true;
+  try{ reconocimiento.start(); }catch(err){ console.log("Continuar:", err); }
+  document.getElementById("dictadoEstado").innerText = "🎤 Dictando...";
+  document.getElementById("dictadoBtn").innerText = "⏸️ Pausar";
+}
+
+function finalizarDictado(){
+  dictadoActivo = false;
+  dictadoPausado = false;
+  reinicioDictado = false;
+
+  if(reconocimiento){ reconocimiento.stop(); reconocimiento = null; }
+
+  // ⚠️ Guardar el texto ANTES de limpiar las variables
+  const textoFinal = textoDictado.trim();
+  textoDictado = "";
+  ultimoTexto = "";
+  localStorage.removeItem("dictado_guardado");
+
+  _resetUI();
+
+  if(textoFinal.length > 0){
+    descargarWordDictado(textoFinal);
+  } else {
+    alert("No hay texto para guardar");
+  }
+}
+
+function finalizarDictadoManual(){
+  if(!textoDictado.trim()){ alert("No hay texto para guardar"); return; }
+  finalizarDictado();
+}
+
+function detenerDictado(){ finalizarDictado(); }
+
+function cancelarDictado(){
+  if(reconocimiento){ reconocimiento.stop(); }
+  dictadoActivo = false;
+  dictadoPausado = false;
+  reinicioDictado = false;
+  textoDictado = "";
+  ultimoTexto = "";
+  localStorage.removeItem("dictado_guardado");
+  _resetUI();
+  agregar("🗑️ Dictado cancelado", "ai");
+}
+
+// =====================
+// MEJORADOR DE TEXTO
+// =====================
+
+function mejorarTextoDictado(texto){
+
+  texto = texto.trim();
+
+  // =========================
+  // PUNTUACIÓN PROFESIONAL
+  // =========================
+
+  texto = texto.replace(/coma/gi, ",");
+  texto = texto.replace(/\bdos puntos\b/gi, ":");
+
+  texto = texto.replace(/punto y coma/gi, ";");
+  texto = texto.replace(/punto aparte/gi, ".");
+  texto = texto.replace(/punto seguido/gi, ".");
+  texto = texto.replace(/punto/gi, ".");
+
+  // preguntas
+  texto = texto.replace(/\babrir pregunta\b/gi, "¿");
+  texto = texto.replace(/\bcerrar pregunta\b/gi, "?");
+
+  // admiración
+  texto = texto.replace(/\babrir admiración\b/gi, "¡");
+  texto = texto.replace(/\bcerrar admiración\b/gi, "!");
+
+  // paréntesis
+  texto = texto.replace(/\babrir paréntesis\b/gi, "(");
+  texto = texto.replace(/\bcerrar paréntesis\b/gi, ")");
+
+  // nuevo párrafo
+  texto = texto.replace(/nuevo párrafo/gi, " ");
+
+  // =========================
+  // ESPACIOS
+  // =========================
+
+  // quitar espacios antes de signos
+  texto = texto.replace(/\s+([.,;:!?])/g, "$1");
+
+  // agregar espacio después de signos
+  texto = texto.replace(/([.,;:!?])([A-Za-zÁÉÍÓÚáéíóúÑñ])/g, "$1 $2");
+
+  // eliminar espacios dobles
+  texto = texto.replace(/\s{2,}/g, " ");
+
+  // =========================
+  // MAYÚSCULAS
+  // =========================
+
+  if(
+    textoDictado.trim() === "" ||
+    /[.!?]\s*$/.test(textoDictado.trim())
+  ){
+    texto =
+      texto.charAt(0).toUpperCase() +
+      texto.slice(1);
+  }
+
+  // mayúscula después de punto
+  texto = texto.replace(
+    /([.!?]\s*)([a-záéíóúñ])/g,
+    function(match, p1, p2){
+      return p1 + p2.toUpperCase();
+    }
+  );
+
+  return texto;
+}
+
+async function descargarWordDictado(texto){
+
+  try{
+
+    const r = await fetch("/dictado_word",{
+      method:"POST",
+      headers:{
+        "Content-Type":"application/json"
+      },
+      body:JSON.stringify({
+        texto:texto
+      })
+    });
+
+    if(!r.ok){
+
+      let errorTexto = await r.text();
+
+      console.log(errorTexto);
+
+      alert("Error generando Word");
+
+      return;
+    }
+
+    const blob = await r.blob();
+
+    const url =
+      window.URL.createObjectURL(blob);
+
+    const a = document.createElement("a");
+
+    a.href = url;
+
+    a.download =
+      "dictado_foschi.docx";
+
+    document.body.appendChild(a);
+
+    a.click();
+
+    a.remove();
+
+    window.URL.revokeObjectURL(url);
+
+    // ✅ LIMPIAR SOLO DESPUÉS
+    localStorage.removeItem(
+      "dictado_guardado"
+    );
+
+  }catch(err){
+
+    console.log(err);
+
+    alert("Error descargando Word");
+  }
+}
+
+// ===============================
+// 🎵 AUDIO A TEXTO (WORD)
+// ===============================
+
+document.getElementById("audioInput")
+.addEventListener("change", async function(e){
+
+  const file = e.target.files[0];
+  if(!file) return;
+
+  agregar("🎵 Transcribiendo audio, esperá un momento...","ai");
+
+  let formData = new FormData();
+  formData.append("audio", file);
+  formData.append("usuario_id", usuario_id);
+  formData.append("modo", "job");
+
+  try{
+
+    const r = await fetch("/upload_audio",{
+      method:"POST",
+      body:formData
+    });
+
+    if(!r.ok){
+      let txt = await r.text();
+      agregar("❌ Error en transcripción: " + txt, "ai");
+      e.target.value = "";
+      return;
+    }
+
+    const data = await r.json();
+    e.target.value = ""; // reset para poder subir el mismo archivo de nuevo
+
+    await esperarYDescargarTranscripcion(
+      data.job_id,
+      file.name.replace(/\.[^.]+$/, "") + "_transcripcion.docx"
+    );
+
+  }catch(err){
+    console.log(err);
+    agregar("❌ Error procesando el audio.", "ai");
+    e.target.value = "";
+  }
+
+});
+
+// Consulta el estado del job cada 2 s mostrando "tramo X de Y" y al
+// terminar descarga el Word (los audios largos tardan varios minutos).
+function esperarYDescargarTranscripcion(jobId, nombreDocx){
+    let avisoProgreso = null;
+    let ultimoTexto = "";
+
+    return new Promise((resolve)=>{
+        const intervalo = setInterval(async ()=>{
+            try{
+                const r = await fetch("/estado_transcripcion/" + jobId);
+                const data = await r.json();
+
+                if(!data.ok){
+                    clearInterval(intervalo);
+                    agregar("❌ " + (data.error || "Error consultando el estado de la transcripción"), "ai");
+                    resolve();
+                    return;
+                }
+
+                const p = data.progreso || {};
+                if(data.status === "procesando" && p.total > 1){
+                    const texto = "⏳ Transcribiendo... tramo " + Math.min(p.hechos + 1, p.total) + " de " + p.total;
+                    if(texto !== ultimoTexto){
+                        ultimoTexto = texto;
+                        if(avisoProgreso){
+                            avisoProgreso.innerText = texto;
+                        }else{
+                            avisoProgreso = agregar(texto, "ai");
+                        }
+                    }
+                }
+
+                if(data.status === "listo"){
+                    clearInterval(intervalo);
+
+                    const a = document.createElement("a");
+                    a.href = "/descargar_transcripcion/" + jobId;
+                    a.download = nombreDocx;
+                    document.body.appendChild(a);
+                    a.click();
+                    a.remove();
+
+                    agregar("✅ Transcripción lista. Se descargó el Word con el texto.", "ai");
+                    resolve();
+
+                }else if(data.status === "error"){
+                    clearInterval(intervalo);
+                    agregar("❌ " + (data.error || "Error en transcripción"), "ai");
+                    resolve();
+                }
+
+            }catch(err){
+                clearInterval(intervalo);
+                console.log(err);
+                agregar("❌ Error consultando el estado de la transcripción", "ai");
+                resolve();
+            }
+        }, 2000);
+    });
+}
+
+// ===============================
+// 📷 IMAGEN A WORD
+// ===============================
+
+document.getElementById("imagenInput")
+.addEventListener("change", async function(e){
+
+  const file = e.target.files[0];
+
+  if(!file) return;
+
+  // 🖼️ EDITAR IMAGEN
+  if(modoImagen === "editar"){
+
+    imagenActualArchivo = file;
+
+    let lector = new FileReader();
+
+    lector.onload = function(ev){
+
+      // Mostrar imagen original
+      let prev = document.getElementById("previewImagen");
+      prev.src = ev.target.result;
+      prev.style.display = "block";
+      let phOrig = document.getElementById("placeholderOrig");
+      if(phOrig) phOrig.style.display = "none";
+
+      // Resetear resultado
+      let res = document.getElementById("resultadoImagen");
+      res.src = ""; res.style.display = "none";
+      let phRes = document.getElementById("placeholderResult");
+      if(phRes) phRes.style.display = "flex";
+
+      // Resetear controles
+      document.getElementById("btnDescargarEdicion").style.display = "none";
+      document.getElementById("editorEstado").style.display = "none";
+      document.getElementById("btnAplicarEdicion").disabled = false;
+      document.getElementById("promptImagen").value = "";
+
+      // Abrir modal flotante
+      document.getElementById("editorImagen").style.display = "flex";
+    };
+
+    lector.readAsDataURL(file);
+
+    return;
+  }
+
+  // 📷 IMAGEN A WORD
+  let formData = new FormData();
+
+  formData.append("imagen", file);
+
+  agregar("📷 Procesando imagen...", "ai");
+
+  try{
+
+    const r = await fetch(
+      "/imagen_a_word",
+      {
+        method:"POST",
+        body:formData
+      }
+    );
+
+    if(!r.ok){
+
+      let txt = await r.text();
+
+      agregar(
+        "❌ Error: " + txt,
+        "ai"
+      );
+
+      e.target.value = "";
+
+      return;
+    }
+
+    const blob = await r.blob();
+
+    const url =
+      window.URL.createObjectURL(blob);
+
+    const a =
+      document.createElement("a");
+
+    a.href = url;
+
+    a.download =
+      "imagen_extraida.docx";
+
+    document.body.appendChild(a);
+
+    a.click();
+
+    a.remove();
+
+    window.URL.revokeObjectURL(url);
+
+    agregar(
+      "✅ Word generado correctamente.",
+      "ai"
+    );
+
+  }catch(err){
+
+    console.log(err);
+
+    agregar(
+      "❌ Error procesando la imagen.",
+      "ai"
+    );
+  }
+
+  e.target.value = "";
+
+});
+
+// ===============================
+// 📄 SUBIR PDF / WORD
+// ===============================
+
+document.getElementById("archivo_pdf_word")
+.addEventListener("change", async function(e){
+
+  const file = e.target.files[0];
+
+  if(!file) return;
+
+  agregar("📄 Subiendo documento...","ai");
+
+  let formData = new FormData();
+
+  formData.append("archivo", file);
+  formData.append("usuario_id", usuario_id);
+
+  try{
+
+    const r = await fetch("/upload_doc",{
+      method:"POST",
+      body:formData
+    });
+
+    if(!r.ok){
+      let txt = await r.text();
+      agregar("❌ Error: " + txt,"ai");
+      return;
+    }
+
+    const data = await r.json();
+
+    documentoActual = data.doc_id;
+    textoDocumento = data.snippet || "";
+
+    agregar(
+      `✅ Documento cargado: ${data.name}
+      ${data.aviso ? "<br><br>⚠️ " + data.aviso : ""}
+      <br><br>
+      📌 Elegí una opción:
+      <br><br>
+      <button onclick="resumirDocumento('breve')">📄 Resumen breve</button>
+      <button onclick="resumirDocumento('normal')">📘 Resumen normal</button>
+      <button onclick="resumirDocumento('profundo')">📚 Resumen profundo</button>
+      <button onclick="activarPreguntasDocumento()">❓ Preguntar al documento</button>
+      `,
+      "ai"
+    );
+
+  }catch(err){
+
+    console.log(err);
+
+    agregar(
+      "❌ Error subiendo documento",
+      "ai"
+    );
+  }
+
+});
+
+// ===============================
+// 📘 RESUMIR DOCUMENTO
+// ===============================
+
+async function resumirDocumento(tipo){
+
+  if(!documentoActual){
+    agregar("❌ No hay documento cargado","ai");
+    return;
+  }
+
+  agregar("🧠 Generando resumen...","ai");
+
+  try{
+
+    const r = await fetch("/resumir_doc",{
+      method:"POST",
+      headers:{
+        "Content-Type":"application/json"
+      },
+      body:JSON.stringify({
+        doc_id: documentoActual,
+        modo: tipo,
+        usuario_id: usuario_id
+      })
+    });
+
+    if(!r.ok){
+
+      let txt = await r.text();
+
+      agregar("❌ Error: " + txt,"ai");
+
+      return;
+    }
+
+    const blob = await r.blob();
+
+    const url = window.URL.createObjectURL(blob);
+
+    const a = document.createElement("a");
+
+    a.href = url;
+
+    a.download = "resumen_foschi.docx";
+
+    document.body.appendChild(a);
+
+    a.click();
+
+    a.remove();
+
+    agregar("✅ Resumen generado","ai");
+
+  }catch(err){
+
+    console.log(err);
+
+    agregar("❌ Error generando resumen","ai");
+  }
+}
+
+// ===============================
+// ❓ PREGUNTAS SOBRE DOCUMENTO
+// ===============================
+
+let modoPreguntasDocumento = false;
+
+function activarPreguntasDocumento(){
+
+  modoPreguntasDocumento = true;
+
+  agregar(
+    "📄 Modo documento ACTIVADO. Ahora podés hacer preguntas sobre el archivo.",
+    "ai"
+  );
+
+  // ============================
+  // CREAR BOTÓN FLOTANTE
+  // ============================
+
+  if(!document.getElementById("btnSalirDocumento")){
+
+    let btn = document.createElement("button");
+
+    btn.id = "btnSalirDocumento";
+
+    btn.innerHTML = "❌ Salir del documento";
+
+    btn.onclick = salirModoDocumento;
+
+    btn.style.position = "fixed";
+
+    btn.style.bottom = "90px";
+
+    btn.style.right = "20px";
+
+    btn.style.zIndex = "9999";
+
+    btn.style.padding = "12px 18px";
+
+    btn.style.borderRadius = "14px";
+
+    btn.style.border = "none";
+
+    btn.style.cursor = "pointer";
+
+    btn.style.fontWeight = "bold";
+
+    btn.style.background = "#ff0033";
+
+    btn.style.color = "white";
+
+    btn.style.boxShadow = "0 0 15px rgba(255,0,0,0.5)";
+
+    document.body.appendChild(btn);
+  }
+}
+
+function salirModoDocumento(){
+
+  modoPreguntasDocumento = false;
+
+  documentoActual = null;
+
+  textoDocumento = "";
+
+  let btn = document.getElementById("btnSalirDocumento");
+
+  if(btn){
+    btn.remove();
+  }
+
+  agregar(
+    "✅ Saliste del modo documento. Foschi IA volvió al modo normal.",
+    "ai"
+  );
+}
+
+async function editarImagenActual(){
+
+    let prompt = document
+        .getElementById("promptImagen")
+        .value
+        .trim();
+
+    if(!prompt){
+        alert("Escribí una modificación");
+        return;
+    }
+
+    // UI: cargando
+    let btnAplicar = document.getElementById("btnAplicarEdicion");
+    let estado = document.getElementById("editorEstado");
+    btnAplicar.disabled = true;
+    estado.style.display = "flex";
+    document.getElementById("btnDescargarEdicion").style.display = "none";
+
+    // Ocultar resultado anterior
+    let resImg = document.getElementById("resultadoImagen");
+    let phRes  = document.getElementById("placeholderResult");
+    resImg.style.display = "none";
+    if(phRes) phRes.style.display = "flex";
+
+    let formData = new FormData();
+    formData.append("imagen", imagenActualArchivo);
+    formData.append("prompt", prompt);
+
+    try{
+
+        const r = await fetch("/editar_imagen", { method:"POST", body:formData });
+        const data = await r.json();
+
+        estado.style.display = "none";
+        btnAplicar.disabled = false;
+
+        if(!data.ok){
+            alert(data.error);
+            return;
+        }
+
+        // Mostrar resultado en columna derecha
+        let urlImagen = data.url;
+        resImg.src = urlImagen;
+        resImg.style.display = "block";
+        if(phRes) phRes.style.display = "none";
+
+        // Habilitar descarga
+        let btnDesc = document.getElementById("btnDescargarEdicion");
+        btnDesc.href = urlImagen;
+        btnDesc.download = "foschi_editada." + urlImagen.split(".").pop();
+        btnDesc.style.display = "inline-block";
+
+        agregar("✅ Imagen editada con IA", "ai");
+
+    }catch(err){
+
+        console.log(err);
+        estado.style.display = "none";
+        btnAplicar.disabled = false;
+        agregar("❌ Error editando imagen", "ai");
+    }
+}
+function cancelarEdicionImagen(){
+
+    document.getElementById("editorImagen").style.display = "none";
+    document.getElementById("promptImagen").value = "";
+
+    let prev = document.getElementById("previewImagen");
+    prev.src = "";
+    prev.style.display = "none";
+    let phOrig = document.getElementById("placeholderOrig");
+    if(phOrig) phOrig.style.display = "flex";
+
+    let res = document.getElementById("resultadoImagen");
+    res.src = "";
+    res.style.display = "none";
+    let phRes = document.getElementById("placeholderResult");
+    if(phRes) phRes.style.display = "flex";
+
+    let btnDesc = document.getElementById("btnDescargarEdicion");
+    if(btnDesc) btnDesc.style.display = "none";
+    let estado = document.getElementById("editorEstado");
+    if(estado) estado.style.display = "none";
+    let btnAplicar = document.getElementById("btnAplicarEdicion");
+    if(btnAplicar) btnAplicar.disabled = false;
+
+    imagenActualArchivo = null;
+    modoImagen = "";
+}
+
+// ===============================
+// 🎨 GENERADOR DE IMAGEN IA
+// ===============================
+
+function abrirGeneradorImagen(){
+
+    if(!isPremium){
+        alert("⚠️ Esta función requiere Premium. Pasá a Premium para usarla.");
+        return;
+    }
+
+    document.getElementById("promptGenerador").value = "";
+
+    let res = document.getElementById("resultadoGenerador");
+    res.src = "";
+    res.style.display = "none";
+
+    let ph = document.getElementById("placeholderGenerador");
+    if(ph) ph.style.display = "flex";
+
+    document.getElementById("btnDescargarGenerador").style.display = "none";
+    document.getElementById("generadorEstado").style.display = "none";
+    document.getElementById("btnGenerarImagen").disabled = false;
+
+    document.getElementById("generadorImagen").style.display = "flex";
+}
+
+async function generarImagenIA(){
+
+    let prompt = document
+        .getElementById("promptGenerador")
+        .value
+        .trim();
+
+    if(!prompt){
+        alert("Describí la imagen que querés generar");
+        return;
+    }
+
+    // UI: cargando
+    let btnGenerar = document.getElementById("btnGenerarImagen");
+    let estado = document.getElementById("generadorEstado");
+    btnGenerar.disabled = true;
+    estado.style.display = "flex";
+    document.getElementById("btnDescargarGenerador").style.display = "none";
+
+    // Ocultar resultado anterior
+    let resImg = document.getElementById("resultadoGenerador");
+    let phRes  = document.getElementById("placeholderGenerador");
+    resImg.style.display = "none";
+    if(phRes) phRes.style.display = "flex";
+
+    try{
+
+        const r = await fetch("/generar_imagen", {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify({ prompt: prompt })
+        });
+        const data = await r.json();
+
+        estado.style.display = "none";
+        btnGenerar.disabled = false;
+
+        if(!data.ok){
+            alert(data.error);
+            return;
+        }
+
+        // Mostrar resultado
+        let urlImagen = data.url;
+        resImg.src = urlImagen;
+        resImg.style.display = "block";
+        if(phRes) phRes.style.display = "none";
+
+        // Habilitar descarga
+        let btnDesc = document.getElementById("btnDescargarGenerador");
+        btnDesc.href = urlImagen;
+        btnDesc.download = "foschi_generada." + urlImagen.split(".").pop();
+        btnDesc.style.display = "inline-block";
+
+        agregar("✅ Imagen generada con IA", "ai");
+
+    }catch(err){
+
+        console.log(err);
+        estado.style.display = "none";
+        btnGenerar.disabled = false;
+        agregar("❌ Error generando imagen", "ai");
+    }
+}
+
+function cancelarGeneradorImagen(){
+
+    document.getElementById("generadorImagen").style.display = "none";
+    document.getElementById("promptGenerador").value = "";
+
+    let res = document.getElementById("resultadoGenerador");
+    res.src = "";
+    res.style.display = "none";
+    let ph = document.getElementById("placeholderGenerador");
+    if(ph) ph.style.display = "flex";
+
+    let btnDesc = document.getElementById("btnDescargarGenerador");
+    if(btnDesc) btnDesc.style.display = "none";
+    let estado = document.getElementById("generadorEstado");
+    if(estado) estado.style.display = "none";
+    let btnGenerar = document.getElementById("btnGenerarImagen");
+    if(btnGenerar) btnGenerar.disabled = false;
+}
+
+// ===============================
+// 🖥️ GENERADOR DE PRESENTACIONES (PPTX)
+// ===============================
+
+function abrirGeneradorPresentacion(temaPrefill){
+
+    if(!isPremium){
+        alert("⚠️ Esta función requiere Premium. Pasá a Premium para usarla.");
+        return;
+    }
+
+    document.getElementById("presTitulo").value = "";
+    document.getElementById("presTema").value = temaPrefill || "";
+    document.getElementById("presNumSlides").value = 8;
+    document.getElementById("presIncluirImagenes").checked = true;
+    document.getElementById("presVideos").value = "";
+    document.getElementById("presEstado").style.display = "none";
+    document.getElementById("btnGenerarPresentacion").disabled = false;
+
+    let infoDoc = document.getElementById("presInfoDoc");
+    if(documentoActual){
+        infoDoc.style.display = "block";
+        infoDoc.innerHTML = "📄 Tenés un documento cargado: se usará como base de la presentación. Si además escribís un tema, lo usaremos como enfoque adicional.";
+    }else{
+        infoDoc.style.display = "none";
+    }
+
+    document.getElementById("generadorPresentacion").style.display = "flex";
+}
+
+function cerrarGeneradorPresentacion(){
+    document.getElementById("generadorPresentacion").style.display = "none";
+}
+
+async function generarPresentacionIA(){
+
+    let tema = document.getElementById("presTema").value.trim();
+    let titulo = document.getElementById("presTitulo").value.trim();
+    let numSlides = document.getElementById("presNumSlides").value || 8;
+    let incluirImagenes = document.getElementById("presIncluirImagenes").checked;
+    let videos = document.getElementById("presVideos").files;
+
+    if(!tema && !documentoActual){
+        alert("Escribí un tema/descripción o subí un documento (📄 Analizar Documento) antes de generar la presentación.");
+        return;
+    }
+
+    let btn = document.getElementById("btnGenerarPresentacion");
+    let estado = document.getElementById("presEstado");
+    btn.disabled = true;
+    estado.style.display = "flex";
+
+    let formData = new FormData();
+    formData.append("usuario_id", usuario_id);
+    formData.append("tema", tema);
+    formData.append("titulo", titulo);
+    formData.append("num_slides", numSlides);
+    formData.append("incluir_imagenes", incluirImagenes ? "true" : "false");
+
+    if(documentoActual){
+        formData.append("doc_id", documentoActual);
+    }
+
+    for(let i=0; i<videos.length; i++){
+        formData.append("videos", videos[i]);
+    }
+
+    try{
+
+        // 1) Iniciar el job de generación (responde rápido, sin esperar la IA)
+        const r = await fetch("/generar_presentacion", {
+            method: "POST",
+            body: formData
+        });
+
+        let data = null;
+        try{ data = await r.json(); }catch(e){}
+
+        if(!r.ok || !data || !data.ok || !data.job_id){
+            let errTxt = (data && data.error) ? data.error : "Error iniciando la generación de la presentación";
+            estado.style.display = "none";
+            btn.disabled = false;
+            alert("❌ " + errTxt);
+            return;
+        }
+
+        // 2) Consultar el estado periódicamente hasta que esté listo
+        await esperarYDescargarPresentacion(data.job_id, btn, estado);
+
+    }catch(err){
+
+        console.log(err);
+        estado.style.display = "none";
+        btn.disabled = false;
+        agregar("❌ Error generando la presentación", "ai");
+    }
+}
+
+function esperarYDescargarPresentacion(jobId, btn, estado){
+    return new Promise((resolve)=>{
+        const intervalo = setInterval(async ()=>{
+            try{
+                const r = await fetch("/estado_presentacion/" + jobId);
+                const data = await r.json();
+
+                if(!data.ok){
+                    clearInterval(intervalo);
+                    estado.style.display = "none";
+                    btn.disabled = false;
+                    alert("❌ " + (data.error || "Error consultando el estado de la presentación"));
+                    resolve();
+                    return;
+                }
+
+                if(data.status === "listo"){
+                    clearInterval(intervalo);
+
+                    // Descargar el archivo ya generado
+                    const a = document.createElement("a");
+                    a.href = "/descargar_presentacion/" + jobId;
+                    a.download = "presentacion_foschi.pptx";
+                    document.body.appendChild(a);
+                    a.click();
+                    a.remove();
+
+                    estado.style.display = "none";
+                    btn.disabled = false;
+                    cerrarGeneradorPresentacion();
+                    agregar("✅ Presentación generada y descargada (.pptx)", "ai");
+                    resolve();
+
+                }else if(data.status === "error"){
+                    clearInterval(intervalo);
+                    estado.style.display = "none";
+                    btn.disabled = false;
+                    alert("❌ " + (data.error || "Error generando la presentación"));
+                    resolve();
+                }
+                // si status === "procesando", seguimos esperando
+
+            }catch(err){
+                clearInterval(intervalo);
+                estado.style.display = "none";
+                btn.disabled = false;
+                console.log(err);
+                agregar("❌ Error consultando el estado de la presentación", "ai");
+                resolve();
+            }
+        }, 4000);
+    });
+}
+
+</script>
+
+<div id="authModal" style="display:none; position:fixed; inset:0; background:rgba(0,0,0,.85); z-index:9999;">
+  <div style="max-width:360px; margin:10% auto; background:#001d3d; padding:20px; border-radius:12px; color:#00eaff;">
+    
+    <h3>Ingresar</h3>
+
+    <div class="form-premium">
+
+      <input id="authEmail" type="email" placeholder="Email">
+
+      <input id="authPassword" type="password" placeholder="Contraseña">
+
+      <button onclick="login()">Ingresar</button>
+
+      <button onclick="register()">Crear cuenta</button>
+
+    </div>
+
+    <p id="authMsg" style="margin-top:10px;"></p>
+
+    <button onclick="closeAuth()" style="margin-top:10px;">Cerrar</button>
+
+  </div>
+</div>
+   
+</body>
+</html>
+
+"""
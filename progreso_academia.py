@@ -0,0 +1,150 @@
+# progreso_academia.py
+# -----------------
+# Progreso de la academia (puntos, racha, insignias, lecciones hechas,
+# habilidades...) guardado en el servidor, por usuario.
+#
+# Antes vivía sólo en el navegador: se perdía al cambiar de dispositivo y
+# no se podía analizar. Ahora el navegador junta los cambios y cada tanto
+# (o al cerrar la página) manda sólo los campos que cambiaron, cada uno con
+# la hora en que cambió:
+#
+#     POST /api/academia/progreso
+#     {"cambios": {"estrellas": {"v": 120, "t": 1760900000000}, ...}}
+#
+# Por campo gana el cambio más nuevo (last-write-wins): si el alumno usa
+# dos dispositivos, cada uno pisa sólo lo que tocó.
+#
+# Un archivo chico por usuario en data/progreso/, de sólo agregar: cada
+# sincronización es UNA línea nueva con sus cambios (no se reescribe el
+# perfil entero), y al leer se quedan los valores más nuevos. Cuando el
+# archivo pasa de TAMANIO_COMPACTAR se reescribe como una sola línea.
+# Con varios workers el archivo se bloquea con fcntl mientras se escribe.
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:      # Windows: sólo el lock entre hilos
+    fcntl = None
+
+from nucleo import DATA_DIR
+
+CARPETA = os.path.join(DATA_DIR, "progreso")
+TAMANIO_COMPACTAR = 64 * 1024
+CAMPOS_MAX = 40                 # por usuario
+VALOR_MAX_BYTES = 8 * 1024      # JSON de un campo
+ADELANTO_MAX_MS = 60 * 1000     # tolerancia al reloj del cliente
+
+CAMPO_VALIDO = re.compile(r"^[a-z][a-z0-9_]{0,39}$")
+
+_locks = {}
+_locks_lock = threading.Lock()
+
+
+def _ruta(usuario):
+    clave = hashlib.sha1(str(usuario).encode("utf-8")).hexdigest()[:20]
+    return os.path.join(CARPETA, f"{clave}.jsonl")
+
+
+def _lock(usuario):
+    with _locks_lock:
+        return _locks.setdefault(usuario, threading.Lock())
+
+
+def _bloquear(f):
+    if fcntl is not None:
+        fcntl.flock(f, fcntl.LOCK_EX)
+
+
+def _fusionar(progreso, cambios):
+    """Aplica `cambios` sobre `progreso`: por campo gana el de hora mayor (o el último, si empatan)."""
+    for campo, cambio in cambios.items():
+        actual = progreso.get(campo)
+        if actual is None or cambio["t"] >= actual["t"]:
+            progreso[campo] = cambio
+    return progreso
+
+
+def _leer(f):
+    progreso = {}
+    for linea in f:
+        try:
+            _fusionar(progreso, json.loads(linea))
+        except (ValueError, TypeError, KeyError):
+            continue     # una línea cortada (el proceso murió escribiendo)
+    return progreso
+
+
+def cargar(usuario):
+    """{campo: {"v": valor, "t": hora en ms}} del usuario."""
+    try:
+        with open(_ruta(usuario), "rb") as f:
+            return _leer(f)
+    except OSError:
+        return {}
+
+
+def validar(cambios, ahora_ms=None):
+    """
+    Cambios válidos de un pedido del cliente ({campo: {"v", "t"}}), con la
+    hora recortada a la del servidor + ADELANTO_MAX_MS (un reloj adelantado
+    no puede ganar para siempre). Los campos inválidos se descartan.
+    """
+    if not isinstance(cambios, dict):
+        return {}
+    ahora_ms = ahora_ms if ahora_ms is not None else int(time.time() * 1000)
+    validos = {}
+    for campo, cambio in list(cambios.items())[:CAMPOS_MAX]:
+        if not CAMPO_VALIDO.match(str(campo)) or not isinstance(cambio, dict) or "v" not in cambio:
+            continue
+        if len(json.dumps(cambio["v"], ensure_ascii=False)) > VALOR_MAX_BYTES:
+            continue
+        try:
+            t = int(cambio.get("t") or ahora_ms)
+        except (TypeError, ValueError):
+            t = ahora_ms
+        validos[campo] = {"v": cambio["v"], "t": min(max(t, 0), ahora_ms + ADELANTO_MAX_MS)}
+    return validos
+
+
+def registrar(usuario, cambios):
+    """Agrega `cambios` (ya validados) al archivo del usuario: una línea."""
+    if not cambios:
+        return
+    os.makedirs(CARPETA, exist_ok=True)
+    linea = _linea(cambios)
+    with _lock(usuario):
+        with open(_ruta(usuario), "a+b") as f:
+            _bloquear(f)
+            f.seek(0, os.SEEK_END)
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    linea = b"\n" + linea   # cerrar una línea cortada
+            f.write(linea)
+            f.flush()
+            if f.tell() > TAMANIO_COMPACTAR:
+                _compactar(f)
+
+
+def _linea(progreso):
+    return json.dumps(progreso, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def _compactar(f):
+    # con el archivo bloqueado: todo el historial queda en una sola línea
+    f.seek(0)
+    progreso = _leer(f)
+    # sin campos de más: se quedan los CAMPOS_MAX más nuevos
+    if len(progreso) > CAMPOS_MAX:
+        nuevos = sorted(progreso, key=lambda c: progreso[c]["t"], reverse=True)[:CAMPOS_MAX]
+        progreso = {c: progreso[c] for c in nuevos}
+    f.seek(0)
+    f.truncate()
+    f.write(_linea(progreso))
+    f.flush()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# coding: utf-8
+"""
+prueba_carga.py — cuántos requests simultáneos aguanta la app.
+
+Levanta un OpenAI falso (responde /v1/chat/completions después de --demora
+segundos, como un modelo real pero sin costo), arranca la app apuntando a
+él (OPENAI_BASE_URL) y le tira --concurrencia POST /preguntar a la vez.
+Mide el tiempo total, requests/s, latencias, errores y el máximo de hilos
+del servidor (sumando sus procesos) durante la carga, y compara:
+
+  dev       → python FOSCHI_IA_PRO14.py (servidor de desarrollo de Flask)
+  gthread   → gunicorn -c gunicorn_conf.py con GUNICORN_WORKER_CLASS=gthread (hilos)
+  gunicorn  → gunicorn -c gunicorn_conf.py (el perfil de producción: uvicorn)
+  asgi      → uvicorn asgi:app (ver asgi.py)
+
+La app corre en una carpeta temporal (su data/ no toca la del repo).
+Un servidor que atiende C requests a la vez tarda ~demora × ceil(N / C)
+en total; si atiende todos a la vez, ~demora × N / concurrencia.
+
+Uso:
+  python prueba_carga.py                          # dev vs gunicorn, 64 a la vez
+  WEB_CONCURRENCY=2 python prueba_carga.py --servidor gunicorn
+  python prueba_carga.py --servidor todos --concurrencia 500
+  python prueba_carga.py --servidor gunicorn --concurrencia 200
+  GUNICORN_WORKER_CLASS=gevent python prueba_carga.py --servidor gunicorn
+  python prueba_carga.py --servidor todos --concurrencia 500 --demora 10 --guardar
+"""
+
+import argparse
+import datetime
+import json
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+CARPETA_REPO = os.path.dirname(os.path.abspath(__file__))
+REPORTE = "prueba_carga.txt"
+
+
+def _puerto_libre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+# -----------------------------
+# OPENAI FALSO
+# -----------------------------
+def iniciar_openai_falso(demora):
+    class _Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            time.sleep(demora)
+            cuerpo = json.dumps({
+                "id": "chatcmpl-prueba",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": "gpt-4-turbo",
+                "choices": [{
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": "Respuesta de prueba."},
+                }],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 3, "total_tokens": 13},
+            }).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(cuerpo)))
+            self.end_headers()
+            self.wfile.write(cuerpo)
+
+        def log_message(self, *args):
+            pass
+
+    class _Servidor(ThreadingHTTPServer):
+        daemon_threads = True
+        request_queue_size = 1024   # el default (5) descarta conexiones con mucha concurrencia
+
+    servidor = _Servidor(("127.0.0.1", _puerto_libre()), _Handler)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+# -----------------------------
+# APP
+# -----------------------------
+def arrancar_app(tipo, puerto, url_openai, carpeta):
+    env = dict(
+        os.environ,
+        PORT=str(puerto),
+        OPENAI_API_KEY="prueba",
+        OPENAI_BASE_URL=url_openai,
+        PYTHONPATH=CARPETA_REPO,
+        GUNICORN_LOGLEVEL="warning",
+    )
+    if tipo == "gthread":
+        env["GUNICORN_WORKER_CLASS"] = "gthread"
+    if tipo == "dev":
+        comando = [sys.executable, os.path.join(CARPETA_REPO, "FOSCHI_IA_PRO14.py")]
+    elif tipo == "asgi":
+        comando = [
+            sys.executable, "-m", "uvicorn", "asgi:app",
+            "--host", "127.0.0.1", "--port", str(puerto),
+            "--log-level", "warning", "--no-access-log",
+        ]
+    else:
+        comando = [
+            sys.executable, "-m", "gunicorn",
+            "-c", os.path.join(CARPETA_REPO, "gunicorn_conf.py"),
+            "--access-logfile", os.devnull,
+        ]
+    proceso = subprocess.Popen(
+        comando, cwd=carpeta, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+
+    base = f"http://127.0.0.1:{puerto}"
+    limite = time.time() + 60
+    while time.time() < limite:
+        if proceso.poll() is not None:
+            raise SystemExit(f"La app ({tipo}) no arrancó:\n{proceso.stderr.read()[-3000:]}")
+        try:
+            if requests.get(base + "/api/health_academia", timeout=1).ok:
+                return proceso, base
+        except requests.RequestException:
+            time.sleep(0.2)
+    proceso.kill()
+    raise SystemExit(f"La app ({tipo}) no respondió en 60 s")
+
+
+def hilos_del_servidor(pid):
+    """Hilos del proceso `pid` y sus hijos (workers); None fuera de Linux."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            total = int(f.read().split("Threads:")[1].split()[0])
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            hijos = f.read().split()
+    except (OSError, IndexError, ValueError):
+        return None
+    return total + sum(hilos_del_servidor(int(h)) or 0 for h in hijos)
+
+
+def detener_app(proceso):
+    proceso.terminate()
+    try:
+        proceso.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        proceso.kill()
+
+
+# -----------------------------
+# CARGA
+# -----------------------------
+def _un_request(base, i):
+    inicio = time.perf_counter()
+    try:
+        r = requests.post(
+            base + "/preguntar",
+            json={"mensaje": f"Contame algo interesante ({i})"},
+            timeout=300,
+        )
+        ok = r.status_code == 200 and "Respuesta de prueba" in r.text
+    except requests.RequestException:
+        ok = False
+    return ok, time.perf_counter() - inicio
+
+
+def medir(tipo, concurrencia, total, url_openai):
+    carpeta = tempfile.mkdtemp(prefix=f"carga_{tipo}_")
+    proceso, base = arrancar_app(tipo, _puerto_libre(), url_openai, carpeta)
+    hilos = []
+    midiendo = threading.Event()
+
+    def _contar_hilos():
+        while not midiendo.wait(0.2):
+            hilos.append(hilos_del_servidor(proceso.pid) or 0)
+
+    try:
+        _un_request(base, -1)  # calentar (primer uso del cliente de OpenAI)
+        contador = threading.Thread(target=_contar_hilos, daemon=True)
+        contador.start()
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrencia) as executor:
+            resultados = list(executor.map(lambda i: _un_request(base, i), range(total)))
+        duracion = time.perf_counter() - inicio
+        midiendo.set()
+        contador.join()
+    finally:
+        detener_app(proceso)
+        shutil.rmtree(carpeta, ignore_errors=True)
+
+    latencias = sorted(t for ok, t in resultados if ok)
+    errores = sum(1 for ok, _ in resultados if not ok)
+    return {
+        "servidor": tipo,
+        "duracion": duracion,
+        "rps": len(latencias) / duracion if duracion else 0,
+        "p50": statistics.median(latencias) if latencias else 0,
+        "p95": latencias[int(len(latencias) * 0.95) - 1] if latencias else 0,
+        "errores": errores,
+        "hilos": max(hilos, default=0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga de /preguntar")
+    parser.add_argument("--servidor", choices=["dev", "gthread", "gunicorn", "asgi", "ambos", "todos"], default="ambos",
+                        help="ambos = dev y gunicorn; todos = dev, gthread, gunicorn y asgi")
+    parser.add_argument("--concurrencia", type=int, default=64, help="requests simultáneos")
+    parser.add_argument("--total", type=int, default=0, help="requests en total (por defecto 2 × concurrencia)")
+    parser.add_argument("--demora", type=float, default=2.0, help="segundos que tarda el OpenAI falso")
+    parser.add_argument("--guardar", action="store_true", help=f"escribe el reporte en {REPORTE}")
+    args = parser.parse_args()
+
+    total = args.total or args.concurrencia * 2
+    falso = iniciar_openai_falso(args.demora)
+    url_openai = f"http://127.0.0.1:{falso.server_address[1]}/v1"
+
+    tipos = {
+        "ambos": ["dev", "gunicorn"],
+        "todos": ["dev", "gthread", "gunicorn", "asgi"],
+    }.get(args.servidor, [args.servidor])
+    lineas = []
+
+    def _linea(texto):
+        print(texto, flush=True)
+        lineas.append(texto)
+
+    _linea(f"Prueba de carga de /preguntar — {datetime.datetime.now():%Y-%m-%d %H:%M}")
+    _linea(f"python {sys.version.split()[0]} · {os.cpu_count()} CPU")
+    _linea(f"{total} requests, {args.concurrencia} a la vez, OpenAI falso de {args.demora:.1f} s")
+    _linea(f"ideal: ~{args.demora * -(-total // args.concurrencia):.1f} s en total\n")
+    _linea(f"{'servidor':<10} {'total s':>8} {'req/s':>8} {'p50 s':>7} {'p95 s':>7} {'errores':>8} {'hilos':>6}")
+    for tipo in tipos:
+        r = medir(tipo, args.concurrencia, total, url_openai)
+        _linea(f"{r['servidor']:<10} {r['duracion']:8.1f} {r['rps']:8.1f} {r['p50']:7.2f} {r['p95']:7.2f} "
+               f"{r['errores']:8d} {r['hilos']:6d}")
+
+    falso.shutdown()
+
+    if args.guardar:
+        ruta = os.path.join(CARPETA_REPO, REPORTE)
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write("\n".join(lineas) + "\n")
+        print(f"\nReporte guardado en {REPORTE}")
+
+
+if __name__ == "__main__":
+    main()
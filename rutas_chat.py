@@ -0,0 +1,439 @@
+# rutas_chat.py
+# -----------------
+# Blueprint del chat: página principal, bootstrap del usuario, /preguntar
+# (con generar_respuesta), historial y clima.
+
+import os
+import re
+import uuid
+import asyncio
+import hashlib
+
+from flask import Blueprint, request, session, jsonify, send_file, Response
+
+from estaticos import empaquetar_html
+from asincronico import obtener_json
+from modelos import completar, metricas
+from prompts import PROMPTS, mensajes
+from superusuarios import es_superusuario, rol_superusuario, nivel_superusuario
+from suscripciones import usuario_premium, aviso_vencimiento
+from contexto_chat import armar_contexto, programar_resumen
+from plantilla_principal import HTML_TEMPLATE
+from nucleo import (
+    APP_NAME, STATIC_DIR, GOOGLE_API_KEY, GOOGLE_CSE_ID, MEMORY_FILE,
+    documentos, load_json, save_json, fecha_hora_en_es, hacer_links_clicleables,
+    guardar_en_historial_diferido, borrar_historial_diferido, cargar_historial,
+    obtener_clima, obtener_clima_async, learn_from_message,
+    interpretar_fecha_hora, agregar_recordatorio, listar_recordatorios, borrar_recordatorios,
+)
+
+bp = Blueprint("chat", __name__)
+
+
+# ---------------- RESPUESTA IA ----------------
+# /preguntar es una vista async (ver asincronico.py): las llamadas a OpenAI,
+# Google CSE y OpenWeatherMap se esperan sin bloquear.
+
+async def buscar_fragmentos(consulta, que="noticias"):
+    """Hasta 5 fragmentos (snippets) recientes de Google CSE para `consulta`."""
+    resultados = []
+    if GOOGLE_API_KEY and GOOGLE_CSE_ID:
+        try:
+            _, data = await obtener_json(
+                "https://www.googleapis.com/customsearch/v1",
+                params={"key": GOOGLE_API_KEY, "cx": GOOGLE_CSE_ID, "q": consulta, "sort": "date"},
+                timeout=5,
+            )
+            for item in data.get("items", [])[:5]:
+                snippet = item.get("snippet", "").strip()
+                if snippet and snippet not in resultados:
+                    resultados.append(snippet)
+        except Exception as e:
+            print(f"Error al obtener {que}:", e)
+    return resultados
+
+
+def _es_premium(usuario):
+    return usuario_premium(usuario) or es_superusuario(usuario)
+
+
+def _comando_recordatorios(mensaje, mensaje_lower, usuario):
+    """Respuesta a un comando de recordatorios, o None si no es uno."""
+    try:
+        if mensaje_lower in ["mis recordatorios", "lista de recordatorios", "ver recordatorios"]:
+            recs = listar_recordatorios(usuario)
+            if not recs:
+                return {"texto": "📭 No tenés recordatorios pendientes.", "imagenes": [], "borrar_historial": False}
+            texto = "📌 Tus recordatorios:\n" + "\n".join([f"- {r['motivo']} → {r['cuando']}" for r in recs])
+            return {"texto": texto, "imagenes": [], "borrar_historial": False}
+
+        if "borrar recordatorios" in mensaje_lower or "eliminar recordatorios" in mensaje_lower:
+            borrar_recordatorios(usuario)
+            return {"texto": "🗑️ Listo, eliminé todos tus recordatorios.", "imagenes": [], "borrar_historial": False}
+
+        if mensaje_lower.startswith(("recordame", "haceme acordar", "avisame", "recordá")):
+            fecha_hora = interpretar_fecha_hora(mensaje_lower)
+            if fecha_hora is None:
+                return {"texto": "⏰ Decime cuándo: ejemplo 'mañana a las 9', 'en 15 minutos' o 'el 5 de diciembre a las 18'.", "imagenes": [], "borrar_historial": False}
+            motivo = mensaje
+            for p in ["recordame", "haceme acordar", "avisame", "recordá"]:
+                motivo = re.sub(p, "", motivo, flags=re.IGNORECASE).strip()
+            if not motivo:
+                motivo = "Recordatorio"
+            agregar_recordatorio(usuario, motivo, fecha_hora)
+            return {"texto": f"✅ Listo, te lo recuerdo el {fecha_hora.strftime('%d/%m %H:%M')}.", "imagenes": [], "borrar_historial": False}
+    except Exception as e:
+        print("Error en manejo de recordatorios:", e)
+    return None
+
+
+def _borrar_historial(usuario):
+    borrar_historial_diferido(usuario)
+    memory = load_json(MEMORY_FILE)
+    if usuario in memory:
+        memory[usuario]["mensajes"] = []
+        memory[usuario]["turnos"] = 0
+        memory[usuario].pop("resumen", None)
+        save_json(MEMORY_FILE, memory)
+
+
+async def generar_respuesta(mensaje, usuario, lat=None, lon=None, tz=None, max_hist=5):
+       
+    # Bloqueo por no premium (sólo se consulta la suscripción si hace falta)
+    # Todo lo que lee o escribe archivos va en un hilo: esta corrutina
+    # comparte el event loop con los demás requests (ver asincronico.py).
+    if len(mensaje) > 200:
+        if not await asyncio.to_thread(_es_premium, usuario):
+            return {
+                "texto": "🔒 Esta función es solo para usuarios Premium.\n\n💎 Activá Foschi IA Premium desde el botón superior para seguir.",
+                "imagenes": [],
+                "borrar_historial": False
+            }
+
+    # Asegurar string
+    if not isinstance(mensaje, str):
+        mensaje = str(mensaje)
+
+    mensaje_lower = mensaje.lower().strip()
+           
+    # --- RECORDATORIOS: comandos y detección ---
+    respuesta = await asyncio.to_thread(_comando_recordatorios, mensaje, mensaje_lower, usuario)
+    if respuesta:
+        return respuesta
+
+    # BORRAR HISTORIAL
+    if any(p in mensaje_lower for p in ["borrar historial", "limpiar historial", "reset historial"]):
+        await asyncio.to_thread(_borrar_historial, usuario)
+        return {"texto": "✅ Historial borrado correctamente.", "imagenes": [], "borrar_historial": True}
+
+    # FECHA / HORA
+    if any(p in mensaje_lower for p in ["qué día", "que día", "qué fecha", "que fecha", "qué hora", "que hora", "día es hoy", "fecha hoy"]):
+        texto = fecha_hora_en_es()
+        await asyncio.to_thread(learn_from_message, usuario, mensaje, texto)
+        return {"texto": texto, "imagenes": [], "borrar_historial": False}
+
+    # CLIMA
+    if "clima" in mensaje_lower:
+        ciudad_match = re.search(r"clima en ([a-zA-ZáéíóúÁÉÍÓÚñÑ\s]+)", mensaje_lower)
+        ciudad = ciudad_match.group(1).strip() if ciudad_match else None
+        texto = await obtener_clima_async(ciudad=ciudad, lat=lat, lon=lon)
+        await asyncio.to_thread(learn_from_message, usuario, mensaje, texto)
+        return {"texto": texto, "imagenes": [], "borrar_historial": False}
+
+    # INFORMACIÓN ACTUALIZADA (NOTICIAS)
+    if any(word in mensaje_lower for word in ["presidente", "actualidad", "noticias", "quién es", "últimas noticias", "evento actual"]):
+        resultados = await buscar_fragmentos(mensaje, "noticias")
+
+        if resultados:
+            texto_bruto = " ".join(resultados)
+            try:
+                resp = await completar(
+                    "noticias",
+                    prompt="noticias",
+                    messages=mensajes(
+                        "noticias",
+                        variable=f"Fragmentos de texto recientes: {texto_bruto}",
+                        usuario=mensaje,
+                    ),
+                    temperature=0.5,
+                    max_tokens=120
+                )
+
+                texto = resp.choices[0].message.content.strip()
+            except Exception as e:
+                texto = "No pude generar la respuesta con OpenAI."
+        else:
+            texto = "No pude obtener información actualizada en este momento."
+
+        await asyncio.to_thread(learn_from_message, usuario, mensaje, texto)
+        return {"texto": texto, "imagenes": [], "borrar_historial": False}
+
+    # QUIÉN CREÓ / PREGUNTAS ESTÁTICAS
+    if any(p in mensaje_lower for p in [
+        "quién te creó", "quien te creo",
+        "quién te hizo", "quien te hizo",
+        "quién te programó", "quien te programo",
+        "quién te inventó", "quien te invento",
+        "quién te desarrolló", "quien te desarrollo",
+        "quién te construyó", "quien te construyo"
+    ]):
+        texto = "Fui creada por Gustavo Enrique Foschi, el mejor 😎."
+        await asyncio.to_thread(learn_from_message, usuario, mensaje, texto)
+        return {"texto": texto, "imagenes": [], "borrar_historial": False}
+
+    # RESULTADOS DEPORTIVOS (actualizados)
+    if any(p in mensaje_lower for p in [
+        "resultado", "marcador", "ganó", "empató", "perdió",
+        "partido", "deporte", "fútbol", "futbol", "nba", "tenis", "f1", "formula 1", "motogp"
+    ]):
+        resultados = await buscar_fragmentos(mensaje + " resultados deportivos actualizados", "resultados deportivos")
+
+        if resultados:
+            texto_bruto = " ".join(resultados)
+            try:
+                resp = await completar(
+                    "deportes",
+                    prompt="deportes",
+                    messages=mensajes(
+                        "deportes",
+                        variable=f"Fragmentos recientes sobre deportes: {texto_bruto}",
+                        usuario=mensaje,
+                    ),
+                    temperature=0.5,
+                    max_tokens=150
+                )
+                texto = resp.choices[0].message.content.strip()
+            except Exception as e:
+                texto = "No pude generar la respuesta deportiva."
+        else:
+            texto = "No pude encontrar resultados deportivos recientes en este momento."
+
+        await asyncio.to_thread(learn_from_message, usuario, mensaje, texto)
+        return {"texto": texto, "imagenes": [], "borrar_historial": False}
+
+    # PRESENTACIONES (POWERPOINT)
+    if any(p in mensaje_lower for p in [
+        "presentación", "presentacion", "powerpoint", "power point",
+        "diapositivas", "diapositiva", "slides", "ppt"
+    ]):
+        tema_pre = (
+            mensaje
+            .replace("\\", "\\\\")
+            .replace("'", "\\'")
+            .replace('"', "&quot;")
+            .replace("\n", " ")
+            .strip()
+        )
+        texto = (
+            "🖥️ ¡Puedo armarte una presentación de PowerPoint (.pptx) desde cero, "
+            "con imágenes generadas por IA o videos cortos que vos subas! "
+            "También puedo basarme en un documento que ya hayas subido. "
+            "Tocá el botón para configurarla:<br><br>"
+            f"<button onclick=\"abrirGeneradorPresentacion('{tema_pre}')\">🖥️ Crear presentación</button>"
+        )
+        await asyncio.to_thread(learn_from_message, usuario, mensaje, texto)
+        return {"texto": texto, "imagenes": [], "borrar_historial": False}
+
+    # SALIDA GENERAL: pasar a OpenAI para respuesta conversacional
+    # El aviso de vencimiento no depende de la respuesta: se busca mientras
+    # tanto, junto con el contexto del usuario (lecturas de disco en hilos).
+    # El contexto (resumen acumulado + últimos turnos) respeta un presupuesto
+    # de tokens, ver contexto_chat.py; va después del prompt fijo (ver
+    # prompts.py). Ese prefijo fijo es corto para la caché de OpenAI: no se
+    # manda clave de caché.
+    aviso_tarea = asyncio.ensure_future(asyncio.to_thread(aviso_vencimiento, usuario))
+    try:
+        contexto = await asyncio.to_thread(armar_contexto, usuario, PROMPTS["chat"], mensaje, max_turnos=max_hist)
+        prompt_messages = mensajes("chat", variable=contexto, usuario=mensaje)
+
+        # modelo según la complejidad (ver modelos.py); los mensajes de más
+        # de 200 caracteres ya pasaron el control de Premium de arriba
+        premium = len(mensaje) > 200 or await asyncio.to_thread(usuario_premium, usuario)
+        resp = await completar(
+            "chat",
+            prompt="chat",
+            texto=mensaje,
+            premium=premium,
+            messages=prompt_messages,
+            temperature=0.7,
+            max_tokens=700
+        )
+
+        texto = resp.choices[0].message.content.strip()
+
+    except Exception as e:
+        texto = f"No pude generar respuesta: {e}"
+
+        texto = hacer_links_clicleables(texto)
+
+    aviso = await aviso_tarea
+    if aviso:
+        texto += "\n\n" + aviso
+
+    await asyncio.to_thread(learn_from_message, usuario, mensaje, texto)
+    await programar_resumen(usuario)
+    return {
+        "texto": texto,
+        "imagenes": [],
+        "borrar_historial": False
+    }
+
+# La página principal es igual para todos: se compila y renderiza una sola
+# vez al arrancar y se sirve con ETag. Lo que cambia por usuario (id,
+# premium, superusuario) lo pide el front-end a /api/bootstrap.
+# El CSS/JS inline se saca a /assets/ versionados (ver estaticos.py).
+# Se arma en create_app() (necesita el jinja_env de la app), o sea antes
+# del fork cuando gunicorn corre con --preload: los workers la heredan.
+_pagina_principal = [None, None]   # [html en bytes, etag]
+
+
+def preparar_pagina_principal(app):
+    html = empaquetar_html(
+        app.jinja_env.from_string(HTML_TEMPLATE).render(APP_NAME=APP_NAME), "principal"
+    ).encode("utf-8")
+    _pagina_principal[0] = html
+    _pagina_principal[1] = hashlib.sha256(html).hexdigest()[:32]
+
+
+@bp.route("/")
+def index():
+    html, etag = _pagina_principal
+    resp = Response(html, mimetype="text/html")
+    resp.set_etag(etag)
+    # sin max-age: el navegador revalida y recibe 304 si no hubo deploy
+    resp.headers["Cache-Control"] = "public, no-cache"
+    return resp.make_conditional(request)
+
+
+@bp.route("/api/bootstrap")
+def bootstrap():
+    if "usuario_id" not in session:
+        session["usuario_id"] = str(uuid.uuid4())
+
+    usuario = session.get("user_email") or session["usuario_id"]
+
+    resp = jsonify({
+        "usuario_id": usuario,
+        "premium": bool(usuario_premium(usuario)),
+        "is_super": bool(es_superusuario(usuario)),
+        "rol": rol_superusuario(usuario) or "",
+        "nivel": nivel_superusuario(usuario) or 0
+    })
+    resp.headers["Cache-Control"] = "private, no-store"
+    return resp
+
+@bp.route("/preguntar", methods=["POST"])
+async def preguntar():
+
+    data = request.get_json()
+
+    mensaje = data.get("mensaje", "")
+
+    doc_id = data.get("doc_id")
+
+    preguntar_doc = data.get("preguntar_doc", False)
+    
+    # 1️⃣ Asegurar UUID en sesión (NO se borra nunca)
+    if "usuario_id" not in session:
+        session["usuario_id"] = str(uuid.uuid4())
+
+    # 2️⃣ Identidad activa:
+    #    email si está logueado
+    #    UUID si no
+    usuario = session.get("user_email") or session["usuario_id"]
+
+    lat = data.get("lat")
+    lon = data.get("lon")
+    tz  = data.get("timeZone") or data.get("time_zone") or None
+
+     # ============================
+    # 📄 PREGUNTAS SOBRE DOCUMENTO
+    # ============================
+
+    if preguntar_doc and doc_id:
+
+        # Sólo los fragmentos del documento relevantes para la pregunta
+        contenido_doc = await asyncio.to_thread(documentos.contexto_para_pregunta, doc_id, mensaje)
+
+        if contenido_doc is not None:
+
+            try:
+
+                resp = await completar(
+                    "documento",
+                    prompt="documento",
+                    messages=mensajes(
+                        "documento",
+                        variable=f"DOCUMENTO:\n{contenido_doc[:12000]}",
+                        usuario=f"PREGUNTA:\n{mensaje}",
+                    ),
+                    temperature=0.2,
+                    max_tokens=700
+                )
+
+                texto = resp.choices[0].message.content.strip()
+
+                return jsonify({
+                    "texto": texto,
+                    "imagenes": [],
+                    "borrar_historial": False
+                })
+
+            except Exception as e:
+
+                return jsonify({
+                    "texto": f"Error analizando documento: {e}",
+                    "imagenes": [],
+                    "borrar_historial": False
+                })
+
+    # 3️⃣ Generar respuesta con identidad correcta
+    respuesta = await generar_respuesta(
+        mensaje,
+        usuario,
+        lat=lat,
+        lon=lon,
+        tz=tz
+    )
+
+    # 4️⃣ Guardar historial con la MISMA identidad
+    texto_para_hist = (
+        respuesta["texto"]
+        if isinstance(respuesta, dict) and "texto" in respuesta
+        else str(respuesta)
+    )
+
+    # se escribe en segundo plano (ver escritura_diferida.py)
+    guardar_en_historial_diferido(usuario, mensaje, texto_para_hist)
+
+    return jsonify(respuesta)
+
+@bp.route("/historial/<usuario_id>")
+def historial(usuario_id):
+    resp = jsonify(cargar_historial(usuario_id))
+    # siempre se revalida; si no cambió, el ETag del middleware da 304
+    resp.headers["Cache-Control"] = "private, no-cache"
+    return resp
+
+@bp.route("/clima")
+def clima():
+    lat = request.args.get("lat")
+    lon = request.args.get("lon")
+    ciudad = request.args.get("ciudad")
+    return obtener_clima(ciudad=ciudad, lat=lat, lon=lon)
+
+@bp.route("/admin/modelos")
+def admin_modelos():
+    # llamadas, latencia y costo por intención y modelo (ver modelos.py)
+    if not es_superusuario(session.get("user_email")):
+        return jsonify({"error": "Acceso denegado"}), 403
+    resp = jsonify({"pid": os.getpid(), "metricas": metricas()})
+    resp.headers["Cache-Control"] = "no-store"
+    return resp
+
+@bp.route('/favicon.ico')
+def favicon():
+    ico = os.path.join(STATIC_DIR, 'favicon.ico')
+    if os.path.exists(ico):
+        return send_file(ico)
+    return "", 204
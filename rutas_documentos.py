@@ -0,0 +1,187 @@
+# rutas_documentos.py
+# -----------------
+# Blueprint de documentos: subir PDF/DOCX (texto en caché por contenido,
+# ver documentos.py) y resumirlos a Word.
+
+import os
+import asyncio
+import uuid
+
+from flask import Blueprint, request, jsonify, send_file, after_this_request
+from werkzeug.utils import secure_filename
+
+from subidas import guardar_subida, limitar_subida, SubidaRechazada
+from modelos import completar
+from prompts import mensajes
+from nucleo import TEMP_DIR, documentos, requiere_premium
+
+bp = Blueprint("documentos", __name__)
+
+
+# ---------------- NUEVOS ENDPOINTS: subir documento (extraer texto) y resumir (crear .docx) ----------------
+@bp.route("/upload_doc", methods=["POST"])
+@requiere_premium
+@limitar_subida("documento")
+def upload_doc():
+    """Recibe PDF o DOCX, extrae texto y lo guarda en caché bajo el SHA-256 del
+    archivo. Devuelve el doc_id (ese hash) que luego se usa para pedir resumen.
+    Si el mismo archivo ya se subió antes, responde al instante sin re-extraer."""
+    if "archivo" not in request.files:
+        return "No se envió archivo", 400
+    file = request.files["archivo"]
+    usuario_id = request.form.get("usuario_id", "anon")
+    filename = secure_filename(file.filename)
+    if filename == "":
+        return "Archivo sin nombre", 400
+    ext = filename.rsplit(".",1)[-1].lower()
+    if ext not in ["pdf", "docx"]:
+        return "Formato no permitido. Solo PDF o DOCX.", 400
+
+    try:
+        subida = guardar_subida(file, TEMP_DIR, "documento")
+    except SubidaRechazada:
+        raise
+    except Exception as e:
+        return f"Error guardando archivo temporal: {e}", 500
+    temp_path = subida["ruta"]
+    doc_id = subida["sha256"]
+
+    @after_this_request
+    def _cleanup(response):
+        # el original ya no hace falta: queda el texto en caché
+        try:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        except:
+            pass
+        return response
+
+    # El contenido tiene que coincidir con la extensión (docx es un zip)
+    if subida["tipo"] != ("pdf" if ext == "pdf" else "zip"):
+        return "El contenido del archivo no coincide con su extensión.", 400
+
+    # ¿Ya lo teníamos? (mismo contenido, aunque cambie el nombre). Sólo se
+    # anota en el log: decírselo al usuario revelaría que otro subió el
+    # mismo archivo.
+    meta = documentos.obtener_documento(doc_id)
+    if meta:
+        print("upload_doc: texto en caché", doc_id[:12])
+        return jsonify(_respuesta_subida(doc_id, filename, meta))
+
+    # extraer texto (PDF en paralelo por páginas) + índice de chunks en caché
+    try:
+        meta = documentos.procesar_documento(doc_id, filename, temp_path, ext)
+    except Exception as e:
+        return f"Error guardando texto temporal: {e}", 500
+
+    if not meta:
+        return "No pude extraer texto del documento.", 400
+
+    # devolvemos doc_id y un snippet para mostrar
+    return jsonify(_respuesta_subida(doc_id, filename, meta))
+
+
+def _respuesta_subida(doc_id, filename, meta):
+    respuesta = {"doc_id": doc_id, "name": filename, "snippet": meta.get("snippet", "")}
+    if meta.get("paginas_sin_leer"):
+        # el OCR se quedó sin tiempo (ver ocr.py): el texto es parcial
+        respuesta["aviso"] = (f"Quedaron {meta['paginas_sin_leer']} páginas escaneadas sin leer: "
+                              "los resúmenes y respuestas usan sólo el resto del documento.")
+    return respuesta
+
+def _crear_docx_resumen(resumen, ruta_doc):
+    from docx import Document as DocxDocument
+
+    doc = DocxDocument()
+
+    doc.add_heading(
+        "Resumen generado por Foschi IA",
+        level=1
+    )
+
+    doc.add_paragraph(resumen)
+
+    doc.save(ruta_doc)
+
+
+@bp.route("/resumir_doc", methods=["POST"])
+@requiere_premium
+async def resumir_doc():
+
+    data = request.get_json()
+
+    doc_id = data.get("doc_id")
+
+    modo = data.get("modo", "normal")
+    if modo not in ("breve", "normal", "profundo"):
+        modo = "normal"
+
+    texto = await asyncio.to_thread(documentos.cargar_texto, doc_id)
+
+    if texto is None:
+        return "Documento no encontrado", 404
+
+    # ============================
+    # TIPOS DE RESUMEN (textos fijos en prompts.py)
+    # ============================
+
+    nombre_prompt = f"resumen_doc_{modo}"
+
+    # ============================
+    # GENERAR RESUMEN IA (o reutilizar el de caché)
+    # ============================
+
+    resumen = await asyncio.to_thread(documentos.resumen_cacheado, doc_id, modo)
+
+    if resumen is None:
+
+        try:
+
+            resp = await completar(
+                "resumen_doc",
+                prompt=nombre_prompt,
+                texto=texto[:15000],
+                messages=mensajes(nombre_prompt, usuario=f"TEXTO:\n{texto[:15000]}"),
+                temperature=0.4,
+                max_tokens=1500
+            )
+
+            resumen = resp.choices[0].message.content.strip()
+
+        except Exception as e:
+
+            return f"Error generando resumen: {e}", 500
+
+        await asyncio.to_thread(documentos.guardar_resumen, doc_id, modo, resumen)
+
+    # ============================
+    # CREAR WORD
+    # ============================
+
+    # doc_id es el hash del contenido, compartido por todos los que suben
+    # el mismo archivo: el Word de cada pedido va con nombre propio
+    nombre_doc = f"resumen_{uuid.uuid4().hex}.docx"
+
+    ruta_doc = os.path.join(TEMP_DIR, nombre_doc)
+
+    # python-docx es CPU: fuera del event loop
+    await asyncio.to_thread(_crear_docx_resumen, resumen, ruta_doc)
+
+    @after_this_request
+    def cleanup(response):
+
+        try:
+
+            if os.path.exists(ruta_doc):
+                os.remove(ruta_doc)
+
+        except:
+            pass
+
+        return response
+
+    return send_file(
+        ruta_doc,
+        as_attachment=True,
+        download_name="resumen_foschi.docx"
+    )
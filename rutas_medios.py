@@ -0,0 +1,544 @@
+# rutas_medios.py
+# -----------------
+# Blueprint de medios: dictado e imagen a Word, edición / generación de
+# imágenes, texto a voz y transcripción de audio.
+
+import os
+import asyncio
+import time
+import uuid
+import threading
+import traceback
+
+from flask import Blueprint, request, jsonify, send_file, after_this_request, Response, stream_with_context
+from werkzeug.utils import secure_filename
+
+from asincronico import cliente_openai
+from subidas import guardar_subida, limitar_subida
+from nucleo import TEMP_DIR, IMAGES_DIR, imagenes, ocr, transcripcion, voz, requiere_premium
+
+bp = Blueprint("medios", __name__)
+
+
+# ---------------- DICTADO A WORD ----------------
+@bp.route("/dictado_word", methods=["POST"])
+@requiere_premium
+def dictado_word():
+    from docx import Document as DocxDocument
+
+    data = request.get_json(silent=True) or {}
+
+    texto = data.get("texto", "").strip()
+
+    if not texto:
+        return jsonify({
+            "ok": False,
+            "error": "Texto vacío"
+        })
+
+    nombre = f"dictado_{uuid.uuid4().hex}.docx"
+
+    ruta = os.path.join(TEMP_DIR, nombre)
+
+    doc = DocxDocument()
+
+    doc.add_heading("Dictado Foschi IA", 0)
+
+    for linea in texto.split("\n"):
+
+        linea = linea.strip()
+
+        if linea:
+            doc.add_paragraph(linea)
+
+    doc.save(ruta)
+
+    @after_this_request
+    def remove_file(response):
+
+        try:
+            if os.path.exists(ruta):
+                os.remove(ruta)
+        except Exception as e:
+            print("Error eliminando temporal:", e)
+
+        return response
+
+    return send_file(
+        ruta,
+        as_attachment=True,
+        download_name="dictado_foschi.docx"
+    )
+
+
+def _crear_docx_imagen(ruta_imagen, texto, salida):
+    from docx import Document as DocxDocument
+    from docx.shared import Inches
+
+    doc = DocxDocument()
+
+    doc.add_heading(
+        "Documento extraído",
+        0
+    )
+
+    doc.add_picture(
+        ruta_imagen,
+        width=Inches(4)
+    )
+
+    doc.add_paragraph(texto)
+
+    doc.save(salida)
+
+
+@bp.route(
+    "/imagen_a_word",
+    methods=["POST"]
+)
+@limitar_subida("imagen")
+async def imagen_a_word():
+
+    # Multipart, disco, OCR local, python-docx y la visión de respaldo
+    # (cliente sync) bloquean: todo va en hilos, como en editar_imagen
+    archivos = await asyncio.to_thread(lambda: request.files)
+
+    if "imagen" not in archivos:
+        return "No se recibió imagen",400
+
+    archivo = archivos["imagen"]
+
+    subida = await asyncio.to_thread(
+        guardar_subida,
+        archivo,
+        IMAGES_DIR,
+        "imagen",
+        nombre_destino=uuid.uuid4().hex + os.path.splitext(secure_filename(archivo.filename or ""))[1]
+    )
+
+    ruta_imagen = subida["ruta"]
+    preparada = None
+
+    try:
+
+        # Copia orientada según EXIF, reducida a la resolución que usa el
+        # modelo y sin metadatos (para la visión y para el Word)
+        preparada = await asyncio.to_thread(imagenes.preparar_en_pool, ruta_imagen, "vision")
+
+        # OCR local primero; sólo si la confianza es baja va a gpt-4o
+        texto, _origen = await asyncio.to_thread(
+            ocr.extraer_texto_imagen, ruta_imagen, subida["mime"], preparada=preparada)
+
+        salida = os.path.join(
+            TEMP_DIR,
+            "ocr_" +
+            uuid.uuid4().hex +
+            ".docx"
+        )
+
+        await asyncio.to_thread(_crear_docx_imagen, preparada["ruta"], texto, salida)
+
+        @after_this_request
+        def remove_file(response):
+
+            try:
+
+                if os.path.exists(salida):
+                    os.remove(salida)
+
+                if os.path.exists(ruta_imagen):
+                    os.remove(ruta_imagen)
+
+                if os.path.exists(preparada["ruta"]):
+                    os.remove(preparada["ruta"])
+
+            except Exception as e:
+                print("Error eliminando temporales:", e)
+
+            return response
+
+        return send_file(
+            salida,
+            as_attachment=True,
+            download_name="imagen_extraida.docx"
+        )
+
+    except Exception as e:
+
+        try:
+            if os.path.exists(ruta_imagen):
+                os.remove(ruta_imagen)
+            if preparada and os.path.exists(preparada["ruta"]):
+                os.remove(preparada["ruta"])
+        except Exception:
+            pass
+
+        return str(e),500
+      
+@bp.route(
+    "/editar_imagen",
+    methods=["POST"]
+)
+@limitar_subida("imagen", respuesta_json=True)
+async def editar_imagen():
+
+    # Leer el multipart y escribir a disco bloquea: va en hilos, porque el
+    # event loop lo comparten todos los requests (ver asincronico.py)
+    archivos = await asyncio.to_thread(lambda: request.files)
+
+    if "imagen" not in archivos:
+        return jsonify({
+            "ok": False,
+            "error": "No se recibió imagen"
+        }), 400
+
+    imagen = archivos["imagen"]
+
+    print("NOMBRE:", imagen.filename)
+    print("TIPO:", imagen.content_type)
+
+    # Se guarda en disco por bloques (no se lee entera en memoria)
+    subida = await asyncio.to_thread(guardar_subida, imagen, IMAGES_DIR, "imagen")
+    preparada = None
+
+    try:
+
+        # Orientada, reducida (la salida es 1024x1024) y en WEBP sin
+        # metadatos: el upload a OpenAI pasa de varios MB a unos cientos de KB
+        preparada = await asyncio.to_thread(imagenes.preparar_en_pool, subida["ruta"], "edicion")
+
+        # "quality" alto da más detalle pero tarda mucho más y puede
+        # provocar timeouts del servidor/proxy. "medium" es un buen
+        # equilibrio; podés probar "high" si tu hosting lo soporta.
+        with open(preparada["ruta"], "rb") as contenido:
+            resultado = await cliente_openai().images.edit(
+                model="gpt-image-1",
+                image=contenido,
+                prompt=request.form.get(
+                    "prompt",
+                    ""
+                ),
+                size="1024x1024",
+                quality="medium"
+            )
+
+        imagen_id = await asyncio.to_thread(imagenes.guardar_generada, resultado.data[0].b64_json)
+
+        return jsonify({
+            "ok": True,
+            "url": f"/imagen_generada/{imagen_id}"
+        })
+
+    except Exception as e:
+
+        print("ERROR EDITAR IMAGEN:")
+        print(str(e))
+
+        return jsonify({
+            "ok": False,
+            "error": str(e)
+        }), 500
+
+    finally:
+
+        try:
+            if os.path.exists(subida["ruta"]):
+                os.remove(subida["ruta"])
+            if preparada and os.path.exists(preparada["ruta"]):
+                os.remove(preparada["ruta"])
+        except Exception:
+            pass
+
+
+@bp.route(
+    "/generar_imagen",
+    methods=["POST"]
+)
+async def generar_imagen():
+
+    try:
+
+        data = request.get_json(silent=True) or {}
+        prompt = (data.get("prompt") or "").strip()
+
+        if not prompt:
+            return jsonify({
+                "ok": False,
+                "error": "No se recibió descripción para generar la imagen"
+            }), 400
+
+        # "quality" alto da más detalle pero tarda mucho más y puede
+        # provocar timeouts del servidor/proxy. "medium" es un buen
+        # equilibrio; podés probar "high" si tu hosting lo soporta.
+        resultado = await cliente_openai().images.generate(
+            model="gpt-image-1",
+            prompt=prompt,
+            size="1024x1024",
+            quality="medium"
+        )
+
+        imagen_id = await asyncio.to_thread(imagenes.guardar_generada, resultado.data[0].b64_json)
+
+        return jsonify({
+            "ok": True,
+            "url": f"/imagen_generada/{imagen_id}"
+        })
+
+    except Exception as e:
+
+        print("ERROR GENERAR IMAGEN:")
+        print(str(e))
+
+        return jsonify({
+            "ok": False,
+            "error": str(e)
+        }), 500
+
+@bp.route("/imagen_generada/<imagen_id>")
+def imagen_generada(imagen_id):
+    # El id es el hash del contenido: la URL nunca cambia de imagen, así
+    # que se puede cachear sin revalidar mientras dure el TTL del almacén.
+    ruta = imagenes.ruta_generada(imagen_id)
+    if not ruta:
+        return "Imagen no encontrada o vencida", 404
+
+    resp = send_file(ruta, mimetype=imagenes.mime_generada(imagen_id), conditional=True, etag=imagen_id)
+    resp.headers["Cache-Control"] = "private, max-age=86400, immutable"
+    return resp
+
+@bp.route("/tts")
+def tts():
+    texto = request.args.get("texto","")
+    lang = request.args.get("lang", "es")
+    tld = request.args.get("tld", "com.mx")
+
+    if not voz.idioma_valido(lang):
+        return f"Error TTS: idioma no soportado ({lang})", 400
+
+    # El navegador ya tiene este audio: no hace falta ni leer el caché
+    if request.if_none_match.contains(voz.etag_tts(texto, lang, tld)):
+        return "", 304
+
+    try:
+        # Audio por oraciones, desde caché en disco o sintetizado en paralelo
+        # (ver voz.py). Se manda en stream: suena la primera oración
+        # mientras se generan las siguientes.
+        partes, mimetype, etag = voz.audio_tts(texto, lang=lang, tld=tld)
+    except voz.TTSNoDisponible as e:
+        return f"Error TTS: {e}", 400 if not texto.strip() else 503
+    except Exception as e:
+        return f"Error TTS: {e}", 500
+
+    resp = Response(stream_with_context(partes), mimetype=mimetype)
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = "private, max-age=86400"
+    return resp
+
+
+# ---------------- AUDIO A WORD DOCX ----------------
+# Los audios largos se cortan en tramos y se transcriben en paralelo
+# (ver transcripcion.py). Con modo=job el proceso corre en segundo plano y
+# el front-end consulta el progreso por job_id, igual que las presentaciones.
+# El backend (API de OpenAI o whisper local) lo elige la configuración del
+# servidor (TRANSCRIPCION_BACKEND), nunca el cliente.
+TRANSCRIPCIONES_JOBS = {}
+TRANSCRIPCIONES_LOCK = threading.Lock()
+TRANSCRIPCIONES_TTL_HORAS = float(os.getenv("TRANSCRIPCIONES_TTL_HORAS", "6"))
+_ultimo_barrido = [0.0]
+
+
+def _crear_docx_transcripcion(texto_transcrito):
+    """Arma el Word con la transcripción y devuelve su ruta."""
+    from docx import Document as DocxDocument
+
+    docx_path = os.path.join("temp", f"transcripcion_{uuid.uuid4().hex}.docx")
+    doc = DocxDocument()
+    doc.add_heading("Transcripción de audio", level=1)
+    doc.add_paragraph(texto_transcrito)
+    doc.add_page_break()
+    doc.save(docx_path)
+    return docx_path
+
+
+def _barrer_transcripciones(ttl_horas=TRANSCRIPCIONES_TTL_HORAS):
+    """Olvida los jobs (y borra sus .docx) que nadie descargó en el TTL;
+    como mucho una pasada cada 10 minutos."""
+    ahora = time.time()
+    if ahora - _ultimo_barrido[0] < 600:
+        return
+    _ultimo_barrido[0] = ahora
+
+    limite = ahora - ttl_horas * 3600
+    with TRANSCRIPCIONES_LOCK:
+        vencidos = [
+            job_id for job_id, job in TRANSCRIPCIONES_JOBS.items()
+            if job["status"] != "procesando" and job["creado"] < limite
+        ]
+        rutas = [TRANSCRIPCIONES_JOBS.pop(job_id).get("ruta") for job_id in vencidos]
+    for ruta in rutas:
+        try:
+            if ruta and os.path.exists(ruta):
+                os.remove(ruta)
+        except OSError:
+            pass
+
+
+def _procesar_transcripcion_job(job_id, temp_path):
+    """Corre en un hilo aparte: transcribe por tramos, actualiza el progreso
+    del job y deja el .docx listo para descargar."""
+
+    def _progreso(hechos, total):
+        with TRANSCRIPCIONES_LOCK:
+            job = TRANSCRIPCIONES_JOBS.get(job_id)
+            if job:
+                job["progreso"] = {"hechos": hechos, "total": total}
+
+    try:
+        texto_transcrito = transcripcion.transcribir_audio(temp_path, progreso=_progreso)
+        docx_path = _crear_docx_transcripcion(texto_transcrito)
+        with TRANSCRIPCIONES_LOCK:
+            TRANSCRIPCIONES_JOBS[job_id].update({"status": "listo", "ruta": docx_path})
+    except Exception as e:
+        print("ERROR EN JOB DE TRANSCRIPCION:", e)
+        traceback.print_exc()
+        with TRANSCRIPCIONES_LOCK:
+            TRANSCRIPCIONES_JOBS[job_id].update({"status": "error", "error": f"Error en transcripción: {e}"})
+    finally:
+        try:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        except Exception:
+            pass
+
+
+@bp.route("/upload_audio", methods=["POST"])
+@requiere_premium
+@limitar_subida("audio")
+def upload_audio():
+    if "audio" not in request.files:
+        return "No se envió archivo", 400
+    
+    file = request.files["audio"]
+    usuario_id = request.form.get("usuario_id", "anon")
+    modo = request.form.get("modo", "")
+
+    # Guardar archivo temporal (por bloques, validando tamaño y formato)
+    subida = guardar_subida(file, "temp", "audio")
+    filename = subida["nombre"]
+    temp_path = subida["ruta"]
+
+    # ---- MODO JOB: responde ya y se consulta /estado_transcripcion ----
+    if modo == "job":
+        _barrer_transcripciones()
+        job_id = uuid.uuid4().hex
+        with TRANSCRIPCIONES_LOCK:
+            TRANSCRIPCIONES_JOBS[job_id] = {
+                "status": "procesando",
+                "ruta": None,
+                "error": None,
+                "nombre": filename.rsplit(".", 1)[0] + ".docx",
+                "progreso": {"hechos": 0, "total": 0},
+                "creado": time.time()
+            }
+        threading.Thread(
+            target=_procesar_transcripcion_job,
+            args=(job_id, temp_path),
+            daemon=True
+        ).start()
+        return jsonify({"ok": True, "job_id": job_id})
+
+    docx_path = None  # PREVENIR ERROR EN finally
+
+    try:
+        # ---- TRANSCRIPCIÓN (por tramos si el audio es largo) ----
+        texto_transcrito = transcripcion.transcribir_audio(temp_path)
+
+        # ---- CREAR DOCX ----
+        nombre_docx = filename.rsplit(".", 1)[0] + ".docx"
+        docx_path = _crear_docx_transcripcion(texto_transcrito)
+
+        # --- programar limpieza después de responder ---
+        @after_this_request
+        def _cleanup(response):
+            try:
+                if os.path.exists(docx_path):
+                    os.remove(docx_path)
+            except Exception:
+                pass
+            try:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            except Exception:
+                pass
+            return response
+
+        # ---- ENVIAR DOCX ----
+        return send_file(
+            docx_path,
+            as_attachment=True,
+            mimetype="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            download_name=nombre_docx
+        )
+
+    except Exception as e:
+        # intentar limpiar si algo quedó
+        try:
+            if docx_path and os.path.exists(docx_path):
+                os.remove(docx_path)
+        except:
+            pass
+        try:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        except:
+            pass
+        status = 413 if isinstance(e, transcripcion.AudioDemasiadoGrande) else 500
+        return f"Error en transcripción: {str(e)}", status
+
+
+@bp.route("/estado_transcripcion/<job_id>")
+@requiere_premium
+def estado_transcripcion(job_id):
+    with TRANSCRIPCIONES_LOCK:
+        job = TRANSCRIPCIONES_JOBS.get(job_id)
+        job = dict(job) if job else None
+
+    if not job:
+        return jsonify({"ok": False, "error": "Job no encontrado"}), 404
+
+    return jsonify({
+        "ok": True,
+        "status": job["status"],
+        "progreso": job["progreso"],
+        "error": job.get("error")
+    })
+
+
+@bp.route("/descargar_transcripcion/<job_id>")
+@requiere_premium
+def descargar_transcripcion(job_id):
+    with TRANSCRIPCIONES_LOCK:
+        job = TRANSCRIPCIONES_JOBS.get(job_id)
+
+    if not job or job["status"] != "listo" or not job.get("ruta"):
+        return jsonify({"ok": False, "error": "La transcripción todavía no está lista"}), 404
+
+    ruta_docx = job["ruta"]
+
+    @after_this_request
+    def _cleanup(response):
+        try:
+            if os.path.exists(ruta_docx):
+                os.remove(ruta_docx)
+        except Exception:
+            pass
+        with TRANSCRIPCIONES_LOCK:
+            TRANSCRIPCIONES_JOBS.pop(job_id, None)
+        return response
+
+    return send_file(
+        ruta_docx,
+        as_attachment=True,
+        mimetype="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        download_name=job["nombre"]
+    )
@@ -0,0 +1,179 @@
+# rutas_pagos.py
+# -----------------
+# Blueprint de cuentas y pagos: login / registro, preferencia de
+# MercadoPago, webhook de pagos y listado de administración.
+
+import os
+
+from flask import Blueprint, request, session, jsonify, redirect
+
+from carga_diferida import Diferido
+from usuarios import registrar_usuario, autenticar_usuario
+from suscripciones import activar_premium
+
+bp = Blueprint("pagos", __name__)
+
+
+# ---------------- MERCADOPAGO ----------------
+def _crear_sdk_mercadopago():
+    import mercadopago
+    return mercadopago.SDK(os.getenv("MP_ACCESS_TOKEN"))
+
+
+sdk = Diferido(_crear_sdk_mercadopago)
+
+
+# ---------------- CUENTAS ----------------
+@bp.route("/auth/register", methods=["POST"])
+def register():
+    data = request.get_json()
+
+    email = data.get("email", "").lower().strip()
+    password = data.get("password", "")
+
+    ok, msg = registrar_usuario(email, password)
+    if not ok:
+        return jsonify({"ok": False, "msg": msg})
+
+    # login automático
+    session["user_email"] = email
+    return jsonify({"ok": True})
+
+@bp.route("/auth/login", methods=["POST"])
+def login():
+    data = request.get_json()
+
+    email = data.get("email", "").lower().strip()
+    password = data.get("password", "")
+
+    if not autenticar_usuario(email, password):
+        return jsonify({"ok": False, "msg": "Credenciales incorrectas"})
+
+    session["user_email"] = email
+    return jsonify({"ok": True})
+
+@bp.route("/auth/logout")
+def logout():
+    session.pop("user_email", None)
+    return redirect("/")
+
+@bp.route("/premium")
+def premium():
+
+    # 1️⃣ Verificar login
+    usuario = session.get("user_email")
+    if not usuario:
+        return jsonify({"error": "No logueado"}), 401
+
+    # 2️⃣ Determinar tipo de plan
+    tipo = request.args.get("tipo", "mensual")
+
+    if tipo == "anual":
+        titulo = "Foschi IA Premium Anual (12 meses PAGA 10)"
+        precio = 100000   # 🔥 10 meses pagos
+    else:
+        titulo = "Foschi IA Premium Mensual"
+        precio = 10000
+
+    # 3️⃣ Crear preferencia MercadoPago
+    pref = {
+        "items": [{
+            "title": titulo,
+            "quantity": 1,
+            "unit_price": precio
+        }],
+        "external_reference": usuario,
+        "notification_url": "https://foschi-ia.onrender.com/webhook/mp"
+    }
+
+    preference = sdk.preference().create(pref)
+    return jsonify(preference["response"])
+
+@bp.route("/webhook/mp", methods=["POST"])
+def webhook_mp():
+    data = request.json
+
+    if not data or "data" not in data:
+        return "ok"
+
+    if data.get("type") != "payment":
+        return "ok"
+
+    payment_id = data["data"].get("id")
+    if not payment_id:
+        return "ok"
+
+    payment = sdk.payment().get(payment_id)
+    info = payment.get("response", {})
+
+    # 🔐 VALIDAR QUE EL PAGO SEA TUYO
+    if info.get("merchant_account_id") != os.getenv("MP_MERCHANT_ID"):
+        return "ok"
+
+    if info.get("status") != "approved":
+        return "ok"
+
+    usuario = info.get("external_reference")
+    if not usuario:
+        return "ok"
+
+    from pagos import pago_ya_registrado, registrar_pago
+    if pago_ya_registrado(str(payment_id)):
+        return "ok"
+
+    items = info.get("additional_info", {}).get("items", [])
+    titulo = items[0]["title"] if items else ""
+    plan = "anual" if "12" in titulo or "Anual" in titulo else "mensual"
+
+    monto = info.get("transaction_amount", 0)
+
+    activar_premium(usuario, plan)
+
+    registrar_pago(
+        usuario=usuario,
+        monto=monto,
+        plan=plan,
+        payment_id=str(payment_id)
+    )
+
+    return "ok"
+
+@bp.route("/admin/pagos")
+def admin_pagos():
+    import json, os
+
+    # 🔐 clave simple (después se mejora)
+    if request.args.get("key") != "foschi_admin_2026":
+        return "Acceso denegado", 403
+
+    archivo = "data/pagos.json"
+    if not os.path.exists(archivo):
+        return "<h2>No hay pagos todavía</h2>"
+
+    pagos = json.load(open(archivo))
+
+    html = """
+    <h2>💎 Pagos Foschi IA</h2>
+    <table border="1" cellpadding="8">
+      <tr>
+        <th>Usuario</th>
+        <th>Plan</th>
+        <th>Fecha</th>
+        <th>Payment ID</th>
+        <th>Status</th>
+      </tr>
+    """
+
+    for u, p in pagos.items():
+        html += f"""
+        <tr>
+          <td>{u}</td>
+          <td>{p['plan']}</td>
+          <td>{p['fecha']}</td>
+          <td>{p['payment_id']}</td>
+          <td>{p['status']}</td>
+        </tr>
+        """
+
+    html += "</table>"
+    return html
@@ -0,0 +1,599 @@
+# rutas_presentaciones.py
+# -----------------
+# Blueprint de presentaciones: genera .pptx con IA en segundo plano
+# (/generar_presentacion → /estado_presentacion → /descargar_presentacion).
+
+import os
+import uuid
+import base64
+import threading
+import traceback
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Blueprint, request, jsonify, send_file, after_this_request
+
+from json_parcial import LectorDiapositivas
+from subidas import guardar_subida, limitar_subida, SubidaRechazada
+from superusuarios import es_superusuario
+from suscripciones import usuario_premium
+from nucleo import APP_NAME, TEMP_DIR, client, documentos, requiere_premium
+
+bp = Blueprint("presentaciones", __name__)
+
+
+# ---------------- GENERADOR DE PRESENTACIONES (PPTX) ----------------
+
+# Generar la presentación (texto IA + imágenes IA) puede tardar más de lo que
+# permite el timeout del servidor/proxy si se hace todo en una sola request
+# (eso provoca errores 500/502). Por eso el proceso se hace en un hilo en
+# segundo plano y el front-end consulta el estado por separado.
+PRESENTACIONES_JOBS = {}
+PRESENTACIONES_LOCK = threading.Lock()
+
+
+# Esquema para el modo "structured output" de OpenAI: obliga al modelo a
+# devolver exactamente esta forma, sin texto extra ni bloques de markdown.
+ESQUEMA_PRESENTACION = {
+    "type": "object",
+    "properties": {
+        "titulo_presentacion": {"type": "string"},
+        "subtitulo": {"type": "string"},
+        "diapositivas": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "titulo": {"type": "string"},
+                    "bullets": {"type": "array", "items": {"type": "string"}},
+                    "notas": {"type": "string"},
+                    "imagen_prompt": {"type": "string"}
+                },
+                "required": ["titulo", "bullets", "notas", "imagen_prompt"],
+                "additionalProperties": False
+            }
+        }
+    },
+    "required": ["titulo_presentacion", "subtitulo", "diapositivas"],
+    "additionalProperties": False
+}
+
+
+def generar_estructura_presentacion(contenido_base, tema, num_slides=8, al_completar_diapositiva=None):
+    """
+    Usa OpenAI (structured output + stream) para generar la estructura de una
+    presentación. Devuelve un dict con 'titulo_presentacion', 'subtitulo' y
+    'diapositivas' (lista de {'titulo','bullets','notas','imagen_prompt'}),
+    o None si falla.
+
+    al_completar_diapositiva(idx, diapositiva): callback opcional que se
+    llama apenas cada diapositiva termina de llegar, sin esperar al resto
+    (sirve para arrancar la imagen de la 1 mientras se escribe la 8).
+    Si el stream se corta, se devuelven las diapositivas que llegaron enteras.
+    """
+    lector = LectorDiapositivas()
+    try:
+        cliente = client
+
+        if contenido_base and contenido_base.strip():
+            fuente = (
+                "Basate en el siguiente contenido/documento para armar la presentación:\n\n"
+                f"{contenido_base[:12000]}\n\n"
+                f"Enfoque adicional pedido por el usuario (si aplica): {tema or 'usar el contenido tal cual, resumido'}"
+            )
+        else:
+            fuente = f"Tema de la presentación: {tema}"
+
+        prompt = f"""
+Sos un diseñador experto de presentaciones corporativas. Generá la estructura de una
+presentación de PowerPoint de {num_slides} diapositivas (sin contar la portada), en español.
+
+{fuente}
+
+Campos:
+- titulo_presentacion: título principal de la presentación.
+- subtitulo: subtítulo o frase introductoria corta.
+- diapositivas: lista de diapositivas, cada una con:
+  - titulo: título de la diapositiva.
+  - bullets: entre 3 y 5 puntos breves, claros y sin repetir el título.
+  - notas: notas para el orador (1-2 frases).
+  - imagen_prompt: descripción corta EN INGLÉS para generar una imagen ilustrativa con IA, sin texto dentro de la imagen.
+
+Reglas:
+- Generá exactamente {num_slides} diapositivas dentro de "diapositivas".
+"""
+
+        stream = cliente.chat.completions.create(
+            model="gpt-4o",
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.6,
+            max_tokens=3500,
+            response_format={
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "presentacion",
+                    "strict": True,
+                    "schema": ESQUEMA_PRESENTACION
+                }
+            },
+            stream=True
+        )
+
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            nuevas = lector.alimentar(chunk.choices[0].delta.content)
+            if not nuevas or not al_completar_diapositiva:
+                continue
+            primera = len(lector.diapositivas) - len(nuevas)
+            for i, dia in enumerate(nuevas):
+                try:
+                    al_completar_diapositiva(primera + i, dia)
+                except Exception:
+                    traceback.print_exc()
+
+    except Exception as e:
+        print("Error generando estructura de presentación:", e)
+        traceback.print_exc()
+
+    # Si el JSON vino completo se usa tal cual; si se cortó, se rescatan
+    # las diapositivas que llegaron enteras en lugar de descartar todo.
+    estructura = lector.resultado()
+    if not estructura:
+        return None
+
+    if lector.reparado:
+        print(f"Estructura de presentación reparada: {len(lector.diapositivas)} diapositivas rescatadas")
+
+    return estructura
+
+
+def generar_imagen_presentacion_bytes(prompt_imagen):
+    """Genera una imagen con IA para una diapositiva. Devuelve bytes PNG o None si falla."""
+    try:
+        cliente = client
+        resultado = cliente.images.generate(
+            model="gpt-image-1",
+            prompt=prompt_imagen or "ilustración abstracta minimalista, colores azules",
+            size="1024x1024",
+            quality="medium"
+        )
+        b64 = resultado.data[0].b64_json
+        return base64.b64decode(b64)
+    except Exception as e:
+        print("Error generando imagen para presentación:", e)
+        traceback.print_exc()
+        return None
+
+
+def _agregar_fondo(slide, prs, color):
+    """Agrega un rectángulo de fondo de color sólido a toda la diapositiva."""
+    from pptx.enum.shapes import MSO_SHAPE
+
+    fondo = slide.shapes.add_shape(
+        MSO_SHAPE.RECTANGLE, 0, 0, prs.slide_width, prs.slide_height
+    )
+    fondo.fill.solid()
+    fondo.fill.fore_color.rgb = color
+    fondo.line.fill.background()
+    fondo.shadow.inherit = False
+    # Enviar el fondo detrás de los demás elementos
+    spTree = slide.shapes._spTree
+    spTree.remove(fondo._element)
+    spTree.insert(2, fondo._element)
+    return fondo
+
+
+def construir_pptx(estructura, incluir_imagenes=True, video_paths=None, imagenes_generadas=None):
+    """
+    Construye un archivo .pptx a partir de la estructura generada por IA.
+    video_paths: lista de rutas a archivos de video cortos (opcional) para
+    insertar en las primeras diapositivas en lugar de imágenes generadas.
+    imagenes_generadas: dict opcional {idx: bytes PNG} con imágenes que ya se
+    generaron mientras llegaba la estructura; sólo se generan las que falten.
+    Devuelve la ruta del archivo .pptx generado (en TEMP_DIR).
+    """
+    from pptx import Presentation
+    from pptx.util import Inches as PptxInches, Pt
+    from pptx.dml.color import RGBColor
+    from pptx.enum.text import PP_ALIGN
+    from pptx.enum.shapes import MSO_SHAPE
+
+    prs = Presentation()
+    prs.slide_width = PptxInches(13.333)
+    prs.slide_height = PptxInches(7.5)
+
+    COLOR_FONDO = RGBColor(0x00, 0x14, 0x24)
+    COLOR_TITULO = RGBColor(0x00, 0xEA, 0xFF)
+    COLOR_TEXTO = RGBColor(0xFF, 0xFF, 0xFF)
+    COLOR_ACENTO = RGBColor(0x33, 0xAA, 0xCC)
+
+    blank_layout = prs.slide_layouts[6]
+
+    # ---- Diapositiva de portada ----
+    slide = prs.slides.add_slide(blank_layout)
+    _agregar_fondo(slide, prs, COLOR_FONDO)
+
+    titulo_box = slide.shapes.add_textbox(
+        PptxInches(1), PptxInches(2.6), PptxInches(11.3), PptxInches(1.8)
+    )
+    tf = titulo_box.text_frame
+    tf.word_wrap = True
+    p = tf.paragraphs[0]
+    p.text = estructura.get("titulo_presentacion") or "Presentación"
+    p.font.size = Pt(44)
+    p.font.bold = True
+    p.font.color.rgb = COLOR_TITULO
+    p.alignment = PP_ALIGN.CENTER
+
+    sub = estructura.get("subtitulo") or ""
+    if sub:
+        sub_box = slide.shapes.add_textbox(
+            PptxInches(1), PptxInches(4.3), PptxInches(11.3), PptxInches(1)
+        )
+        tf2 = sub_box.text_frame
+        tf2.word_wrap = True
+        p2 = tf2.paragraphs[0]
+        p2.text = sub
+        p2.font.size = Pt(22)
+        p2.font.color.rgb = COLOR_TEXTO
+        p2.alignment = PP_ALIGN.CENTER
+
+    pie = slide.shapes.add_textbox(
+        PptxInches(1), PptxInches(6.7), PptxInches(11.3), PptxInches(0.5)
+    )
+    pf = pie.text_frame.paragraphs[0]
+    pf.text = f"Generado por {APP_NAME}"
+    pf.font.size = Pt(12)
+    pf.font.color.rgb = COLOR_ACENTO
+    pf.alignment = PP_ALIGN.CENTER
+
+    # ---- Diapositivas de contenido ----
+    diapositivas = estructura.get("diapositivas", [])
+    video_paths = video_paths or []
+    video_idx = 0
+
+    # Pre-generar TODAS las imágenes en paralelo (si corresponde) para no
+    # acumular tiempos de espera secuenciales y evitar timeouts del servidor.
+    imagenes_por_slide = [None] * len(diapositivas)
+    if incluir_imagenes:
+        imagenes_generadas = imagenes_generadas or {}
+        indices_a_generar = []
+        prompts_a_generar = []
+        for idx, dia in enumerate(diapositivas):
+            if idx < len(video_paths):
+                continue  # esa diapositiva usará video, no imagen
+            if imagenes_generadas.get(idx):
+                imagenes_por_slide[idx] = imagenes_generadas[idx]
+                continue
+            img_prompt = dia.get("imagen_prompt") or dia.get("titulo") or estructura.get("titulo_presentacion", "")
+            indices_a_generar.append(idx)
+            prompts_a_generar.append(img_prompt)
+
+        if prompts_a_generar:
+            try:
+                with ThreadPoolExecutor(max_workers=min(5, len(prompts_a_generar))) as executor:
+                    resultados = list(executor.map(generar_imagen_presentacion_bytes, prompts_a_generar))
+                for idx, img_bytes in zip(indices_a_generar, resultados):
+                    imagenes_por_slide[idx] = img_bytes
+            except Exception:
+                print("Error generando imágenes en paralelo:")
+                traceback.print_exc()
+
+    for idx, dia in enumerate(diapositivas):
+        slide = prs.slides.add_slide(blank_layout)
+        _agregar_fondo(slide, prs, COLOR_FONDO)
+
+        hay_video = video_idx < len(video_paths)
+        hay_media = hay_video or incluir_imagenes
+        ancho_texto = PptxInches(7.0) if hay_media else PptxInches(11.7)
+
+        # Título
+        titulo_box = slide.shapes.add_textbox(
+            PptxInches(0.6), PptxInches(0.4), PptxInches(12.1), PptxInches(1)
+        )
+        tf = titulo_box.text_frame
+        tf.word_wrap = True
+        p = tf.paragraphs[0]
+        p.text = dia.get("titulo") or f"Diapositiva {idx + 1}"
+        p.font.size = Pt(30)
+        p.font.bold = True
+        p.font.color.rgb = COLOR_TITULO
+
+        # Línea decorativa bajo el título
+        linea = slide.shapes.add_shape(
+            MSO_SHAPE.RECTANGLE, PptxInches(0.6), PptxInches(1.35), PptxInches(3.5), Pt(3)
+        )
+        linea.fill.solid()
+        linea.fill.fore_color.rgb = COLOR_TITULO
+        linea.line.fill.background()
+        linea.shadow.inherit = False
+
+        # Bullets
+        contenido_box = slide.shapes.add_textbox(
+            PptxInches(0.6), PptxInches(1.7), ancho_texto, PptxInches(5.3)
+        )
+        tf = contenido_box.text_frame
+        tf.word_wrap = True
+        bullets = dia.get("bullets") or []
+        if not bullets:
+            bullets = [dia.get("contenido", "")] if dia.get("contenido") else []
+        for i, b in enumerate(bullets):
+            if i == 0:
+                p = tf.paragraphs[0]
+            else:
+                p = tf.add_paragraph()
+            p.text = "•  " + str(b)
+            p.font.size = Pt(20)
+            p.font.color.rgb = COLOR_TEXTO
+            p.space_after = Pt(14)
+
+        # Notas del orador
+        notas = dia.get("notas") or ""
+        if notas:
+            try:
+                slide.notes_slide.notes_text_frame.text = notas
+            except Exception:
+                pass
+
+        # Imagen o video a la derecha
+        if hay_video:
+            video_path = video_paths[video_idx]
+            video_idx += 1
+            try:
+                with open(video_path, "rb") as vf:
+                    video_bytes = BytesIO(vf.read())
+                slide.shapes.add_movie(
+                    video_bytes,
+                    PptxInches(8.1), PptxInches(1.7),
+                    PptxInches(4.6), PptxInches(3.5),
+                    mime_type="video/mp4"
+                )
+            except Exception:
+                print("Error insertando video en presentación:")
+                traceback.print_exc()
+        elif incluir_imagenes:
+            img_bytes = imagenes_por_slide[idx]
+            if img_bytes:
+                try:
+                    img_stream = BytesIO(img_bytes)
+                    slide.shapes.add_picture(
+                        img_stream, PptxInches(8.1), PptxInches(1.7), width=PptxInches(4.6)
+                    )
+                except Exception:
+                    print("Error insertando imagen en presentación:")
+                    traceback.print_exc()
+
+    # ---- Videos sobrantes: se agregan como diapositivas extra ----
+    while video_idx < len(video_paths):
+        slide = prs.slides.add_slide(blank_layout)
+        _agregar_fondo(slide, prs, COLOR_FONDO)
+
+        titulo_box = slide.shapes.add_textbox(
+            PptxInches(0.6), PptxInches(0.4), PptxInches(12.1), PptxInches(1)
+        )
+        p = titulo_box.text_frame.paragraphs[0]
+        p.text = "Video"
+        p.font.size = Pt(30)
+        p.font.bold = True
+        p.font.color.rgb = COLOR_TITULO
+
+        video_path = video_paths[video_idx]
+        video_idx += 1
+        try:
+            with open(video_path, "rb") as vf:
+                video_bytes = BytesIO(vf.read())
+            slide.shapes.add_movie(
+                video_bytes,
+                PptxInches(2.0), PptxInches(1.5),
+                PptxInches(9.3), PptxInches(5.6),
+                mime_type="video/mp4"
+            )
+        except Exception:
+            print("Error insertando video extra en presentación:")
+            traceback.print_exc()
+
+    nombre = f"presentacion_{uuid.uuid4().hex}.pptx"
+    ruta = os.path.join(TEMP_DIR, nombre)
+    prs.save(ruta)
+    return ruta
+
+
+def _procesar_presentacion_job(job_id, contenido_base, tema, titulo_pres, num_slides, incluir_imagenes, video_paths):
+    """Corre en un hilo aparte: genera la estructura con IA, construye el .pptx
+    y actualiza el estado del job. Al final borra los videos temporales subidos.
+
+    Las imágenes se encargan a medida que cada diapositiva termina de llegar
+    del stream, así se generan en paralelo con el resto del texto."""
+    executor = ThreadPoolExecutor(max_workers=5) if incluir_imagenes else None
+    futuros_imagenes = {}
+    cant_videos = len(video_paths or [])
+
+    def _al_completar_diapositiva(idx, dia):
+        if executor is None or idx < cant_videos:
+            return  # sin imágenes, o esa diapositiva usará video
+        img_prompt = dia.get("imagen_prompt") or dia.get("titulo") or tema
+        futuros_imagenes[idx] = executor.submit(generar_imagen_presentacion_bytes, img_prompt)
+
+    try:
+        estructura = generar_estructura_presentacion(
+            contenido_base, tema, num_slides,
+            al_completar_diapositiva=_al_completar_diapositiva
+        )
+        if not estructura:
+            with PRESENTACIONES_LOCK:
+                PRESENTACIONES_JOBS[job_id] = {
+                    "status": "error",
+                    "ruta": None,
+                    "error": "No pude generar el contenido de la presentación. Probá de nuevo en unos segundos."
+                }
+            return
+
+        if titulo_pres:
+            estructura["titulo_presentacion"] = titulo_pres
+
+        imagenes_generadas = {}
+        for idx, futuro in futuros_imagenes.items():
+            try:
+                imagenes_generadas[idx] = futuro.result()
+            except Exception:
+                traceback.print_exc()
+
+        ruta_pptx = construir_pptx(
+            estructura,
+            incluir_imagenes=incluir_imagenes,
+            video_paths=video_paths,
+            imagenes_generadas=imagenes_generadas
+        )
+
+        with PRESENTACIONES_LOCK:
+            PRESENTACIONES_JOBS[job_id] = {
+                "status": "listo",
+                "ruta": ruta_pptx,
+                "error": None
+            }
+
+    except Exception as e:
+        print("ERROR EN JOB DE PRESENTACION:", e)
+        traceback.print_exc()
+        with PRESENTACIONES_LOCK:
+            PRESENTACIONES_JOBS[job_id] = {
+                "status": "error",
+                "ruta": None,
+                "error": str(e)
+            }
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False)
+        # limpiar videos temporales subidos
+        for vp in (video_paths or []):
+            try:
+                if os.path.exists(vp):
+                    os.remove(vp)
+            except Exception:
+                pass
+
+
+@bp.route("/generar_presentacion", methods=["POST"])
+@requiere_premium
+@limitar_subida("video", respuesta_json=True)
+def generar_presentacion():
+    """
+    Inicia en segundo plano la generación de una presentación (.pptx) a partir
+    de un tema descrito por el usuario y/o de un documento subido previamente
+    (vía /upload_doc), con imágenes generadas por IA y/o videos cortos subidos
+    por el usuario. Devuelve un job_id para consultar el progreso.
+    """
+    try:
+        usuario = request.form.get("usuario_id", "anon")
+
+        if not usuario_premium(usuario) and not es_superusuario(usuario):
+            return jsonify({
+                "ok": False,
+                "error": "Esta función es exclusiva para usuarios Premium. Activá Foschi IA Premium para crear presentaciones."
+            }), 403
+
+        tema = (request.form.get("tema") or "").strip()
+        titulo_pres = (request.form.get("titulo") or "").strip()
+        doc_id = (request.form.get("doc_id") or "").strip()
+
+        try:
+            num_slides = int(request.form.get("num_slides", 8))
+        except (TypeError, ValueError):
+            num_slides = 8
+        num_slides = max(3, min(num_slides, 20))
+
+        incluir_imagenes = (request.form.get("incluir_imagenes", "true").lower() == "true")
+
+        contenido_base = ""
+        if doc_id:
+            contenido_base = documentos.cargar_texto(doc_id) or ""
+
+        if not contenido_base and not tema:
+            return jsonify({
+                "ok": False,
+                "error": "Indicá un tema/descripción o subí un documento (📄 Analizar Documento) para generar la presentación."
+            }), 400
+
+        # Guardar videos subidos en disco YA (los FileStorage no sobreviven
+        # al hilo en segundo plano)
+        video_paths = []
+        if "videos" in request.files:
+            for v in request.files.getlist("videos"):
+                if not v or not v.filename:
+                    continue
+                try:
+                    video_paths.append(guardar_subida(v, TEMP_DIR, "video")["ruta"])
+                except SubidaRechazada as e:
+                    for vp in video_paths:
+                        try:
+                            os.remove(vp)
+                        except Exception:
+                            pass
+                    return jsonify({"ok": False, "error": f"{v.filename}: {e.mensaje}"}), e.status
+                except Exception as e:
+                    print("Error guardando video temporal:", e)
+
+        job_id = uuid.uuid4().hex
+        with PRESENTACIONES_LOCK:
+            PRESENTACIONES_JOBS[job_id] = {"status": "procesando", "ruta": None, "error": None}
+
+        hilo = threading.Thread(
+            target=_procesar_presentacion_job,
+            args=(job_id, contenido_base, tema, titulo_pres, num_slides, incluir_imagenes, video_paths),
+            daemon=True
+        )
+        hilo.start()
+
+        return jsonify({"ok": True, "job_id": job_id})
+
+    except Exception as e:
+        print("ERROR GENERAR PRESENTACION:", e)
+        traceback.print_exc()
+        return jsonify({"ok": False, "error": str(e)}), 500
+
+
+@bp.route("/estado_presentacion/<job_id>")
+@requiere_premium
+def estado_presentacion(job_id):
+    with PRESENTACIONES_LOCK:
+        job = PRESENTACIONES_JOBS.get(job_id)
+
+    if not job:
+        return jsonify({"ok": False, "error": "Job no encontrado"}), 404
+
+    return jsonify({
+        "ok": True,
+        "status": job["status"],
+        "error": job.get("error")
+    })
+
+
+@bp.route("/descargar_presentacion/<job_id>")
+@requiere_premium
+def descargar_presentacion(job_id):
+    with PRESENTACIONES_LOCK:
+        job = PRESENTACIONES_JOBS.get(job_id)
+
+    if not job or job["status"] != "listo" or not job.get("ruta"):
+        return jsonify({"ok": False, "error": "La presentación todavía no está lista"}), 404
+
+    ruta_pptx = job["ruta"]
+
+    @after_this_request
+    def _cleanup(response):
+        try:
+            if os.path.exists(ruta_pptx):
+                os.remove(ruta_pptx)
+        except Exception:
+            pass
+        with PRESENTACIONES_LOCK:
+            PRESENTACIONES_JOBS.pop(job_id, None)
+        return response
+
+    return send_file(
+        ruta_pptx,
+        as_attachment=True,
+        mimetype="application/vnd.openxmlformats-officedocument.presentationml.presentation",
+        download_name="presentacion_foschi.pptx"
+    )
@@ -0,0 +1,97 @@
+# rutas_recordatorios.py
+# -----------------
+# Blueprint de recordatorios: /avisos y el hilo que los dispara.
+
+import os
+import time
+import threading
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin lock entre procesos
+    fcntl = None
+
+from flask import Blueprint, request, jsonify
+
+from nucleo import DATA_DIR, TZ, load_recordatorios, save_recordatorios, guardar_en_historial_diferido
+
+bp = Blueprint("recordatorios", __name__)
+
+LOCK_MONITOR = os.path.join(DATA_DIR, ".monitor_recordatorios.lock")
+
+
+# ---------------- MONITOR ----------------
+def monitor_recordatorios():
+    """Hilo que revisa recordatorios y los dispara. Cuando se dispara, lo guarda en el historial del usuario."""
+    while True:
+        try:
+            lista = load_recordatorios()
+            ahora = datetime.now(TZ)
+            restantes = []
+            for r in lista:
+                try:
+                    cuando = datetime.strptime(r["cuando"], "%Y-%m-%d %H:%M:%S")
+                    cuando = TZ.localize(cuando)
+                except Exception:
+                    try:
+                        cuando = datetime.fromisoformat(r["cuando"])
+                        if cuando.tzinfo is None:
+                            cuando = TZ.localize(cuando)
+                    except:
+                        continue
+                if cuando <= ahora:
+                    usuario = r.get("usuario", "anon")
+                    motivo = r.get("motivo", "(sin motivo)")
+                    aviso_texto = f"⏰ Tenés un recordatorio: {motivo}"
+                    try:
+                        guardar_en_historial_diferido(usuario, f"[recordatorio] {motivo}", aviso_texto)
+                    except Exception:
+                        pass
+                    print(aviso_texto)
+                else:
+                    restantes.append(r)
+            save_recordatorios(restantes)
+        except Exception as e:
+            print("Error en monitor_recordatorios:", e)
+        time.sleep(30)
+
+
+def _monitor_exclusivo():
+    """
+    Con varios workers de gunicorn cada uno arranca este hilo, pero sólo el
+    que toma el lock del archivo corre el monitor (si no, cada recordatorio
+    se dispararía una vez por worker). Los demás quedan esperando el lock:
+    si el worker que lo tiene muere o se recicla, el sistema lo libera y
+    otro toma la posta.
+    """
+    if fcntl is None:
+        monitor_recordatorios()
+        return
+    with open(LOCK_MONITOR, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        print(f"Monitor de recordatorios activo en el proceso {os.getpid()}")
+        monitor_recordatorios()
+
+
+def iniciar_monitor_recordatorios():
+    """Arranca el hilo (daemon) del monitor en el proceso actual."""
+    threading.Thread(target=_monitor_exclusivo, name="monitor_recordatorios", daemon=True).start()
+
+
+# ---------------- RUTAS ----------------
+@bp.route("/avisos", methods=["POST"])
+def avisos():
+    usuario = request.json.get("usuario_id", "anon")
+    lista = load_recordatorios()
+    ahora = datetime.now(TZ)
+    vencidos = []
+    restantes = []
+    for r in lista:
+        when = TZ.localize(datetime.strptime(r["cuando"], "%Y-%m-%d %H:%M:%S"))
+        if when <= ahora and r["usuario"] == usuario:
+            vencidos.append(r)
+        else:
+            restantes.append(r)
+    save_recordatorios(restantes)
+    return jsonify(vencidos)
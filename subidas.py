@@ -0,0 +1,252 @@
+# subidas.py
+# -----------------
+# Capa común para recibir archivos subidos por el usuario.
+#
+# - Corta la petición ANTES de leerla si el Content-Length supera el límite
+#   del endpoint (request.max_content_length por request).
+# - Escribe a disco en bloques (nunca el archivo entero en RAM) calculando
+#   el SHA-256 al vuelo.
+# - Reconoce el tipo real por los primeros bytes (magic bytes), no por la
+#   extensión ni el Content-Type que manda el navegador.
+
+import hashlib
+import inspect
+import os
+import uuid
+from functools import wraps
+
+from flask import request, jsonify
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.utils import secure_filename
+
+MB = 1024 * 1024
+TAMANIO_BLOQUE = 64 * 1024
+
+# Límites por tipo de subida:
+#   max_archivo  → tamaño máximo de cada archivo
+#   max_peticion → tamaño máximo de la petición completa (multipart)
+#   tipos        → tipos reales aceptados (según detectar_tipo)
+LIMITES = {
+    "documento": {
+        "max_archivo": 25 * MB,
+        "max_peticion": 26 * MB,
+        "tipos": {"pdf", "zip"},
+        "error_tipo": "Formato no permitido. Solo PDF o DOCX.",
+    },
+    "audio": {
+        "max_archivo": 200 * MB,
+        "max_peticion": 201 * MB,
+        "tipos": {"audio_mpeg", "wav", "ogg", "webm", "flac", "m4a", "mp4"},
+        "error_tipo": "Formato de audio no soportado (usá mp3, m4a, wav, ogg, webm o flac).",
+    },
+    "imagen": {
+        "max_archivo": 20 * MB,
+        "max_peticion": 21 * MB,
+        "tipos": {"png", "jpg", "webp", "gif"},
+        "error_tipo": "Formato de imagen no soportado (usá PNG, JPG o WEBP).",
+    },
+    "video": {
+        "max_archivo": 50 * MB,
+        "max_peticion": 5 * 50 * MB + MB,
+        "tipos": {"mp4", "mov", "webm"},
+        "error_tipo": "Formato de video no soportado (usá mp4, mov o webm).",
+    },
+}
+
+# Tope global para cualquier petición (el mayor de los límites de arriba)
+LIMITE_GLOBAL = max(conf["max_peticion"] for conf in LIMITES.values())
+
+MIME_POR_TIPO = {
+    "pdf": "application/pdf",
+    "zip": "application/zip",
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "gif": "image/gif",
+    "webp": "image/webp",
+    "audio_mpeg": "audio/mpeg",
+    "wav": "audio/wav",
+    "ogg": "audio/ogg",
+    "webm": "video/webm",
+    "flac": "audio/flac",
+    "m4a": "audio/mp4",
+    "mp4": "video/mp4",
+    "mov": "video/quicktime",
+}
+
+
+class SubidaRechazada(Exception):
+    """El archivo subido no cumple los límites de tamaño o tipo."""
+
+    def __init__(self, mensaje, status=400):
+        super().__init__(mensaje)
+        self.mensaje = mensaje
+        self.status = status
+
+
+def detectar_tipo(cabecera):
+    """Devuelve el tipo real del archivo según sus primeros bytes, o None."""
+    if cabecera.startswith(b"%PDF-"):
+        return "pdf"
+    if cabecera.startswith(b"PK\x03\x04"):
+        return "zip"  # docx / pptx / xlsx son zip
+    if cabecera.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if cabecera.startswith(b"\xff\xd8\xff"):
+        return "jpg"
+    if cabecera[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    if cabecera[:4] == b"RIFF" and cabecera[8:12] == b"WEBP":
+        return "webp"
+    if cabecera[:4] == b"RIFF" and cabecera[8:12] == b"WAVE":
+        return "wav"
+    if cabecera.startswith(b"OggS"):
+        return "ogg"
+    if cabecera.startswith(b"fLaC"):
+        return "flac"
+    if cabecera.startswith(b"\x1a\x45\xdf\xa3"):
+        return "webm"
+    if cabecera[4:8] == b"ftyp":
+        marca = cabecera[8:12]
+        if marca == b"qt  ":
+            return "mov"
+        if marca in (b"M4A ", b"M4B "):
+            return "m4a"
+        return "mp4"
+    if cabecera.startswith(b"ID3"):
+        return "audio_mpeg"
+    if len(cabecera) > 1 and cabecera[0] == 0xFF and (cabecera[1] & 0xE0) == 0xE0:
+        return "audio_mpeg"  # frame MPEG / ADTS sin etiqueta ID3
+    return None
+
+
+def _borrar(ruta):
+    try:
+        if ruta and os.path.exists(ruta):
+            os.remove(ruta)
+    except Exception:
+        pass
+
+
+def guardar_subida(archivo, carpeta, perfil, nombre_destino=None):
+    """
+    Guarda un FileStorage en `carpeta` leyendo en bloques.
+
+    Verifica el tipo real con el primer bloque y corta apenas se supera el
+    tamaño máximo del perfil (borrando lo escrito). Devuelve un dict con
+    ruta, sha256, tamanio, tipo, mime y nombre (nombre seguro original).
+    Lanza SubidaRechazada si el archivo no cumple los límites.
+    """
+    conf = LIMITES[perfil]
+
+    nombre = secure_filename(archivo.filename or "")
+    if not nombre:
+        raise SubidaRechazada("Nombre de archivo inválido")
+
+    os.makedirs(carpeta, exist_ok=True)
+    ruta = os.path.join(carpeta, nombre_destino or f"{uuid.uuid4().hex}_{nombre}")
+
+    h = hashlib.sha256()
+    total = 0
+    tipo = None
+
+    try:
+        with open(ruta, "wb") as f:
+            while True:
+                bloque = archivo.stream.read(TAMANIO_BLOQUE)
+                if not bloque:
+                    break
+
+                if tipo is None:
+                    tipo = detectar_tipo(bloque)
+                    if tipo not in conf["tipos"]:
+                        raise SubidaRechazada(conf["error_tipo"], 415)
+
+                total += len(bloque)
+                if total > conf["max_archivo"]:
+                    raise SubidaRechazada(
+                        f"El archivo supera el máximo permitido ({conf['max_archivo'] // MB} MB).", 413
+                    )
+
+                h.update(bloque)
+                f.write(bloque)
+    except BaseException:
+        _borrar(ruta)
+        raise
+
+    if total == 0:
+        _borrar(ruta)
+        raise SubidaRechazada("El archivo está vacío")
+
+    return {
+        "ruta": ruta,
+        "sha256": h.hexdigest(),
+        "tamanio": total,
+        "tipo": tipo,
+        "mime": MIME_POR_TIPO.get(tipo, "application/octet-stream"),
+        "nombre": nombre,
+    }
+
+
+def limitar_subida(perfil, respuesta_json=False):
+    """
+    Decorador para rutas que reciben archivos.
+
+    Fija el tope de la petición según el perfil antes de que Flask lea el
+    cuerpo, rechaza de entrada si el Content-Length ya lo supera y traduce
+    SubidaRechazada / 413 a una respuesta (texto o JSON según el endpoint).
+    """
+    conf = LIMITES[perfil]
+
+    def _respuesta(mensaje, status):
+        if respuesta_json:
+            return jsonify({"ok": False, "error": mensaje}), status
+        return mensaje, status
+
+    def _antes():
+        try:
+            # Flask >= 3.1 permite fijar el límite por request
+            request.max_content_length = conf["max_peticion"]
+        except AttributeError:
+            pass
+
+        if request.content_length and request.content_length > conf["max_peticion"]:
+            return _respuesta(
+                f"El archivo supera el máximo permitido ({conf['max_archivo'] // MB} MB).", 413
+            )
+        return None
+
+    def _traducir(e):
+        if isinstance(e, SubidaRechazada):
+            return _respuesta(e.mensaje, e.status)
+        return _respuesta(
+            f"El archivo supera el máximo permitido ({conf['max_archivo'] // MB} MB).", 413
+        )
+
+    def decorador(f):
+        # vistas async (ver asincronico.py): el wrapper también tiene que serlo
+        if inspect.iscoroutinefunction(f):
+            @wraps(f)
+            async def _wrapper_async(*args, **kwargs):
+                rechazo = _antes()
+                if rechazo is not None:
+                    return rechazo
+                try:
+                    return await f(*args, **kwargs)
+                except (SubidaRechazada, RequestEntityTooLarge) as e:
+                    return _traducir(e)
+            # asgi.py lo lee para cortar el cuerpo antes de pasarlo a Flask
+            _wrapper_async.limite_subida = conf["max_peticion"]
+            return _wrapper_async
+
+        @wraps(f)
+        def _wrapper(*args, **kwargs):
+            rechazo = _antes()
+            if rechazo is not None:
+                return rechazo
+            try:
+                return f(*args, **kwargs)
+            except (SubidaRechazada, RequestEntityTooLarge) as e:
+                return _traducir(e)
+        _wrapper.limite_subida = conf["max_peticion"]
+        return _wrapper
+    return decorador
@@ -0,0 +1,196 @@
+# transcripcion.py
+# -----------------
+# Transcripción de audios largos.
+#
+# Mandar una grabación de una hora en una sola llamada a la API choca con
+# el límite de tamaño (25 MB) y con el timeout del proxy. Acá el audio se
+# corta con ffmpeg en tramos de ~10 minutos, eligiendo como punto de corte
+# el silencio más cercano (para no partir palabras), los tramos se
+# transcriben en paralelo y se vuelven a unir en orden.
+#
+# Backends:
+#   openai  → gpt-4o-transcribe (por defecto)
+#   whisper → openai-whisper local, sin costo por uso (más lento en CPU)
+# Se elige con la variable de entorno TRANSCRIPCION_BACKEND (configuración
+# del servidor: whisper ocupa mucha CPU y RAM, no lo elige el usuario).
+#
+# Sin ffprobe no se sabe la duración ni se puede cortar: el audio va en
+# una sola llamada, y si pasa el límite de la API se rechaza.
+
+import importlib.util
+import os
+import re
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import ffmpeg
+
+from nucleo import client
+
+TRANSCRIPCION_BACKEND = os.getenv("TRANSCRIPCION_BACKEND", "openai")
+WHISPER_MODELO = os.getenv("WHISPER_MODELO", "base")
+
+TRAMO_SEGUNDOS = 600          # largo objetivo de cada tramo
+VENTANA_SILENCIO = 60         # se busca silencio hasta ±60 s del corte ideal
+MAX_BYTES_UNA_LLAMADA = 20 * 1024 * 1024
+MAX_BYTES_API = 25 * 1024 * 1024   # límite de la API de transcripción
+TRAMOS_EN_PARALELO = 4
+
+class AudioDemasiadoGrande(Exception):
+    """El audio no se puede cortar en tramos y supera el límite de la API."""
+
+
+_whisper_holder = [None]
+_whisper_lock = threading.Lock()
+
+
+def whisper_disponible():
+    # sin importarlo: importar whisper carga torch en el proceso web
+    return importlib.util.find_spec("whisper") is not None
+
+
+# -----------------------------
+# FFMPEG: duración, silencios y cortes
+# -----------------------------
+def duracion_audio(path):
+    """Duración en segundos (None si ffprobe no está o no la informa)."""
+    try:
+        info = ffmpeg.probe(path)
+        return float(info["format"]["duration"])
+    except Exception as e:
+        print("No pude obtener la duración del audio:", e)
+        return None
+
+
+def detectar_silencios(path, ruido="-30dB", minimo=0.5):
+    """Devuelve una lista de puntos medios (segundos) de los silencios."""
+    try:
+        _, err = (
+            ffmpeg.input(path)
+            .audio.filter("silencedetect", noise=ruido, d=minimo)
+            .output("-", format="null")
+            .run(capture_stdout=True, capture_stderr=True)
+        )
+    except Exception as e:
+        print("Error detectando silencios:", e)
+        return []
+
+    salida = err.decode("utf-8", "ignore")
+    inicios = [float(x) for x in re.findall(r"silence_start: (-?[\d.]+)", salida)]
+    finales = [float(x) for x in re.findall(r"silence_end: (-?[\d.]+)", salida)]
+    return [(a + b) / 2 for a, b in zip(inicios, finales)]
+
+
+def planear_cortes(duracion, silencios, tramo=TRAMO_SEGUNDOS, ventana=VENTANA_SILENCIO):
+    """
+    Devuelve la lista de (inicio, fin) de cada tramo. Cada corte cae en el
+    silencio más cercano al ideal; si no hay ninguno en la ventana, se
+    corta en el ideal.
+    """
+    tramos = []
+    inicio = 0.0
+    while duracion - inicio > tramo * 1.2:
+        ideal = inicio + tramo
+        cercanos = [s for s in silencios if abs(s - ideal) <= ventana and s > inicio + 1]
+        corte = min(cercanos, key=lambda s: abs(s - ideal)) if cercanos else ideal
+        tramos.append((inicio, corte))
+        inicio = corte
+    tramos.append((inicio, duracion))
+    return tramos
+
+
+def _cortar(path, inicio, fin, destino):
+    """Extrae un tramo como MP3 mono 16 kHz (liviano y suficiente para voz)."""
+    (
+        ffmpeg.input(path, ss=inicio, t=fin - inicio)
+        .output(destino, ac=1, ar=16000, audio_bitrate="64k", format="mp3")
+        .overwrite_output()
+        .run(capture_stdout=True, capture_stderr=True)
+    )
+    return destino
+
+
+# -----------------------------
+# BACKENDS
+# -----------------------------
+def _transcribir_openai(path):
+    with open(path, "rb") as f:
+        # cliente compartido del proceso (se recrea después del fork, ver nucleo.py)
+        transcript = client.audio.transcriptions.create(
+            model="gpt-4o-transcribe",
+            file=f,
+        )
+    return transcript.text if hasattr(transcript, "text") else str(transcript)
+
+
+def _transcribir_whisper(path):
+    import whisper
+    with _whisper_lock:  # el modelo no es thread-safe y ocupa mucha RAM
+        if _whisper_holder[0] is None:
+            _whisper_holder[0] = whisper.load_model(WHISPER_MODELO)
+        resultado = _whisper_holder[0].transcribe(path)
+    return (resultado.get("text") or "").strip()
+
+
+def _backend(nombre):
+    nombre = nombre or TRANSCRIPCION_BACKEND
+    if nombre == "whisper":
+        if whisper_disponible():
+            return _transcribir_whisper, 1
+        print("openai-whisper no está instalado, se usa la API de OpenAI")
+    return _transcribir_openai, TRAMOS_EN_PARALELO
+
+
+# -----------------------------
+# API
+# -----------------------------
+def transcribir_audio(path, backend=None, progreso=None):
+    """
+    Transcribe un audio de cualquier largo. Devuelve el texto completo.
+    progreso(hechos, total): callback opcional, se llama al terminar cada tramo.
+    """
+    transcribir, paralelo = _backend(backend)
+
+    duracion = duracion_audio(path)
+    tamanio = os.path.getsize(path)
+    chico = tamanio <= MAX_BYTES_UNA_LLAMADA
+    if duracion is None and tamanio > MAX_BYTES_API and transcribir is _transcribir_openai:
+        raise AudioDemasiadoGrande(
+            f"No se puede cortar el audio (falta ffprobe) y pesa más de {MAX_BYTES_API // (1024 * 1024)} MB."
+        )
+    if duracion is None or (chico and duracion <= TRAMO_SEGUNDOS * 1.2):
+        # audio corto (o sin ffmpeg): una sola llamada, como siempre
+        if progreso:
+            progreso(0, 1)
+        texto = transcribir(path)
+        if progreso:
+            progreso(1, 1)
+        return texto
+
+    tramos = planear_cortes(duracion, detectar_silencios(path))
+    carpeta = tempfile.mkdtemp(prefix="tramos_")
+    hechos = [0]
+    lock = threading.Lock()
+
+    if progreso:
+        progreso(0, len(tramos))
+
+    def _procesar(i_tramo):
+        i, (inicio, fin) = i_tramo
+        ruta_tramo = _cortar(path, inicio, fin, os.path.join(carpeta, f"tramo_{i:04d}.mp3"))
+        texto = transcribir(ruta_tramo)
+        with lock:
+            hechos[0] += 1
+            if progreso:
+                progreso(hechos[0], len(tramos))
+        return texto
+
+    try:
+        with ThreadPoolExecutor(max_workers=paralelo) as executor:
+            textos = list(executor.map(_procesar, enumerate(tramos)))
+    finally:
+        shutil.rmtree(carpeta, ignore_errors=True)
+
+    return "\n".join(t.strip() for t in textos if t and t.strip())
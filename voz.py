@@ -0,0 +1,241 @@
+# voz.py
+# -----------------
+# Texto a voz para /tts con caché en disco.
+#
+# - Cada oración se sintetiza por separado y se guarda como MP3 en
+#   data/tts_cache bajo sha256(texto|lang|tld). Repetir un mensaje (muy
+#   común: el front-end vuelve a pedir el audio en cada reproducción) sale
+#   directo del disco.
+# - La respuesta es un stream: el audio de la primera oración se manda
+#   apenas está listo mientras las siguientes se sintetizan en paralelo.
+#   Los MP3 se pueden concatenar, así que el navegador lo reproduce como
+#   un único archivo.
+# - El caché se limita por tamaño con desalojo LRU (la fecha de
+#   modificación se actualiza en cada acierto).
+# - Si gTTS no responde (sin internet, bloqueo de Google) se usa un motor
+#   offline opcional: pip install pyttsx3 (+ espeak-ng en Linux). Ese
+#   motor genera WAV, así que en ese caso el texto se sintetiza entero.
+
+import hashlib
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from gtts import gTTS
+from gtts.lang import tts_langs
+
+try:
+    import pyttsx3
+except ImportError:
+    pyttsx3 = None
+
+TTS_DIR = os.path.join("data", "tts_cache")
+TTS_MAX_BYTES = int(os.getenv("TTS_CACHE_MB", "200")) * 1024 * 1024
+MAX_CHARS_ORACION = 300
+TAMANIO_BLOQUE = 32 * 1024
+
+# gTTS arma la URL con el tld: sólo se aceptan dominios conocidos
+TLDS_PERMITIDOS = {"com", "com.mx", "com.ar", "es", "co.uk", "com.au", "us", "ca", "co.in"}
+
+_POOL_TTS = ThreadPoolExecutor(max_workers=3)
+_LOCK_DESALOJO = threading.Lock()
+_LOCK_OFFLINE = threading.Lock()   # pyttsx3 no es thread-safe
+_escrituras = [0]
+
+
+class TTSNoDisponible(Exception):
+    """Ningún motor de voz pudo sintetizar el texto."""
+
+
+def idioma_valido(lang):
+    """True si gTTS tiene voz para `lang` (ej. "es", "en", "pt")."""
+    return lang in tts_langs()
+
+
+def clave_tts(texto, lang, tld, motor="gtts"):
+    return hashlib.sha256(f"{motor}|{lang}|{tld}|{texto}".encode("utf-8")).hexdigest()
+
+
+def etag_tts(texto, lang="es", tld="com.mx"):
+    """ETag del audio de un texto (permite contestar 304 sin sintetizar nada)."""
+    if tld not in TLDS_PERMITIDOS:
+        tld = "com.mx"
+    return clave_tts(texto, lang, tld)
+
+
+def dividir_oraciones(texto, max_chars=MAX_CHARS_ORACION):
+    """Corta el texto en oraciones; las muy largas se cortan en comas/espacios."""
+    partes = [p.strip() for p in re.split(r"(?<=[.!?…;:])\s+|\n+", texto) if p and p.strip()]
+
+    oraciones = []
+    for parte in partes:
+        while len(parte) > max_chars:
+            corte = max(parte.rfind(", ", 0, max_chars), parte.rfind(" ", 0, max_chars))
+            if corte <= 0:
+                corte = max_chars
+            oraciones.append(parte[:corte + 1].strip())
+            parte = parte[corte + 1:].strip()
+        if parte:
+            oraciones.append(parte)
+    return oraciones
+
+
+# -----------------------------
+# CACHÉ EN DISCO (LRU)
+# -----------------------------
+def _ruta(clave, ext="mp3"):
+    return os.path.join(TTS_DIR, f"{clave}.{ext}")
+
+
+def _leer_cache(ruta):
+    try:
+        with open(ruta, "rb") as f:
+            datos = f.read()
+        os.utime(ruta)  # marca de "usado recién" para el LRU
+        return datos
+    except OSError:
+        return None
+
+
+def _guardar_cache(ruta, datos):
+    try:
+        os.makedirs(TTS_DIR, exist_ok=True)
+        tmp = f"{ruta}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(datos)
+        os.replace(tmp, ruta)
+    except OSError as e:
+        print("Error guardando audio en caché:", e)
+        return
+
+    _escrituras[0] += 1
+    if _escrituras[0] % 20 == 0:
+        _POOL_TTS.submit(desalojar_cache)
+
+
+def desalojar_cache(max_bytes=TTS_MAX_BYTES):
+    """Borra los audios menos usados hasta quedar en el 90% del máximo."""
+    if not _LOCK_DESALOJO.acquire(blocking=False):
+        return  # ya hay otro desalojo corriendo
+    try:
+        archivos = []
+        total = 0
+        for entrada in os.scandir(TTS_DIR):
+            if entrada.is_file() and not entrada.name.endswith(".tmp"):
+                st = entrada.stat()
+                archivos.append((st.st_mtime, st.st_size, entrada.path))
+                total += st.st_size
+
+        if total <= max_bytes:
+            return
+
+        for _, tamanio, ruta in sorted(archivos):
+            try:
+                os.remove(ruta)
+                total -= tamanio
+            except OSError:
+                pass
+            if total <= max_bytes * 0.9:
+                break
+    except OSError as e:
+        print("Error desalojando caché TTS:", e)
+    finally:
+        _LOCK_DESALOJO.release()
+
+
+# -----------------------------
+# MOTORES
+# -----------------------------
+def sintetizar_oracion(oracion, lang="es", tld="com.mx"):
+    """MP3 de una oración (desde caché o con gTTS)."""
+    ruta = _ruta(clave_tts(oracion, lang, tld))
+    datos = _leer_cache(ruta)
+    if datos is not None:
+        return datos
+
+    buffer = BytesIO()
+    gTTS(text=oracion, lang=lang, slow=False, tld=tld).write_to_fp(buffer)
+    datos = buffer.getvalue()
+    _guardar_cache(ruta, datos)
+    return datos
+
+
+def sintetizar_offline(texto, lang="es"):
+    """WAV del texto completo con pyttsx3 (sin internet)."""
+    if pyttsx3 is None:
+        raise TTSNoDisponible("gTTS no disponible y pyttsx3 no está instalado")
+
+    ruta = _ruta(clave_tts(texto, lang, "", motor="offline"), ext="wav")
+    datos = _leer_cache(ruta)
+    if datos is not None:
+        return datos
+
+    os.makedirs(TTS_DIR, exist_ok=True)
+    tmp = f"{ruta}.{threading.get_ident()}.tmp.wav"
+    with _LOCK_OFFLINE:
+        motor = pyttsx3.init()
+        for v in motor.getProperty("voices"):
+            idiomas = [str(l) for l in (getattr(v, "languages", None) or [])]
+            if any(lang in l for l in idiomas) or lang in (v.id or "").lower():
+                motor.setProperty("voice", v.id)
+                break
+        motor.save_to_file(texto, tmp)
+        motor.runAndWait()
+
+    try:
+        with open(tmp, "rb") as f:
+            datos = f.read()
+    finally:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+    _guardar_cache(ruta, datos)
+    return datos
+
+
+def _stream_oraciones(primera, futuros):
+    # Si falla una oración se corta el stream en vez de saltearla: las
+    # cabeceras (ETag, Cache-Control) ya salieron prometiendo el audio
+    # completo, y una respuesta cortada el navegador no la guarda.
+    try:
+        yield primera
+        for futuro in futuros:
+            datos = futuro.result()
+            for i in range(0, len(datos), TAMANIO_BLOQUE):
+                yield datos[i:i + TAMANIO_BLOQUE]
+    except Exception as e:
+        print("Error TTS en una oración, se corta el audio:", e)
+        raise TTSNoDisponible(str(e)) from e
+    finally:
+        for futuro in futuros:
+            futuro.cancel()
+
+
+def audio_tts(texto, lang="es", tld="com.mx"):
+    """
+    Prepara el audio de `texto`. Devuelve (iterable de bytes, mimetype, etag).
+
+    La primera oración se sintetiza antes de devolver (así se sabe si gTTS
+    responde y qué formato va a tener la respuesta); las demás se encargan
+    al pool en ese mismo momento y se van mandando en orden.
+    """
+    if tld not in TLDS_PERMITIDOS:
+        tld = "com.mx"
+
+    etag = etag_tts(texto, lang, tld)
+    oraciones = dividir_oraciones(texto)
+    if not oraciones:
+        raise TTSNoDisponible("Texto vacío")
+
+    try:
+        primera = sintetizar_oracion(oraciones[0], lang, tld)
+    except Exception as e:
+        print("gTTS no disponible, usando motor offline:", e)
+        return [sintetizar_offline(texto, lang)], "audio/wav", etag + "-offline"
+
+    futuros = [_POOL_TTS.submit(sintetizar_oracion, o, lang, tld) for o in oraciones[1:]]
+    return _stream_oraciones(primera, futuros), "audio/mpeg", etag